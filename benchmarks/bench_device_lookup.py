@@ -0,0 +1,72 @@
+"""Benchmark coordinator device lookups as the number of collars grows.
+
+Simulates the property reads Home Assistant performs on every poll: each
+collar has 14 entities (11 sensors, 2 binary sensors and 1 tracker) and each
+entity resolves its collar a handful of times while its state is written.
+The legacy linear scan is compared with the id-keyed index published by the
+coordinator.
+
+Run from the repository root:
+
+    python benchmarks/bench_device_lookup.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer.utils import (  # noqa: E402
+    build_device_data,
+    get_device,
+)
+
+ENTITIES_PER_COLLAR = 14
+READS_PER_ENTITY = 4
+COLLAR_COUNTS = (5, 50, 500)
+
+
+def _linear_scan(data, device_id):
+    """Look up a device the way entities did before the index existed."""
+    for device in data.get("devices", []):
+        if device.id == device_id:
+            return device
+    return None
+
+
+def _poll(lookup, data, device_ids):
+    """Resolve every entity's collar as a single state write pass would."""
+    for device_id in device_ids:
+        for _ in range(ENTITIES_PER_COLLAR * READS_PER_ENTITY):
+            lookup(data, device_id)
+
+
+def main() -> None:
+    """Print the per-collar cost of one poll for each lookup strategy."""
+    print(f"{'collars':>8} {'linear us/collar':>18} {'indexed us/collar':>18}")
+    for count in COLLAR_COUNTS:
+        devices = [SimpleNamespace(id=10000 + i) for i in range(count)]
+        data = build_device_data(devices)
+        device_ids = [device.id for device in devices]
+        number = max(1, 2000 // count)
+
+        results = []
+        for lookup in (_linear_scan, get_device):
+            elapsed = min(
+                timeit.repeat(
+                    lambda: _poll(lookup, data, device_ids),
+                    number=number,
+                    repeat=3,
+                )
+            )
+            results.append(elapsed / number / count * 1e6)
+
+        print(f"{count:>8} {results[0]:>18.1f} {results[1]:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
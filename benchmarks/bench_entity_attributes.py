@@ -0,0 +1,171 @@
+"""Benchmark building device_info and tracker attributes per write or per change.
+
+Simulates polls of 100 collars where a tenth of the collars report new data
+each poll. Every tracker and binary sensor reads its ``device_info`` and the
+tracker its ``extra_state_attributes`` a few times per state write. Entities
+that build these dicts on every read are compared with the current entities,
+which share one record per collar that is only rebuilt when the collar
+changes. Besides the time per poll, the number of dicts built is counted.
+
+Run from the repository root:
+
+    python benchmarks/bench_entity_attributes.py
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import sys
+import timeit
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer import device_tracker, entity  # noqa: E402
+from custom_components.pettracer.binary_sensor import (  # noqa: E402
+    PetTracerAtHomeBinarySensor,
+    PetTracerChargingBinarySensor,
+)
+from custom_components.pettracer.device_tracker import (  # noqa: E402
+    PetTracerDeviceTracker,
+)
+from custom_components.pettracer.models import (  # noqa: E402
+    CollarDetails,
+    CollarPosition,
+    CollarSnapshot,
+)
+from custom_components.pettracer.utils import build_device_data  # noqa: E402
+
+COLLARS = 100
+CHANGED_PER_POLL = 10
+READS_PER_WRITE = 4
+
+
+def _device(device_id: int) -> CollarSnapshot:
+    """Return a collar snapshot as the coordinator publishes it."""
+    return CollarSnapshot(
+        id=device_id,
+        bat=3950,
+        chg=0,
+        home=False,
+        mode=2,
+        modeSet=2,
+        status=0,
+        sw=656393,
+        lastContact=datetime(2026, 1, 11, 10, 30, tzinfo=UTC),
+        details=CollarDetails(f"Pet {device_id}"),
+        lastPos=CollarPosition(
+            51.5074, -0.1278, 12, 8, -71, "2026-01-11T10:29:41.000+0000"
+        ),
+    )
+
+
+class PerWriteTracker(PetTracerDeviceTracker):
+    """A tracker that builds its dicts on every read, as before."""
+
+    @property
+    def device_info(self):
+        """Return device information about this tracker."""
+        return entity.collar_device_info(self._get_device_data() or self._identity)
+
+    @property
+    def extra_state_attributes(self):
+        """Return additional state attributes."""
+        return device_tracker.tracker_attributes(self._get_device_data())
+
+
+class PerWriteAtHome(PetTracerAtHomeBinarySensor):
+    """An at-home sensor that builds device_info on every read."""
+
+    @property
+    def device_info(self):
+        """Return device information about this sensor."""
+        return entity.collar_device_info(self._get_device_data() or self._identity)
+
+
+class PerWriteCharging(PetTracerChargingBinarySensor):
+    """A charging sensor that builds device_info on every read."""
+
+    @property
+    def device_info(self):
+        """Return device information about this sensor."""
+        return entity.collar_device_info(self._get_device_data() or self._identity)
+
+
+def _counted(function, counter: list[int]):
+    """Wrap a dict builder so its calls are counted."""
+
+    def wrapper(device):
+        counter[0] += 1
+        return function(device)
+
+    return wrapper
+
+
+def _poll(coordinator, devices, entities, poll: list[int]) -> None:
+    """Publish a poll where some collars changed and write every entity."""
+    start = poll[0] * CHANGED_PER_POLL % COLLARS
+    changed = set(range(start, start + CHANGED_PER_POLL))
+    poll[0] += 1
+    for index in changed:
+        devices[index] = dataclasses.replace(devices[index], bat=3950 - poll[0] % 50)
+    coordinator.data = build_device_data(
+        list(devices),
+        previous=coordinator.data,
+        unchanged={device.id for i, device in enumerate(devices) if i not in changed},
+    )
+    for item in entities:
+        for _ in range(READS_PER_WRITE):
+            item.device_info  # noqa: B018
+            item.extra_state_attributes  # noqa: B018
+
+
+def main() -> None:
+    """Print the cost of one poll's entity writes for each strategy."""
+    built = [0]
+    entity.collar_device_info = _counted(entity.collar_device_info, built)
+    device_tracker.tracker_attributes = _counted(
+        device_tracker.tracker_attributes, built
+    )
+    number = 50
+
+    print(
+        f"{COLLARS} collars, {CHANGED_PER_POLL} changed per poll, "
+        f"{READS_PER_WRITE} reads per write"
+    )
+    print(f"{'strategy':>10} {'ms/poll':>10} {'dicts/poll':>12}")
+    for name, classes in (
+        ("per write", (PerWriteTracker, PerWriteAtHome, PerWriteCharging)),
+        (
+            "per change",
+            (
+                PetTracerDeviceTracker,
+                PetTracerAtHomeBinarySensor,
+                PetTracerChargingBinarySensor,
+            ),
+        ),
+    ):
+        devices = [_device(10000 + i) for i in range(COLLARS)]
+        coordinator = SimpleNamespace(
+            data=build_device_data(devices), last_success_time=datetime.now(UTC)
+        )
+        entities = [cls(coordinator, device) for device in devices for cls in classes]
+        poll = [0]
+        # Warm the records so every strategy starts from a steady state
+        _poll(coordinator, devices, entities, poll)
+        built[0] = 0
+        elapsed = min(
+            timeit.repeat(
+                lambda: _poll(coordinator, devices, entities, poll),
+                number=number,
+                repeat=5,
+            )
+        )
+        dicts = built[0] / (number * 5)
+        print(f"{name:>10} {elapsed / number * 1e3:>10.2f} {dicts:>12.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""Benchmark the Kalman smoother over a synthetic 100,000-fix trajectory.
+
+Simulates one collar on a pet that alternates between resting and walking
+at up to 1.5 m/s, with fixes every 5 to 60 seconds scattered by GPS noise
+matching each fix's reported accuracy. Every fix goes through
+``KalmanTrack.update`` and, separately, through ``PositionSmoother.apply``
+as the coordinator calls it. The cost per fix is reported for the first and
+the last 10,000 fixes to show it does not grow with the track, along with
+the error of the raw and the smoothed positions against the true path.
+
+Run from the repository root:
+
+    python benchmarks/bench_kalman.py
+"""
+
+from __future__ import annotations
+
+import math
+import random
+import sys
+import time
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer.models import (  # noqa: E402
+    CollarPosition,
+    CollarSnapshot,
+)
+from custom_components.pettracer.smoothing import (  # noqa: E402
+    METERS_PER_DEGREE,
+    KalmanTrack,
+    PositionSmoother,
+)
+
+FIXES = 100_000
+WINDOW = 10_000
+ORIGIN = (51.5074, -0.1278)
+START = 1_768_125_600.0  # 2026-01-11 10:00 UTC
+
+
+def _trajectory(rng: random.Random) -> list[tuple[float, ...]]:
+    """Return fixes as (time, true north, true east, lat, lon, accuracy)."""
+    east_per_degree = METERS_PER_DEGREE * math.cos(math.radians(ORIGIN[0]))
+    fixes = []
+    now, north, east, heading, speed = START, 0.0, 0.0, 0.0, 0.0
+    for _ in range(FIXES):
+        dt = rng.uniform(5, 60)
+        now += dt
+        if rng.random() < 0.05:
+            # Start or stop walking, in a new direction
+            speed = 0.0 if speed else rng.uniform(0.5, 1.5)
+            heading = rng.uniform(0, 2 * math.pi)
+        north += speed * dt * math.cos(heading)
+        east += speed * dt * math.sin(heading)
+        accuracy = rng.randint(5, 20)
+        fixes.append(
+            (
+                now,
+                north,
+                east,
+                ORIGIN[0] + (north + rng.gauss(0, accuracy)) / METERS_PER_DEGREE,
+                ORIGIN[1] + (east + rng.gauss(0, accuracy)) / east_per_degree,
+                accuracy,
+            )
+        )
+    return fixes
+
+
+def _error(lat: float, lon: float, north: float, east: float) -> float:
+    """Return the distance of a position from the true one in meters."""
+    east_per_degree = METERS_PER_DEGREE * math.cos(math.radians(ORIGIN[0]))
+    return math.hypot(
+        (lat - ORIGIN[0]) * METERS_PER_DEGREE - north,
+        (lon - ORIGIN[1]) * east_per_degree - east,
+    )
+
+
+def _time_track(fixes) -> list[float]:
+    """Return the seconds each window of fixes took in ``KalmanTrack.update``."""
+    first = fixes[0]
+    track = KalmanTrack(first[3], first[4], first[5], first[0])
+    windows = []
+    for start in range(0, FIXES, WINDOW):
+        window = fixes[start : start + WINDOW]
+        started = time.perf_counter()
+        for when, _, _, lat, lon, accuracy in window:
+            track.update(lat, lon, accuracy, when)
+        windows.append(time.perf_counter() - started)
+    return windows
+
+
+def main() -> None:
+    """Print the cost per fix and the accuracy of the smoothed positions."""
+    fixes = _trajectory(random.Random(42))
+
+    windows = min((_time_track(fixes) for _ in range(3)), key=lambda runs: sum(runs))
+    print(f"{FIXES} fixes")
+    print(f"{'stage':>22} {'us/fix':>10}")
+    print(f"{'update, first 10k':>22} {windows[0] / WINDOW * 1e6:>10.2f}")
+    print(f"{'update, last 10k':>22} {windows[-1] / WINDOW * 1e6:>10.2f}")
+
+    smoother = PositionSmoother()
+    collars = [
+        CollarSnapshot(
+            id=1,
+            lastPos=CollarPosition(
+                lat, lon, acc=accuracy, timeMeasure=datetime.fromtimestamp(when, UTC)
+            ),
+        )
+        for when, _, _, lat, lon, accuracy in fixes
+    ]
+    raw_error = smoothed_error = 0.0
+    started = time.perf_counter()
+    smoothed = [smoother.apply([collar])[0].smoothed for collar in collars]
+    elapsed = time.perf_counter() - started
+    print(f"{'PositionSmoother.apply':>22} {elapsed / FIXES * 1e6:>10.2f}")
+
+    for (_, north, east, lat, lon, _), position in zip(fixes, smoothed, strict=True):
+        raw_error += _error(lat, lon, north, east) ** 2
+        smoothed_error += _error(position.posLat, position.posLong, north, east) ** 2
+    print()
+    print(f"{'position':>22} {'RMS error m':>12}")
+    print(f"{'raw':>22} {math.sqrt(raw_error / FIXES):>12.1f}")
+    print(f"{'smoothed':>22} {math.sqrt(smoothed_error / FIXES):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""Benchmark updating distance travelled per poll against recomputing it.
+
+Walks one collar through a day of fixes a minute apart. For each new fix,
+``Odometer.apply`` adds a single haversine leg, while recomputing from the
+history sums every leg since midnight again. The cost per poll is reported
+early and late in the day: the incremental update stays flat, while the
+recomputation grows with the number of fixes.
+
+Run from the repository root:
+
+    python benchmarks/bench_odometer.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from datetime import UTC, datetime, timedelta
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer.models import (  # noqa: E402
+    CollarPosition,
+    CollarSnapshot,
+)
+from custom_components.pettracer.odometer import Odometer  # noqa: E402
+from custom_components.pettracer.utils import haversine_distance  # noqa: E402
+
+START = datetime(2026, 1, 11, 0, 0, tzinfo=UTC)
+FIXES = 1440
+
+
+def _collars() -> list[CollarSnapshot]:
+    """Return a day of fixes a minute apart, walking north-east."""
+    return [
+        CollarSnapshot(
+            id=1,
+            lastPos=CollarPosition(
+                51.5 + n * 2e-4,
+                -0.12 + n * 1e-4,
+                acc=10,
+                timeMeasure=START + timedelta(minutes=n),
+            ),
+        )
+        for n in range(FIXES)
+    ]
+
+
+def _recompute(points: list[tuple[float, float]]) -> float:
+    """Return the distance along every fix since midnight."""
+    return sum(
+        haversine_distance(*points[n - 1], *points[n]) for n in range(1, len(points))
+    )
+
+
+def main() -> None:
+    """Print the cost of one poll at several points of the day."""
+    collars = _collars()
+    points = [(c.lastPos.posLat, c.lastPos.posLong) for c in collars]
+    now = START + timedelta(hours=23)
+
+    print(f"{'fixes today':>12} {'incremental us':>15} {'recompute us':>13}")
+    for fixes in (10, 100, 1000):
+        odometer = Odometer()
+        for collar in collars[:fixes]:
+            odometer.apply([collar], now)
+        trip = odometer.trips[1]
+        state = (trip.time, trip.lat, trip.lon, trip.distance_today, trip.speed)
+        new_fix = [collars[fixes]]
+
+        def incremental() -> None:
+            # Rewind to the same state so every run counts the same new leg
+            (
+                trip.time,
+                trip.lat,
+                trip.lon,
+                trip.distance_today,
+                trip.speed,
+            ) = state
+            odometer.apply(new_fix, now)
+
+        number = 10000
+        fast = min(timeit.repeat(incremental, number=number, repeat=5)) / number
+        slow = (
+            min(
+                timeit.repeat(
+                    lambda: _recompute(points[: fixes + 1]), number=100, repeat=5
+                )
+            )
+            / 100
+        )
+        print(f"{fixes:>12} {fast * 1e6:>15.2f} {slow * 1e6:>13.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+"""Benchmark the memory and cost of the per-collar position history.
+
+Fills the history of 10 collars with 1,000 fixes each, the default depth,
+and measures with ``tracemalloc`` what stays allocated for the array-backed
+ring buffers against a ``deque`` of one dict per fix, the obvious
+alternative. It also times recording a new fix per collar once the buffers
+are full, as each poll does.
+
+Run from the repository root:
+
+    python benchmarks/bench_position_history.py
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import timeit
+import tracemalloc
+from collections import deque
+from datetime import UTC, datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer.history import (  # noqa: E402
+    FixHistory,
+    PositionHistory,
+)
+from custom_components.pettracer.models import (  # noqa: E402
+    CollarPosition,
+    CollarSnapshot,
+)
+
+COLLARS = 10
+DEPTH = 1000
+START = datetime(2026, 1, 11, 10, 0, tzinfo=UTC).timestamp()
+
+
+def _fixes():
+    """Yield (time, latitude, longitude, accuracy) fixes a minute apart."""
+    for n in range(DEPTH):
+        yield START + 60 * n, 51.5074 + n * 1e-5, -0.1278 - n * 1e-5, 12
+
+
+def _ring_buffers() -> dict[int, FixHistory]:
+    """Return full array-backed buffers."""
+    buffers = {}
+    for device_id in range(COLLARS):
+        history = FixHistory(DEPTH)
+        for fix in _fixes():
+            history.append(*fix)
+        buffers[device_id] = history
+    return buffers
+
+
+def _dict_deques() -> dict[int, deque]:
+    """Return full deques of one dict per fix."""
+    return {
+        device_id: deque(
+            (
+                {"time": time, "lat": lat, "lon": lon, "acc": acc}
+                for time, lat, lon, acc in _fixes()
+            ),
+            maxlen=DEPTH,
+        )
+        for device_id in range(COLLARS)
+    }
+
+
+def _retained(build) -> int:
+    """Return the bytes still allocated for a full history."""
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = build()
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return retained
+
+
+def main() -> None:
+    """Print the memory of each layout and the cost of recording a poll."""
+    fixes = COLLARS * DEPTH
+    print(f"{COLLARS} collars, {DEPTH} fixes each")
+    print(f"{'layout':>12} {'KiB':>10} {'B/fix':>8}")
+    for name, build in (("ring buffer", _ring_buffers), ("dict deque", _dict_deques)):
+        retained = _retained(build)
+        print(f"{name:>12} {retained / 1024:>10.0f} {retained / fixes:>8.1f}")
+
+    history = PositionHistory()
+    history.fixes = _ring_buffers()
+    polls = iter(range(DEPTH, 10**9))
+
+    def record() -> None:
+        when = datetime.fromtimestamp(START + 60 * next(polls), UTC)
+        history.record(
+            [
+                CollarSnapshot(
+                    id=device_id,
+                    lastPos=CollarPosition(51.5, -0.12, acc=12, timeMeasure=when),
+                )
+                for device_id in range(COLLARS)
+            ],
+            {},
+        )
+
+    number = 1000
+    best = min(timeit.repeat(record, number=number, repeat=5))
+    print()
+    print(f"record a poll of {COLLARS} full buffers: {best / number * 1e6:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""Benchmark sensor property reads with and without the per-poll value record.
+
+Simulates one poll's worth of state writes for 100 collars: the state and
+attributes of every sensor are read a handful of times, as Home Assistant
+does while writing state. Sensors that evaluate their description's
+``value_fn`` on every read are compared with the current sensors, which read
+the record ``get_sensor_values`` builds once per collar per poll.
+
+Run from the repository root:
+
+    python benchmarks/bench_sensor_values.py
+"""
+
+from __future__ import annotations
+
+import sys
+import timeit
+from datetime import UTC, datetime
+from pathlib import Path
+from types import SimpleNamespace
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer.models import (  # noqa: E402
+    CollarDetails,
+    CollarPosition,
+    CollarSnapshot,
+)
+from custom_components.pettracer.sensor import (  # noqa: E402
+    SENSOR_DESCRIPTIONS,
+    PetTracerSensor,
+)
+from custom_components.pettracer.utils import build_device_data  # noqa: E402
+
+COLLARS = 100
+READS_PER_SENSOR = 4
+
+
+def _device(device_id: int) -> CollarSnapshot:
+    """Return a collar snapshot as the coordinator publishes it."""
+    return CollarSnapshot(
+        id=device_id,
+        bat=3950,
+        chg=0,
+        home=False,
+        mode=2,
+        modeSet=2,
+        status=0,
+        sw=656393,
+        lastContact=datetime(2026, 1, 11, 10, 30, tzinfo=UTC),
+        details=CollarDetails(f"Pet {device_id}"),
+        lastPos=CollarPosition(
+            51.5074, -0.1278, 12, 8, -71, "2026-01-11T10:29:41.000+0000"
+        ),
+    )
+
+
+class LazySensor(PetTracerSensor):
+    """A sensor that evaluates its description on every read, as before."""
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        return self.entity_description.value_fn(self._get_device_data())
+
+    @property
+    def extra_state_attributes(self):
+        """Return additional attributes."""
+        if self.entity_description.extra_attrs_fn:
+            return self.entity_description.extra_attrs_fn(self._get_device_data())
+        return {}
+
+
+def _poll(coordinator, devices, sensors) -> None:
+    """Publish a new poll's data and read every sensor's state."""
+    coordinator.data = build_device_data(devices)
+    for sensor in sensors:
+        for _ in range(READS_PER_SENSOR):
+            sensor.native_value  # noqa: B018
+            sensor.extra_state_attributes  # noqa: B018
+
+
+def main() -> None:
+    """Print the cost of one poll's sensor reads for each strategy."""
+    devices = [_device(10000 + i) for i in range(COLLARS)]
+    reads = COLLARS * len(SENSOR_DESCRIPTIONS) * READS_PER_SENSOR * 2
+    number = 20
+
+    print(f"{COLLARS} collars, {reads} property reads per poll")
+    print(f"{'strategy':>10} {'ms/poll':>10} {'ns/read':>10}")
+    for name, sensor_class in (("lazy", LazySensor), ("record", PetTracerSensor)):
+        coordinator = SimpleNamespace(data=None, last_success_time=datetime.now(UTC))
+        sensors = [
+            sensor_class(coordinator, device, description)
+            for device in devices
+            for description in SENSOR_DESCRIPTIONS
+        ]
+        elapsed = min(
+            timeit.repeat(
+                lambda: _poll(coordinator, devices, sensors),
+                number=number,
+                repeat=5,
+            )
+        )
+        per_poll = elapsed / number
+        print(f"{name:>10} {per_poll * 1e3:>10.2f} {per_poll / reads * 1e9:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,150 @@
+"""Benchmark the memory retained for the collars of one poll.
+
+Builds API payloads for 1,000 collars shaped like the PetTracer cloud's
+``getccs`` response, including the base station record, the telegram FIFO
+and pet details the integration never reads, and parses them with the
+client's ``Device.from_dict``. ``tracemalloc`` then measures what stays
+allocated when the parsed client objects are kept, as the coordinator used
+to, against keeping only the ``CollarSnapshot`` copies it keeps now.
+
+Run from the repository root:
+
+    python benchmarks/bench_snapshot_memory.py
+"""
+
+from __future__ import annotations
+
+import gc
+import sys
+import tracemalloc
+from pathlib import Path
+
+from pettracer import Device
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from custom_components.pettracer.models import CollarSnapshot  # noqa: E402
+
+COLLARS = 1000
+FIFO_ENTRIES = 5
+
+
+def _telegram(device_id: int, number: int) -> dict:
+    """Return one FIFO entry as the cloud reports it."""
+    return {
+        "telegram": {
+            "id": device_id * 100 + number,
+            "deviceType": 0,
+            "deviceId": device_id,
+            "hsId": 9000,
+            "telegram": "0a1b2c3d4e5f60718293a4b5c6d7e8f9" * 2,
+            "latitude": 51.5074,
+            "longitude": -0.1278,
+            "timeDb": "2026-01-11T10:29:41.000+0000",
+            "timeDev": "2026-01-11T10:29:40.000+0000",
+            "cmd": 3,
+            "charging": False,
+        },
+        "receivedBy": [{"hsId": 9000, "rssi": -71}],
+    }
+
+
+def _payload(device_id: int) -> dict:
+    """Return the cloud's record for one collar."""
+    return {
+        "id": device_id,
+        "accuWarn": 0,
+        "safetyZone": False,
+        "hw": 3,
+        "sw": 656393,
+        "bl": 12,
+        "bat": 3950,
+        "chg": 0,
+        "userId": 4711,
+        "masterHs": {
+            "id": 9000,
+            "posLat": 51.5074,
+            "posLong": -0.1278,
+            "hw": 2,
+            "sw": 131,
+            "bl": 4,
+            "bat": 4200,
+            "userId": 4711,
+            "status": 0,
+            "lastContact": "2026-01-11T10:29:50.000+0000",
+            "devMode": False,
+        },
+        "mode": 2,
+        "modeSet": 2,
+        "status": 0,
+        "search": False,
+        "lastTlgNr": 51234,
+        "lastContact": "2026-01-11T10:30:00.000+0000",
+        "lastPos": {
+            "id": device_id * 1000,
+            "posLat": 51.5074,
+            "posLong": -0.1278,
+            "fixS": 3,
+            "fixP": 1,
+            "horiPrec": 9,
+            "sat": 8,
+            "rssi": -71,
+            "acc": 12,
+            "flags": 0,
+            "timeMeasure": "2026-01-11T10:29:41.000+0000",
+            "timeDb": "2026-01-11T10:29:45.000+0000",
+        },
+        "devMode": False,
+        "details": {
+            "id": device_id,
+            "image": f"pets/{device_id}.jpg",
+            "img": f"https://example.invalid/pets/{device_id}.jpg",
+            "color": 3,
+            "birth": "2019-05-04",
+            "name": f"Pet {device_id}",
+        },
+        "led": False,
+        "ble": True,
+        "buz": False,
+        "lastRssi": -71,
+        "flags": 0,
+        "searchModeDuration": 0,
+        "masterStatus": "online",
+        "home": False,
+        "homeSince": None,
+        "owner": True,
+        "fiFo": [_telegram(device_id, n) for n in range(FIFO_ENTRIES)],
+    }
+
+
+def _retained(convert) -> int:
+    """Return the bytes still allocated after parsing and keeping one poll."""
+    payloads = [_payload(10000 + i) for i in range(COLLARS)]
+    gc.collect()
+    tracemalloc.start()
+    baseline = tracemalloc.get_traced_memory()[0]
+    kept = convert([Device.from_dict(item) for item in payloads])
+    gc.collect()
+    retained = tracemalloc.get_traced_memory()[0] - baseline
+    tracemalloc.stop()
+    del kept
+    return retained
+
+
+def main() -> None:
+    """Print the memory retained by each strategy."""
+    print(f"{COLLARS} collars, {FIFO_ENTRIES} FIFO entries each")
+    print(f"{'strategy':>10} {'KiB':>10} {'B/collar':>10}")
+    for name, convert in (
+        ("device", lambda devices: devices),
+        (
+            "snapshot",
+            lambda devices: [CollarSnapshot.from_device(device) for device in devices],
+        ),
+    ):
+        retained = _retained(convert)
+        print(f"{name:>10} {retained / 1024:>10.0f} {retained / COLLARS:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,49 +2,113 @@
 
 from __future__ import annotations
 
+import asyncio
 import logging
-from datetime import timedelta
+import time
+from collections.abc import Callable, Iterable
+from datetime import datetime, timedelta
+from typing import Any
 
-from pettracer import PetTracerClient, PetTracerError
+from aiohttp import ClientError
+from pettracer import Device, PetTracerClient, PetTracerError
 
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, Platform
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers.event import async_call_later, async_track_time_change
+from homeassistant.helpers.storage import Store
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
-from .const import DOMAIN, UPDATE_INTERVAL_SECONDS
+from .breaker import CircuitBreaker
+from .const import (
+    CADENCE_SMOOTHING,
+    CONF_BACKGROUND_SETUP,
+    CONF_BATTERY_DEADBAND,
+    CONF_ESCALATION_ZONE,
+    CONF_RSSI_DEADBAND,
+    DATA_VALIDATED_CLIENTS,
+    DEFAULT_BATTERY_DEADBAND,
+    DEFAULT_RSSI_DEADBAND,
+    DOMAIN,
+    HISTORY_SAVE_DELAY_SECONDS,
+    LOCATE_TIMEOUT_SECONDS,
+    MAX_UPDATE_INTERVAL_SECONDS,
+    MIN_UPDATE_INTERVAL_SECONDS,
+    MODE_POLL_INTERVALS,
+    STALE_DATA_MAX_SECONDS,
+    STORAGE_SAVE_DELAY_SECONDS,
+    STORAGE_VERSION,
+    UPDATE_INTERVAL_SECONDS,
+    UPLOAD_LAG_SECONDS,
+)
+from .escalation import EscalationPolicy, is_away
+from .history import PositionHistory
+from .models import CollarDetails, CollarSnapshot
+from .modes import ModeChangeQueue
+from .odometer import Odometer
+from .position import PositionFilter
+from .smoothing import PositionSmoother
+from .utils import (
+    apply_deadbands,
+    build_device_data,
+    changed_fields,
+    device_fingerprint,
+    device_to_dict,
+    get_device,
+    is_auth_error,
+    stored_token,
+    token_data,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
 PLATFORMS: list[Platform] = [
     Platform.BINARY_SENSOR,
+    Platform.BUTTON,
     Platform.DEVICE_TRACKER,
+    Platform.SELECT,
     Platform.SENSOR,
 ]
 
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Set up PetTracer from a config entry."""
-    username = entry.data[CONF_USERNAME]
-    password = entry.data[CONF_PASSWORD]
+    setup_started = time.monotonic()
 
-    # Create the PetTracer client
-    client = PetTracerClient()
-
-    # Authenticate
-    try:
-        await client.login(username, password)
-    except PetTracerError as err:
-        _LOGGER.error("Failed to authenticate with PetTracer: %s", err)
-        raise ConfigEntryAuthFailed from err
-    except Exception as err:
-        _LOGGER.error("Unexpected error during PetTracer authentication: %s", err)
-        raise ConfigEntryNotReady from err
+    # Use the client the config flow already logged in, if there is one
+    client = hass.data.get(DATA_VALIDATED_CLIENTS, {}).pop(entry.unique_id, None)
+    if client is None:
+        # Every account shares Home Assistant's pooled keep-alive session
+        client = PetTracerClient(session=async_get_clientsession(hass))
 
     # Create update coordinator
     coordinator = PetTracerDataUpdateCoordinator(hass, client, entry)
-    await coordinator.async_config_entry_first_refresh()
+
+    # Reuse the token from the previous run instead of logging in again
+    token_restored = coordinator.async_restore_token()
+
+    if await coordinator.async_restore_snapshot():
+        # Entities start from the last known data while the cloud is queried
+        _async_refresh_in_background(coordinator, entry, setup_started)
+    elif entry.options.get(CONF_BACKGROUND_SETUP, False):
+        # Collars get their entities once the first refresh finds them
+        coordinator.data = build_device_data([])
+        coordinator.data_time = dt_util.utcnow()
+        _async_refresh_in_background(coordinator, entry, setup_started)
+    else:
+        try:
+            if not token_restored:
+                await _async_authenticate(coordinator, entry)
+            await coordinator.async_config_entry_first_refresh()
+        except (ConfigEntryAuthFailed, ConfigEntryNotReady):
+            # A retried setup creates a new client, so release this one
+            await client.close()
+            raise
+        coordinator.first_refresh_seconds = time.monotonic() - setup_started
 
     # Store coordinator
     hass.data.setdefault(DOMAIN, {})
@@ -53,17 +117,177 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     # Forward the setup to platforms
     await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
 
+    coordinator.setup_seconds = time.monotonic() - setup_started
+    _LOGGER.debug(
+        "PetTracer setup took %.3f seconds (restored from snapshot: %s)",
+        coordinator.setup_seconds,
+        coordinator.restored,
+    )
+
     return True
 
 
+@callback
+def _async_refresh_in_background(
+    coordinator: PetTracerDataUpdateCoordinator,
+    entry: ConfigEntry,
+    setup_started: float,
+) -> None:
+    """Log in and fetch the first data without holding up setup."""
+
+    async def _async_first_refresh() -> None:
+        await coordinator.async_refresh()
+        coordinator.first_refresh_seconds = time.monotonic() - setup_started
+        _LOGGER.debug(
+            "PetTracer first refresh finished %.3f seconds after setup started",
+            coordinator.first_refresh_seconds,
+        )
+
+    entry.async_create_background_task(
+        coordinator.hass, _async_first_refresh(), f"{DOMAIN} initial refresh"
+    )
+
+
+async def _async_authenticate(
+    coordinator: PetTracerDataUpdateCoordinator, entry: ConfigEntry
+) -> None:
+    """Log in during setup, telling bad credentials apart from outages."""
+    try:
+        await coordinator.client.login(
+            entry.data[CONF_USERNAME], entry.data[CONF_PASSWORD]
+        )
+    except PetTracerError as err:
+        # The client wraps outages during login in the same error
+        if not is_auth_error(err):
+            raise ConfigEntryNotReady(
+                f"Error communicating with PetTracer during login: {err}"
+            ) from err
+        _LOGGER.error("Failed to authenticate with PetTracer: %s", err)
+        raise ConfigEntryAuthFailed from err
+    except Exception as err:
+        _LOGGER.error("Unexpected error during PetTracer authentication: %s", err)
+        raise ConfigEntryNotReady from err
+    coordinator.async_save_token()
+
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry) -> bool:
     """Unload a config entry."""
     if unload_ok := await hass.config_entries.async_unload_platforms(entry, PLATFORMS):
-        hass.data[DOMAIN].pop(entry.entry_id)
+        coordinator = hass.data[DOMAIN].pop(entry.entry_id)
+        await coordinator.client.close()
+        await coordinator.async_save_now()
 
     return unload_ok
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry) -> None:
+    """Delete the collar data saved for a removed config entry."""
+    for store in _entry_stores(hass, entry):
+        await store.async_remove()
+
+
+def _entry_stores(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> tuple[Store[dict[str, Any]], Store[dict[str, Any]]]:
+    """Return the stores of an entry's device snapshot and position history."""
+    return (
+        Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}"),
+        Store(hass, STORAGE_VERSION, f"{DOMAIN}.{entry.entry_id}.history"),
+    )
+
+
+class PollScheduler:
+    """Derive the polling schedule from collar modes and reporting cadence.
+
+    Each collar's nominal reporting period comes from its mode and is refined
+    by the smoothed interval between successive ``lastContact`` values. The
+    last contact also gives the phase of the collar's upload cycle, so polls
+    are placed just after the next expected upload rather than at an arbitrary
+    offset from it. The account is polled at the pace of its fastest collar,
+    so live tracking gets low latency while idle households make few calls.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the scheduler."""
+        self._last_contact: dict[int, datetime] = {}
+        self._cadence: dict[int, float] = {}
+        # Age of each upload when a poll first saw it, in seconds
+        self.staleness: dict[int, float] = {}
+        self.mean_staleness: dict[int, float] = {}
+        # Reporting periods to assume for collars switched to a faster mode
+        # before they have confirmed it
+        self.boost: dict[int, float] = {}
+
+    def observe(self, devices: list[Any], now: datetime) -> None:
+        """Record the latest contact time of each collar."""
+        seen = set()
+        for device in devices:
+            seen.add(device.id)
+            last_contact = device.lastContact
+            if not isinstance(last_contact, datetime):
+                continue
+            if last_contact.tzinfo is None:
+                last_contact = last_contact.replace(tzinfo=dt_util.UTC)
+            previous = self._last_contact.get(device.id)
+            if previous is not None and last_contact > previous:
+                delta = (last_contact - previous).total_seconds()
+                cadence = self._cadence.get(device.id)
+                self._cadence[device.id] = (
+                    delta
+                    if cadence is None
+                    else cadence + CADENCE_SMOOTHING * (delta - cadence)
+                )
+                self._record_staleness(
+                    device.id, max((now - last_contact).total_seconds(), 0)
+                )
+            self._last_contact[device.id] = last_contact
+
+        for device_id in self._last_contact.keys() - seen:
+            del self._last_contact[device_id]
+            self._cadence.pop(device_id, None)
+            self.staleness.pop(device_id, None)
+            self.mean_staleness.pop(device_id, None)
+
+    def _record_staleness(self, device_id: int, staleness: float) -> None:
+        """Track how old a new upload was by the time it was fetched."""
+        self.staleness[device_id] = staleness
+        mean = self.mean_staleness.get(device_id)
+        self.mean_staleness[device_id] = (
+            staleness if mean is None else mean + CADENCE_SMOOTHING * (staleness - mean)
+        )
+
+    def collar_interval(self, device: Any) -> float:
+        """Return the expected reporting period of a collar in seconds."""
+        nominal = MODE_POLL_INTERVALS.get(device.mode, UPDATE_INTERVAL_SECONDS)
+        cadence = self._cadence.get(device.id)
+        if cadence is None:
+            interval = nominal
+        else:
+            # Missed uploads or clock jitter must not drag us far from the mode
+            interval = min(max(cadence, nominal / 2), nominal * 2)
+        boost = self.boost.get(device.id)
+        return min(interval, boost) if boost is not None else interval
+
+    def collar_delay(self, device: Any, now: datetime) -> float:
+        """Return the seconds until just after the collar's next upload."""
+        period = self.collar_interval(device)
+        last_contact = self._last_contact.get(device.id)
+        if last_contact is None or device.id not in self._cadence:
+            return period
+        elapsed = (now - last_contact).total_seconds() - UPLOAD_LAG_SECONDS
+        return period - elapsed % period
+
+    def interval(self, devices: list[Any], now: datetime) -> timedelta:
+        """Return how long to wait before the next poll."""
+        if not devices:
+            return timedelta(seconds=UPDATE_INTERVAL_SECONDS)
+        seconds = min(self.collar_delay(device, now) for device in devices)
+        seconds = min(
+            max(seconds, MIN_UPDATE_INTERVAL_SECONDS), MAX_UPDATE_INTERVAL_SECONDS
+        )
+        return timedelta(seconds=seconds)
+
+
 class PetTracerDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching PetTracer data."""
 
@@ -72,6 +296,47 @@ class PetTracerDataUpdateCoordinator(DataUpdateCoordinator):
     ) -> None:
         """Initialize."""
         self.client = client
+        self._fingerprints: dict[int, dict[str, Any]] = {}
+        self._registered_ids: set[int] | None = None
+        # Fields changed per device id by the last refresh; None notifies everyone
+        self._changed: dict[int, set[str]] | None = None
+        self._device_listeners: dict[int, dict[CALLBACK_TYPE, frozenset[str]]] = {}
+        self._global_listeners: set[CALLBACK_TYPE] = set()
+        self.write_stats = {"performed": 0, "skipped": 0}
+        self.write_stats_started = time.monotonic()
+        self._poll_task: (
+            asyncio.Task[tuple[dict[str, Any], dict[int, set[str]] | None]] | None
+        ) = None
+        self._last_poll_started: float | None = None
+        # Pending "Locate now" presses: device id -> (pressed at, timeMeasure)
+        self._locate_requests: dict[int, tuple[float, Any]] = {}
+        self._unsub_locate: CALLBACK_TYPE | None = None
+        self._unsub_midnight: CALLBACK_TYPE | None = None
+        # Seconds from the last press until a newer fix arrived, per device id
+        self.locate_latency: dict[int, float] = {}
+        self.request_stats: dict[str, Any] = {
+            "count": 0,
+            "coalesced": 0,
+            "total_seconds": 0.0,
+            "last_seconds": None,
+        }
+        self.scheduler = PollScheduler()
+        self.breaker = CircuitBreaker()
+        self.mode_changes = ModeChangeQueue(hass, self)
+        self.escalation = EscalationPolicy()
+        self.position_filter = PositionFilter()
+        self.smoother = PositionSmoother()
+        self.history = PositionHistory()
+        self.odometer = Odometer()
+        self.last_success_time: datetime | None = None
+        # When the data being served was current: its fetch, the restored
+        # snapshot's fetch, or setup for the empty data of a background setup
+        self.data_time: datetime | None = None
+        self.restored = False
+        self.setup_seconds: float | None = None
+        self.first_refresh_seconds: float | None = None
+        self._store, self._history_store = _entry_stores(hass, entry)
+        self._history_save_pending = False
         super().__init__(
             hass,
             _LOGGER,
@@ -80,12 +345,528 @@ class PetTracerDataUpdateCoordinator(DataUpdateCoordinator):
             config_entry=entry,
         )
 
-    async def _async_update_data(self) -> dict:
-        """Fetch data from PetTracer API."""
+    async def async_restore_snapshot(self) -> bool:
+        """Load the last known device snapshot saved by a previous run."""
+        stored = await self._store.async_load()
+        history = await self._history_store.async_load()
         try:
-            devices = await self.client.get_all_devices()
-            return {"devices": devices}
+            if stored:
+                self.escalation.load(stored.get("escalations", {}))
+                self.odometer.load(stored.get("odometer", {}))
+            if history:
+                self.history.load(history, self.config_entry.options)
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable PetTracer history: %s", err)
+        if not stored or not stored.get("devices"):
+            return False
+
+        try:
+            devices = [
+                CollarSnapshot.from_device(Device.from_dict(item))
+                for item in stored["devices"]
+            ]
+        except (KeyError, TypeError, ValueError) as err:
+            _LOGGER.warning("Ignoring unreadable PetTracer snapshot: %s", err)
+            return False
+        # Distance and speed sensors show the saved totals until the next poll
+        devices = self.odometer.current(devices, dt_util.utcnow())
+
+        self._fingerprints = {
+            device.id: device_fingerprint(device) for device in devices
+        }
+        self.position_filter.seed(devices)
+        self.data_time = dt_util.parse_datetime(stored.get("fetched") or "")
+        self.data = build_device_data(devices)
+        self.restored = True
+        return True
+
+    @callback
+    def _snapshot_to_store(self) -> dict[str, Any]:
+        """Return the current device snapshot for persistent storage."""
+        return {
+            "devices": [device_to_dict(device) for device in self.data["devices"]],
+            "fetched": self.data_time.isoformat() if self.data_time else None,
+            "escalations": self.escalation.as_dict(),
+            "odometer": self.odometer.as_dict(),
+        }
+
+    async def async_save_now(self) -> None:
+        """Write the snapshot and history, replacing their delayed saves."""
+        if self.data is not None:
+            await self._store.async_save(self._snapshot_to_store())
+        await self._history_store.async_save(self._history_to_store())
+
+    @callback
+    def _history_to_store(self) -> dict[str, Any]:
+        """Return the position history for persistent storage."""
+        self._history_save_pending = False
+        return self.history.as_dict()
+
+    @callback
+    def async_restore_token(self) -> bool:
+        """Hand the token saved by a previous login to the client."""
+        token = stored_token(self.config_entry.data, dt_util.utcnow())
+        if token is None:
+            return False
+        # The client only exposes login() for setting its token
+        self.client._token = token
+        return True
+
+    @callback
+    def async_save_token(self) -> None:
+        """Store the client's current token in the config entry."""
+        data = token_data(self.client)
+        if all(self.config_entry.data.get(key) == value for key, value in data.items()):
+            return
+        self.hass.config_entries.async_update_entry(
+            self.config_entry, data={**self.config_entry.data, **data}
+        )
+
+    async def async_reauthenticate(self) -> None:
+        """Switch the live client to the credentials now in the config entry."""
+        if not self.async_restore_token():
+            # Forget the rejected token so the next refresh logs in again
+            self.client._token = None
+        await self.async_request_refresh()
+
+    async def _async_login(self) -> None:
+        """Authenticate the client and remember the new token.
+
+        Only rejected credentials fail authentication; the client wraps
+        outages during login in the same error, and those are re-raised for
+        the poll to back off from.
+        """
+        try:
+            await self.client.login(
+                self.config_entry.data[CONF_USERNAME],
+                self.config_entry.data[CONF_PASSWORD],
+            )
         except PetTracerError as err:
-            raise UpdateFailed(
-                f"Error communicating with PetTracer API: {err}"
+            if not is_auth_error(err):
+                raise
+            raise ConfigEntryAuthFailed(
+                f"Failed to authenticate with PetTracer: {err}"
             ) from err
+        self.async_save_token()
+
+    async def _async_fetch_devices(self) -> list[CollarSnapshot]:
+        """Fetch all collars, logging in again if the token was rejected."""
+        try:
+            return await self._async_get_all_devices()
+        except PetTracerError as err:
+            if not is_auth_error(err):
+                raise
+            _LOGGER.debug("PetTracer token was rejected, logging in again")
+
+        await self._async_login()
+        return await self._async_get_all_devices()
+
+    async def _async_get_all_devices(self) -> list[CollarSnapshot]:
+        """Fetch all collars, recording how long the request took."""
+        started = time.monotonic()
+        try:
+            devices = await self.client.get_all_devices()
+        finally:
+            elapsed = time.monotonic() - started
+            self.request_stats["count"] += 1
+            self.request_stats["total_seconds"] += elapsed
+            self.request_stats["last_seconds"] = elapsed
+            _LOGGER.debug("PetTracer device request took %.3f seconds", elapsed)
+        # Keep only what the integration reads, not the full client objects
+        return [CollarSnapshot.from_device(device) for device in devices]
+
+    @callback
+    def async_add_listener(
+        self, update_callback: CALLBACK_TYPE, context: Any = None
+    ) -> Callable[[], None]:
+        """Listen for data updates.
+
+        Entities pass ``(device_id, fields)`` as their context so that they
+        are only notified when one of those fields changes on their collar.
+        Listeners without a context are notified on every update.
+        """
+        remove_listener = super().async_add_listener(update_callback, context)
+        # Like the refresh timer, the midnight reset only runs while listened to
+        if self._unsub_midnight is None:
+            self._unsub_midnight = async_track_time_change(
+                self.hass, self.async_start_day, hour=0, minute=0, second=0
+            )
+
+        if context is None:
+            self._global_listeners.add(update_callback)
+        else:
+            device_id, fields = context
+            listeners = self._device_listeners.setdefault(device_id, {})
+            listeners[update_callback] = frozenset(fields)
+
+        @callback
+        def _remove_listener() -> None:
+            remove_listener()
+            if context is None:
+                self._global_listeners.discard(update_callback)
+            else:
+                self._device_listeners.get(context[0], {}).pop(update_callback, None)
+            if not self._listeners:
+                self._async_stop_midnight()
+
+        return _remove_listener
+
+    @callback
+    def async_update_listeners(self) -> None:
+        """Notify the listeners whose collar fields changed."""
+        changed, self._changed = self._changed, None
+        if changed is None:
+            self.write_stats["performed"] += sum(
+                len(listeners) for listeners in self._device_listeners.values()
+            )
+            super().async_update_listeners()
+            return
+
+        for update_callback in list(self._global_listeners):
+            update_callback()
+
+        for device_id, listeners in list(self._device_listeners.items()):
+            device_changes = changed.get(device_id)
+            for update_callback, fields in list(listeners.items()):
+                if device_changes and (not fields or fields & device_changes):
+                    self.write_stats["performed"] += 1
+                    update_callback()
+                else:
+                    self.write_stats["skipped"] += 1
+
+    def _stale_data(self, err: Exception | str) -> dict[str, Any]:
+        """Return the last good data, or fail once it is too old to serve.
+
+        Data of unknown age, such as a snapshot saved without its fetch
+        time, is not served at all.
+        """
+        if (
+            self.data is None
+            or self.data_time is None
+            or dt_util.utcnow() - self.data_time
+            > timedelta(seconds=STALE_DATA_MAX_SECONDS)
+        ):
+            raise UpdateFailed(f"Error communicating with PetTracer API: {err}")
+        return build_device_data(
+            self.data["devices"],
+            stale=True,
+            previous=self.data,
+            unchanged=self.data["devices_by_id"],
+        )
+
+    async def _async_update_data(self) -> dict:
+        """Fetch data from PetTracer API, joining a poll already in flight.
+
+        Scheduled polls, entity updates and automations can all start a
+        refresh. Only one fetch runs at a time; refreshes that arrive while
+        it is in flight wait for its result instead of calling the API again.
+        Every waiter gets the poll's changed fields, whatever order they
+        wake in.
+        """
+        if self._poll_task is not None:
+            self.request_stats["coalesced"] += 1
+            return await self._async_wait_poll()
+
+        self._poll_task = self.config_entry.async_create_task(
+            self.hass, self._async_poll(), f"{DOMAIN} poll"
+        )
+        try:
+            return await self._async_wait_poll()
+        finally:
+            self._poll_task = None
+
+    async def _async_wait_poll(self) -> dict[str, Any]:
+        """Wait for the poll in flight and hand its changes to the listeners."""
+        try:
+            data, changed = await asyncio.shield(self._poll_task)
+        except Exception:
+            # A failed refresh makes every entity re-evaluate availability
+            self._changed = None
+            raise
+        # Set after the wait, so the listener update that follows sees it
+        self._changed = changed
+        return data
+
+    def locate_pending(self, device_id: int) -> bool:
+        """Return True while a collar waits for a fix newer than its last press.
+
+        A request is given up after ``LOCATE_TIMEOUT_SECONDS``.
+        """
+        pending = self._locate_requests.get(device_id)
+        return (
+            pending is not None
+            and time.monotonic() - pending[0] < LOCATE_TIMEOUT_SECONDS
+        )
+
+    async def async_request_locate(self, device_id: int) -> None:
+        """Fetch a collar's latest fix as soon as the API spacing allows.
+
+        The fetch is account-wide, so presses on several collars share one
+        request, and polls are never started less than
+        ``MIN_UPDATE_INTERVAL_SECONDS`` apart.
+        """
+        monotonic = time.monotonic()
+        device = get_device(self.data, device_id)
+        if device is not None and not self.locate_pending(device_id):
+            self._locate_requests[device_id] = (
+                monotonic,
+                device_fingerprint(device)["timeMeasure"],
+            )
+
+        wait = 0.0
+        if self._last_poll_started is not None:
+            wait = self._last_poll_started + MIN_UPDATE_INTERVAL_SECONDS - monotonic
+        if wait <= 0:
+            await self.async_refresh()
+        elif self._unsub_locate is None:
+            self._unsub_locate = async_call_later(
+                self.hass, wait, self._async_locate_later
+            )
+
+    async def _async_locate_later(self, _now: datetime) -> None:
+        """Run the refresh deferred by the locate spacing."""
+        self._unsub_locate = None
+        await self.async_refresh()
+
+    def _resolve_locates(self, fingerprints: dict[int, dict[str, Any]]) -> None:
+        """Record the press-to-fix latency of collars that sent a newer fix."""
+        now = time.monotonic()
+        for device_id, (pressed, time_measure) in list(self._locate_requests.items()):
+            fingerprint = fingerprints.get(device_id)
+            if fingerprint is None or now - pressed >= LOCATE_TIMEOUT_SECONDS:
+                del self._locate_requests[device_id]
+            elif fingerprint["timeMeasure"] != time_measure:
+                self.locate_latency[device_id] = now - pressed
+                del self._locate_requests[device_id]
+                _LOGGER.debug(
+                    "New fix for PetTracer %s arrived %.1f seconds after locate",
+                    device_id,
+                    self.locate_latency[device_id],
+                )
+
+    @callback
+    def registered_devices(self) -> list[CollarSnapshot]:
+        """Return placeholders for the collars in the device registry.
+
+        Entities created for them show their restored state until the first
+        poll either finds the collar or removes it from the registry.
+        """
+        if self.last_success_time is not None:
+            return []
+        devices = []
+        for device_entry in dr.async_entries_for_config_entry(
+            dr.async_get(self.hass), self.config_entry.entry_id
+        ):
+            for domain, identifier in device_entry.identifiers:
+                if domain != DOMAIN or identifier == self.config_entry.entry_id:
+                    continue
+                devices.append(
+                    CollarSnapshot(
+                        id=int(identifier),
+                        sw=device_entry.sw_version,
+                        details=CollarDetails(device_entry.name),
+                    )
+                )
+        return devices
+
+    @callback
+    def _async_remove_stale_devices(self, device_ids: Iterable[int]) -> None:
+        """Remove collars that are no longer on the account from the registry."""
+        device_ids = set(device_ids)
+        # An empty list is more likely an API hiccup than every collar removed
+        if not device_ids or device_ids == self._registered_ids:
+            return
+        self._registered_ids = device_ids
+
+        device_registry = dr.async_get(self.hass)
+        current = {str(device_id) for device_id in device_ids}
+        for device_entry in dr.async_entries_for_config_entry(
+            device_registry, self.config_entry.entry_id
+        ):
+            identifiers = {
+                str(identifier)
+                for domain, identifier in device_entry.identifiers
+                if domain == DOMAIN
+            }
+            # The account device is identified by the entry id
+            if not identifiers or identifiers & (
+                current | {self.config_entry.entry_id}
+            ):
+                continue
+            _LOGGER.info(
+                "Removing PetTracer collar %s that is no longer on the account",
+                device_entry.name,
+            )
+            device_registry.async_update_device(
+                device_entry.id, remove_config_entry_id=self.config_entry.entry_id
+            )
+
+    def _deadbands(self) -> dict[str, float]:
+        """Return the configured deadband per fingerprint field."""
+        options = self.config_entry.options
+        return {
+            "bat": options.get(CONF_BATTERY_DEADBAND, DEFAULT_BATTERY_DEADBAND),
+            "rssi": options.get(CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND),
+        }
+
+    def _apply_escalation(self, devices: list[CollarSnapshot], now: datetime) -> None:
+        """Switch collars whose pet left or returned home between modes."""
+        options = self.config_entry.options
+        zone_id = options.get(CONF_ESCALATION_ZONE)
+        zone = self.hass.states.get(zone_id) if zone_id else None
+        away = {device.id: is_away(device, zone) for device in devices}
+
+        for device_id, mode in self.escalation.evaluate(
+            devices, away, options, now
+        ).items():
+            self.mode_changes.request(device_id, mode)
+
+        # Poll at the escalated pace straight away, for these collars only
+        self.scheduler.boost = {
+            device_id: MODE_POLL_INTERVALS[escalation.mode]
+            for device_id, escalation in self.escalation.active.items()
+        }
+
+    @callback
+    def async_start_day(self, now: datetime) -> None:
+        """Reset the daily and weekly totals at local midnight.
+
+        Polls reset them too, but not while they fail, so the reset is not
+        left to the next successful poll.
+        """
+        if self.data is None:
+            return
+        devices = self.odometer.current(self.data["devices"], now)
+        changed = {
+            device.id
+            for device, previous in zip(devices, self.data["devices"], strict=True)
+            if device.motion != previous.motion
+        }
+        if not changed:
+            return
+        for device in devices:
+            if device.id in changed and device.id in self._fingerprints:
+                self._fingerprints[device.id]["motion"] = device.motion
+        self._changed = {device_id: {"motion"} for device_id in changed}
+        self.data = build_device_data(
+            devices,
+            stale=self.data["stale"],
+            previous=self.data,
+            unchanged=self.data["devices_by_id"].keys() - changed,
+        )
+        self.async_update_listeners()
+
+    async def async_shutdown(self) -> None:
+        """Cancel deferred refreshes, mode changes and resets, then shut down."""
+        if self._unsub_locate is not None:
+            self._unsub_locate()
+            self._unsub_locate = None
+        self._async_stop_midnight()
+        self.mode_changes.cancel()
+        await super().async_shutdown()
+
+    @callback
+    def _async_stop_midnight(self) -> None:
+        """Cancel the midnight reset of the daily totals."""
+        if self._unsub_midnight is not None:
+            self._unsub_midnight()
+            self._unsub_midnight = None
+
+    async def _async_poll(
+        self,
+    ) -> tuple[dict[str, Any], dict[int, set[str]] | None]:
+        """Poll the PetTracer API once.
+
+        Returns the data with the fields changed per collar, or None when
+        every listener must update.
+        """
+        self._last_poll_started = time.monotonic()
+        now = dt_util.utcnow()
+        if not self.breaker.allow_request(now):
+            _LOGGER.debug("PetTracer circuit breaker is open, skipping request")
+            # Make sure the next scheduled poll is the recovery probe
+            self.update_interval = timedelta(seconds=self.breaker.retry_in(now))
+            # Nothing changed for the collar entities; only global listeners update
+            return self._stale_data("circuit breaker open"), {}
+
+        try:
+            if not self.client.is_authenticated:
+                await self._async_login()
+            devices = await self._async_fetch_devices()
+        # The client does not wrap timeouts and connection errors
+        except (PetTracerError, TimeoutError, ClientError) as err:
+            delay = self.breaker.record_failure(now)
+            self.update_interval = timedelta(seconds=delay)
+            _LOGGER.debug(
+                "PetTracer request failed %d time(s), retrying in %.0f seconds",
+                self.breaker.failures,
+                delay,
+            )
+            data = self._stale_data(err)
+            _LOGGER.warning(
+                "Error communicating with PetTracer API, using last known data: %s",
+                err,
+            )
+            return data, {}
+        self.breaker.record_success()
+        # The smoother works on the raw fixes, before jitter is held back
+        devices = self.smoother.apply(devices)
+        devices = self.position_filter.apply(devices, self.config_entry.options)
+        # History and distance follow the positions shown, with jitter and bad
+        # fixes held, so a resting pet does not add up distance
+        self.history.record(devices, self.config_entry.options)
+        devices = self.odometer.apply(devices, now)
+        first_success, self.last_success_time = self.last_success_time is None, now
+        self.data_time = now
+
+        fingerprints = {device.id: device_fingerprint(device) for device in devices}
+        deadbands = self._deadbands()
+        for device_id, fingerprint in fingerprints.items():
+            apply_deadbands(self._fingerprints.get(device_id), fingerprint, deadbands)
+        # Entities must re-evaluate availability after a failed refresh
+        changed: dict[int, set[str]] | None = None
+        if self.last_update_success:
+            changed = {
+                device_id: fields
+                for device_id, fingerprint in fingerprints.items()
+                if (
+                    fields := changed_fields(
+                        self._fingerprints.get(device_id), fingerprint
+                    )
+                )
+            }
+            for device_id in self._fingerprints.keys() - fingerprints.keys():
+                changed[device_id] = set(self._fingerprints[device_id])
+        if first_success:
+            # Every entity drops its restored marker once live data is in
+            changed = None
+        self._fingerprints = fingerprints
+        self._async_remove_stale_devices(fingerprints.keys())
+        self._resolve_locates(fingerprints)
+        # Mode selects drop their optimistic state once a change settles
+        for device_id in self.mode_changes.reconcile(devices):
+            if changed is not None:
+                changed.setdefault(device_id, set()).add("mode")
+        self._apply_escalation(devices, now)
+
+        self.scheduler.observe(devices, now)
+        self.update_interval = self.scheduler.interval(devices, now)
+
+        self._store.async_delay_save(
+            self._snapshot_to_store, STORAGE_SAVE_DELAY_SECONDS
+        )
+        # Scheduled once and not pushed back by later polls, so the history
+        # is written at most every HISTORY_SAVE_DELAY_SECONDS
+        if not self._history_save_pending:
+            self._history_save_pending = True
+            self._history_store.async_delay_save(
+                self._history_to_store, HISTORY_SAVE_DELAY_SECONDS
+            )
+
+        # Entity records of unchanged collars are reused rather than rebuilt
+        data = build_device_data(
+            devices,
+            previous=self.data,
+            unchanged=() if changed is None else fingerprints.keys() - changed.keys(),
+        )
+        return data, changed
@@ -9,11 +9,14 @@ from homeassistant.components.binary_sensor import (
     BinarySensorEntity,
 )
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import STATE_OFF, STATE_ON
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import DOMAIN
+from .entity import PetTracerEntity
+from .utils import async_add_device_entities
 
 
 async def async_setup_entry(
@@ -24,50 +27,44 @@ async def async_setup_entry(
     """Set up PetTracer binary sensors based on a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities: list = []
-    for device in coordinator.data.get("devices", []):
-        entities.append(PetTracerAtHomeBinarySensor(coordinator, device))
-        entities.append(PetTracerChargingBinarySensor(coordinator, device))
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device: (
+            PetTracerAtHomeBinarySensor(coordinator, device),
+            PetTracerChargingBinarySensor(coordinator, device),
+        ),
+    )
 
-    async_add_entities(entities, True)
 
-
-class PetTracerAtHomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class PetTracerAtHomeBinarySensor(PetTracerEntity, BinarySensorEntity, RestoreEntity):
     """Representation of a PetTracer at home binary sensor."""
 
     _attr_device_class = BinarySensorDeviceClass.PRESENCE
-    _attr_has_entity_name = True
 
     def __init__(self, coordinator, device):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._device = device
-        self._device_id = device.id
+        super().__init__(coordinator, device, ("home",))
+        self._restored_is_on: bool | None = None
         self._attr_unique_id = f"pettracer_{device.id}_at_home"
         self._attr_name = "At Home"
         self._attr_suggested_object_id = f"pettracer_{device.id}_at_home"
 
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state if the collar has no data yet."""
+        await super().async_added_to_hass()
+        if self._get_device_data() is None and (
+            state := await self.async_get_last_state()
+        ):
+            self._restored_is_on = {STATE_ON: True, STATE_OFF: False}.get(state.state)
+
     @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information about this sensor."""
-        device = self._get_device_data() or self._device
-        device_name = (
-            device.details.name if device.details else f"PetTracer {self._device_id}"
-        )
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": device_name,
-            "manufacturer": "PetTracer",
-            "model": "GPS Collar",
-            "sw_version": device.sw if device.sw else None,
-        }
-
-    def _get_device_data(self):
-        """Get updated device data from coordinator."""
-        for device in self.coordinator.data.get("devices", []):
-            if device.id == self._device_id:
-                return device
-        return None
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Flag values carried over from before a restart until a live poll."""
+        if self.coordinator.last_success_time is None:
+            return {"restored": True}
+        return {}
 
     @property
     def is_on(self) -> bool | None:
@@ -75,45 +72,38 @@ class PetTracerAtHomeBinarySensor(CoordinatorEntity, BinarySensorEntity):
         device = self._get_device_data()
         if device and device.home is not None:
             return device.home
+        if device is None:
+            return self._restored_is_on
         return None
 
 
-class PetTracerChargingBinarySensor(CoordinatorEntity, BinarySensorEntity):
+class PetTracerChargingBinarySensor(PetTracerEntity, BinarySensorEntity, RestoreEntity):
     """Representation of a PetTracer charging binary sensor."""
 
     _attr_device_class = BinarySensorDeviceClass.BATTERY_CHARGING
-    _attr_has_entity_name = True
 
     def __init__(self, coordinator, device):
         """Initialize the binary sensor."""
-        super().__init__(coordinator)
-        self._device = device
-        self._device_id = device.id
+        super().__init__(coordinator, device, ("chg",))
+        self._restored_is_on: bool | None = None
         self._attr_unique_id = f"pettracer_{device.id}_charging"
         self._attr_name = "Charging"
         self._attr_suggested_object_id = f"pettracer_{device.id}_charging"
 
+    async def async_added_to_hass(self) -> None:
+        """Restore the last state if the collar has no data yet."""
+        await super().async_added_to_hass()
+        if self._get_device_data() is None and (
+            state := await self.async_get_last_state()
+        ):
+            self._restored_is_on = {STATE_ON: True, STATE_OFF: False}.get(state.state)
+
     @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information about this sensor."""
-        device = self._get_device_data() or self._device
-        device_name = (
-            device.details.name if device.details else f"PetTracer {self._device_id}"
-        )
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": device_name,
-            "manufacturer": "PetTracer",
-            "model": "GPS Collar",
-            "sw_version": device.sw if device.sw else None,
-        }
-
-    def _get_device_data(self):
-        """Get updated device data from coordinator."""
-        for device in self.coordinator.data.get("devices", []):
-            if device.id == self._device_id:
-                return device
-        return None
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Flag values carried over from before a restart until a live poll."""
+        if self.coordinator.last_success_time is None:
+            return {"restored": True}
+        return {}
 
     @property
     def is_on(self) -> bool | None:
@@ -121,4 +111,6 @@ class PetTracerChargingBinarySensor(CoordinatorEntity, BinarySensorEntity):
         device = self._get_device_data()
         if device and device.chg is not None:
             return bool(device.chg)
+        if device is None:
+            return self._restored_is_on
         return None
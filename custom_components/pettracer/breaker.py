@@ -0,0 +1,70 @@
+"""Backoff and circuit breaker for the PetTracer cloud API."""
+
+from __future__ import annotations
+
+import random
+from collections.abc import Callable
+from datetime import datetime, timedelta
+
+from .const import (
+    BACKOFF_BASE_SECONDS,
+    BACKOFF_JITTER,
+    BACKOFF_MAX_SECONDS,
+    BREAKER_CLOSED,
+    BREAKER_FAILURE_THRESHOLD,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+)
+
+
+class CircuitBreaker:
+    """Space out requests while the API keeps failing.
+
+    Every consecutive failure doubles the delay before the next attempt, with
+    random jitter so that many installations do not retry in lockstep. After
+    ``BREAKER_FAILURE_THRESHOLD`` failures the breaker opens and refuses
+    requests until the delay has passed; it then half-opens to let a single
+    probe through, which either closes it again or re-opens it for longer.
+    """
+
+    def __init__(self, rand: Callable[[], float] = random.random) -> None:
+        """Initialize the breaker."""
+        self._rand = rand
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.retry_at: datetime | None = None
+
+    def allow_request(self, now: datetime) -> bool:
+        """Return True if a request may be sent to the API."""
+        if self.state == BREAKER_OPEN:
+            if self.retry_at is not None and now < self.retry_at:
+                return False
+            self.state = BREAKER_HALF_OPEN
+        return True
+
+    def retry_in(self, now: datetime) -> float:
+        """Return the seconds until the breaker lets a probe through."""
+        if self.retry_at is None:
+            return 0.0
+        return max((self.retry_at - now).total_seconds(), 1.0)
+
+    def record_success(self) -> None:
+        """Close the breaker after a successful request."""
+        self.state = BREAKER_CLOSED
+        self.failures = 0
+        self.retry_at = None
+
+    def record_failure(self, now: datetime) -> float:
+        """Count a failed request and return the seconds to wait before retrying."""
+        self.failures += 1
+        delay = min(
+            BACKOFF_BASE_SECONDS * 2 ** (self.failures - 1), BACKOFF_MAX_SECONDS
+        )
+        delay *= 1 - BACKOFF_JITTER * self._rand()
+        self.retry_at = now + timedelta(seconds=delay)
+        if (
+            self.state == BREAKER_HALF_OPEN
+            or self.failures >= BREAKER_FAILURE_THRESHOLD
+        ):
+            self.state = BREAKER_OPEN
+        return delay
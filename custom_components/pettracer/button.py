@@ -0,0 +1,83 @@
+"""Support for PetTracer buttons."""
+
+from __future__ import annotations
+
+from datetime import datetime
+from typing import Any
+
+from homeassistant.components.button import ButtonEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.helpers.event import async_call_later
+
+from .const import DOMAIN, LOCATE_TIMEOUT_SECONDS
+from .entity import PetTracerEntity
+from .utils import async_add_device_entities
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PetTracer buttons based on a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device: (PetTracerLocateButton(coordinator, device),),
+    )
+
+
+class PetTracerLocateButton(PetTracerEntity, ButtonEntity):
+    """Fetch a collar's latest position immediately."""
+
+    _attr_icon = "mdi:crosshairs-gps"
+
+    def __init__(self, coordinator, device):
+        """Initialize the button."""
+        # Only a new fix changes the measured latency
+        super().__init__(coordinator, device, ("timeMeasure",))
+        self._attr_unique_id = f"pettracer_{device.id}_locate"
+        self._attr_name = "Locate Now"
+        self._attr_suggested_object_id = f"pettracer_{device.id}_locate"
+        self._unsub_timeout: CALLBACK_TYPE | None = None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether a fix is awaited and the last press-to-fix latency."""
+        latency = self.coordinator.locate_latency.get(self._device_id)
+        return {
+            "pending": self.coordinator.locate_pending(self._device_id),
+            "last_fix_latency": round(latency, 1) if latency is not None else None,
+        }
+
+    async def async_press(self) -> None:
+        """Ask the coordinator for the collar's latest position.
+
+        A new fix resolves the request through the ``timeMeasure`` update;
+        a request that times out is written once it has been given up.
+        """
+        await self.coordinator.async_request_locate(self._device_id)
+        self.async_write_ha_state()
+        if self._unsub_timeout is not None:
+            self._unsub_timeout()
+        self._unsub_timeout = async_call_later(
+            self.hass, LOCATE_TIMEOUT_SECONDS, self._async_locate_timed_out
+        )
+
+    @callback
+    def _async_locate_timed_out(self, _now: datetime) -> None:
+        """Write the state once an unanswered request has been given up."""
+        self._unsub_timeout = None
+        self.async_write_ha_state()
+
+    async def async_will_remove_from_hass(self) -> None:
+        """Cancel the pending request's timeout."""
+        await super().async_will_remove_from_hass()
+        if self._unsub_timeout is not None:
+            self._unsub_timeout()
+            self._unsub_timeout = None
@@ -10,9 +10,39 @@ import voluptuous as vol
 
 from homeassistant import config_entries
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.core import callback
 from homeassistant.data_entry_flow import FlowResult
-
-from .const import DOMAIN
+from homeassistant.helpers import selector
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+from .const import (
+    CONF_BACKGROUND_SETUP,
+    CONF_BATTERY_DEADBAND,
+    CONF_ESCALATE_ON_LEAVE,
+    CONF_ESCALATION_MODE,
+    CONF_ESCALATION_TIMEOUT,
+    CONF_ESCALATION_ZONE,
+    CONF_HISTORY_DEPTH,
+    CONF_HISTORY_MEMORY,
+    CONF_JITTER_FLOOR,
+    CONF_MAX_ACCURACY,
+    CONF_MIN_SATELLITES,
+    CONF_RSSI_DEADBAND,
+    DATA_VALIDATED_CLIENTS,
+    DEFAULT_BATTERY_DEADBAND,
+    DEFAULT_ESCALATION_MODE,
+    DEFAULT_ESCALATION_TIMEOUT,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_HISTORY_MEMORY,
+    DEFAULT_JITTER_FLOOR,
+    DEFAULT_MAX_ACCURACY,
+    DEFAULT_MIN_SATELLITES,
+    DEFAULT_RSSI_DEADBAND,
+    DOMAIN,
+    ESCALATION_MODES,
+    MODE_NAMES,
+)
+from .utils import token_data
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -29,6 +59,14 @@ class PetTracerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(
+        config_entry: config_entries.ConfigEntry,
+    ) -> PetTracerOptionsFlow:
+        """Get the options flow for this handler."""
+        return PetTracerOptionsFlow()
+
     async def async_step_user(
         self, user_input: dict[str, Any] | None = None
     ) -> FlowResult:
@@ -36,9 +74,13 @@ class PetTracerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         errors: dict[str, str] = {}
 
         if user_input is not None:
+            # Create a unique ID for this config entry
+            await self.async_set_unique_id(user_input[CONF_USERNAME].lower())
+            self._abort_if_unique_id_configured()
+
             # Validate the credentials
             try:
-                await self._test_credentials(
+                client = await self._test_credentials(
                     user_input[CONF_USERNAME], user_input[CONF_PASSWORD]
                 )
             except PetTracerError:
@@ -47,13 +89,14 @@ class PetTracerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                # Create a unique ID for this config entry
-                await self.async_set_unique_id(user_input[CONF_USERNAME].lower())
-                self._abort_if_unique_id_configured()
+                # Setup picks up the logged-in client instead of a new one
+                self.hass.data.setdefault(DATA_VALIDATED_CLIENTS, {})[
+                    self.unique_id
+                ] = client
 
                 return self.async_create_entry(
                     title=f"PetTracer ({user_input[CONF_USERNAME]})",
-                    data=user_input,
+                    data={**user_input, **token_data(client)},
                 )
 
         return self.async_show_form(
@@ -78,17 +121,29 @@ class PetTracerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             password = user_input[CONF_PASSWORD]
 
             try:
-                await self._test_credentials(username, password)
+                client = await self._test_credentials(username, password)
             except PetTracerError:
                 errors["base"] = "invalid_auth"
             except Exception:  # pylint: disable=broad-except
                 _LOGGER.exception("Unexpected exception")
                 errors["base"] = "unknown"
             else:
-                return self.async_update_reload_and_abort(
-                    reauth_entry,
-                    data={CONF_USERNAME: username, CONF_PASSWORD: password},
-                )
+                # The running client adopts the token, so this one is done
+                data = {
+                    CONF_USERNAME: username,
+                    CONF_PASSWORD: password,
+                    **token_data(client),
+                }
+                await client.close()
+                if reauth_entry.state is not config_entries.ConfigEntryState.LOADED:
+                    return self.async_update_reload_and_abort(reauth_entry, data=data)
+
+                # Hand the new credentials to the running coordinator so the
+                # entities stay in place instead of being reloaded
+                self.hass.config_entries.async_update_entry(reauth_entry, data=data)
+                coordinator = self.hass.data[DOMAIN][reauth_entry.entry_id]
+                await coordinator.async_reauthenticate()
+                return self.async_abort(reason="reauth_successful")
 
         return self.async_show_form(
             step_id="reauth_confirm",
@@ -96,7 +151,96 @@ class PetTracerConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             errors=errors,
         )
 
-    async def _test_credentials(self, username: str, password: str) -> None:
-        """Validate credentials."""
-        client = PetTracerClient()
-        await client.login(username, password)
+    async def _test_credentials(self, username: str, password: str) -> PetTracerClient:
+        """Validate credentials and return the logged-in client."""
+        client = PetTracerClient(session=async_get_clientsession(self.hass))
+        try:
+            await client.login(username, password)
+        except Exception:
+            await client.close()
+            raise
+        return client
+
+
+class PetTracerOptionsFlow(config_entries.OptionsFlow):
+    """Handle PetTracer options."""
+
+    async def async_step_init(
+        self, user_input: dict[str, Any] | None = None
+    ) -> FlowResult:
+        """Manage the options."""
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema: dict[Any, Any] = {
+            vol.Optional(
+                CONF_BACKGROUND_SETUP,
+                default=options.get(CONF_BACKGROUND_SETUP, False),
+            ): bool,
+            vol.Optional(
+                CONF_ESCALATE_ON_LEAVE,
+                default=options.get(CONF_ESCALATE_ON_LEAVE, False),
+            ): bool,
+            vol.Optional(
+                CONF_ESCALATION_MODE,
+                default=options.get(CONF_ESCALATION_MODE, DEFAULT_ESCALATION_MODE),
+            ): vol.In([MODE_NAMES[mode] for mode in ESCALATION_MODES]),
+            vol.Optional(
+                CONF_ESCALATION_TIMEOUT,
+                default=options.get(
+                    CONF_ESCALATION_TIMEOUT, DEFAULT_ESCALATION_TIMEOUT
+                ),
+            ): vol.All(vol.Coerce(int), vol.Range(min=1, max=240)),
+        }
+        zone = options.get(CONF_ESCALATION_ZONE)
+        schema[
+            vol.Optional(
+                CONF_ESCALATION_ZONE,
+                description={"suggested_value": zone} if zone else None,
+            )
+        ] = selector.EntitySelector(selector.EntitySelectorConfig(domain="zone"))
+        schema[
+            vol.Optional(
+                CONF_BATTERY_DEADBAND,
+                default=options.get(CONF_BATTERY_DEADBAND, DEFAULT_BATTERY_DEADBAND),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=500))
+        schema[
+            vol.Optional(
+                CONF_RSSI_DEADBAND,
+                default=options.get(CONF_RSSI_DEADBAND, DEFAULT_RSSI_DEADBAND),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=30))
+        schema[
+            vol.Optional(
+                CONF_JITTER_FLOOR,
+                default=options.get(CONF_JITTER_FLOOR, DEFAULT_JITTER_FLOOR),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=500))
+        schema[
+            vol.Optional(
+                CONF_MAX_ACCURACY,
+                default=options.get(CONF_MAX_ACCURACY, DEFAULT_MAX_ACCURACY),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=5000))
+        schema[
+            vol.Optional(
+                CONF_MIN_SATELLITES,
+                default=options.get(CONF_MIN_SATELLITES, DEFAULT_MIN_SATELLITES),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=12))
+        schema[
+            vol.Optional(
+                CONF_HISTORY_DEPTH,
+                default=options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=0, max=10000))
+        schema[
+            vol.Optional(
+                CONF_HISTORY_MEMORY,
+                default=options.get(CONF_HISTORY_MEMORY, DEFAULT_HISTORY_MEMORY),
+            )
+        ] = vol.All(vol.Coerce(int), vol.Range(min=64, max=65536))
+
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -1,9 +1,58 @@
 """Constants for the PetTracer integration."""
 
+from datetime import timedelta
+
 DOMAIN = "pettracer"
 
+# Clients logged in by the config flow, keyed by unique id, awaiting setup
+DATA_VALIDATED_CLIENTS = f"{DOMAIN}_validated_clients"
+
+# Session token reuse across restarts
+CONF_TOKEN_EXPIRES = "token_expires"
+TOKEN_EXPIRY_MARGIN = timedelta(hours=1)  # Log in again this long before expiry
+AUTH_ERROR_STATUSES = {401, 403}  # HTTP statuses meaning the token was rejected
+
+# Persistent storage of the last known device snapshot
+STORAGE_VERSION = 1
+# Each poll restarts the delay, so it must be shorter than the fastest polling
+STORAGE_SAVE_DELAY_SECONDS = 10
+# The position history can be large, so it is saved apart and at most this often
+HISTORY_SAVE_DELAY_SECONDS = 300
+
 # Update intervals
 UPDATE_INTERVAL_SECONDS = 60  # Poll every 60 seconds for location updates
+MIN_UPDATE_INTERVAL_SECONDS = 15  # Never poll the cloud faster than this
+MAX_UPDATE_INTERVAL_SECONDS = 600  # Never let idle collars go stale longer than this
+
+# A "Locate now" press waits at most this long for a newer fix
+LOCATE_TIMEOUT_SECONDS = 600
+
+# Smoothing factor for the observed lastContact cadence of each collar
+CADENCE_SMOOTHING = 0.3
+# Poll this long after a collar's expected upload so the cloud has stored it
+UPLOAD_LAG_SECONDS = 5
+
+# Constant-velocity Kalman filter behind the smoothed position
+SMOOTHING_PROCESS_NOISE = 0.01  # m²/s³, how freely a pet changes speed
+SMOOTHING_INITIAL_SPEED = 2.0  # m/s, uncertainty of a new track's velocity
+SMOOTHING_DEFAULT_ACCURACY = 50  # Meters, for fixes without an accuracy
+SMOOTHING_MIN_ACCURACY = 3  # Meters, no fix is trusted more than this
+SMOOTHING_RESET_SECONDS = 3600  # Start a new track after a gap this long
+
+# A leg faster than this between fixes is a GPS jump, not counted as travel
+ODOMETER_MAX_SPEED = 20  # m/s, about 72 km/h
+
+# Backoff and circuit breaker for cloud API failures
+BACKOFF_BASE_SECONDS = 30  # Delay after the first failure, doubled per failure
+BACKOFF_MAX_SECONDS = 1800
+BACKOFF_JITTER = 0.5  # Each delay is randomly shortened by up to this fraction
+BREAKER_FAILURE_THRESHOLD = 3  # Consecutive failures before requests are blocked
+STALE_DATA_MAX_SECONDS = 3600  # Serve the last good data for this long
+
+# Circuit breaker states
+BREAKER_CLOSED = "closed"
+BREAKER_OPEN = "open"
+BREAKER_HALF_OPEN = "half_open"
 
 # Mode mappings - PetTracer device modes
 # Maps device mode values to their standardized numeric representation
@@ -36,3 +85,56 @@ MODE_NAMES = {
     MODE_SLOW_PLUS: "Slow+",
     MODE_SLOW: "Slow",
 }
+
+# Nominal reporting period of each mode in seconds, used to pace polling
+MODE_POLL_INTERVALS = {
+    MODE_LIVE: 20,
+    MODE_FAST_PLUS: 30,
+    MODE_FAST: 60,
+    MODE_NORMAL_PLUS: 120,
+    MODE_NORMAL: 180,
+    # Unlike Fast+ and Normal+, Slow+ reports less often than its base mode
+    MODE_SLOW_PLUS: 1800,
+    MODE_SLOW: 900,
+}
+
+# Modes that can be set from Home Assistant, in the order they are offered
+SETTABLE_MODES = (MODE_LIVE, MODE_FAST, MODE_NORMAL, MODE_SLOW)
+
+# Mode changes requested within this window are sent together
+MODE_BATCH_DELAY_SECONDS = 1.0
+# Show a requested mode until the collar applies it, for at most this long
+MODE_CONFIRM_TIMEOUT_SECONDS = 900
+
+# Option: finish setup at once and log in and fetch in the background
+CONF_BACKGROUND_SETUP = "background_setup"
+
+# Options: escalate collars to a faster mode when the pet leaves home
+CONF_ESCALATE_ON_LEAVE = "escalate_on_leave"
+CONF_ESCALATION_MODE = "escalation_mode"
+CONF_ESCALATION_TIMEOUT = "escalation_timeout"  # Minutes
+CONF_ESCALATION_ZONE = "escalation_zone"
+DEFAULT_ESCALATION_MODE = MODE_NAMES[MODE_LIVE]
+DEFAULT_ESCALATION_TIMEOUT = 30
+ESCALATION_MODES = (MODE_LIVE, MODE_FAST)
+
+# Options: smaller changes than these don't write entity states on their own
+CONF_BATTERY_DEADBAND = "battery_deadband"  # mV
+CONF_RSSI_DEADBAND = "rssi_deadband"  # dBm
+DEFAULT_BATTERY_DEADBAND = 20
+DEFAULT_RSSI_DEADBAND = 3
+
+# Options: hold positions that moved less than the fix's accuracy or this floor,
+# and reject fixes less accurate or from fewer satellites than these limits
+CONF_JITTER_FLOOR = "jitter_floor"  # Meters
+CONF_MAX_ACCURACY = "max_accuracy"  # Meters, 0 disables
+CONF_MIN_SATELLITES = "min_satellites"  # 0 disables
+DEFAULT_JITTER_FLOOR = 10
+DEFAULT_MAX_ACCURACY = 250
+DEFAULT_MIN_SATELLITES = 3
+
+# Options: recent fixes kept per collar, within a memory cap for all collars
+CONF_HISTORY_DEPTH = "history_depth"  # Fixes, 0 disables
+CONF_HISTORY_MEMORY = "history_memory"  # KiB
+DEFAULT_HISTORY_DEPTH = 1000
+DEFAULT_HISTORY_MEMORY = 1024
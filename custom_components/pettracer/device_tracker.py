@@ -7,12 +7,31 @@ from typing import Any
 from homeassistant.components.device_tracker import SourceType
 from homeassistant.components.device_tracker.config_entry import TrackerEntity
 from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import (
+    ATTR_BATTERY_LEVEL,
+    ATTR_GPS_ACCURACY,
+    ATTR_LATITUDE,
+    ATTR_LONGITUDE,
+)
 from homeassistant.core import HomeAssistant
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
-from homeassistant.helpers.update_coordinator import CoordinatorEntity
+from homeassistant.helpers.restore_state import RestoreEntity
 
 from .const import DOMAIN
-from .utils import battery_mv_to_percentage
+from .entity import PetTracerEntity
+from .utils import (
+    async_add_device_entities,
+    battery_mv_to_percentage,
+    get_device_record,
+)
+
+# Attributes of ours that are restored along with the position
+RESTORED_ATTRIBUTES = (
+    "battery_voltage_mv",
+    "status",
+    "mode",
+    "at_home",
+)
 
 
 async def async_setup_entry(
@@ -23,53 +42,71 @@ async def async_setup_entry(
     """Set up PetTracer device trackers based on a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities = []
-    for device in coordinator.data.get("devices", []):
-        entities.append(PetTracerDeviceTracker(coordinator, device))
-
-    async_add_entities(entities, True)
-
-
-class PetTracerDeviceTracker(CoordinatorEntity, TrackerEntity):
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device: (
+            PetTracerDeviceTracker(coordinator, device),
+            PetTracerSmoothedTracker(coordinator, device),
+        ),
+    )
+
+
+def tracker_attributes(device: Any) -> dict[str, Any]:
+    """Return the tracker's extra state attributes for a collar.
+
+    Built once per collar change and kept in the coordinator data; callers
+    must not modify the returned dict.
+    """
+    attributes = {}
+    if device.bat:
+        attributes["battery_voltage_mv"] = device.bat
+    if device.status is not None:
+        attributes["status"] = device.status
+    if device.mode is not None:
+        attributes["mode"] = device.mode
+    if device.home is not None:
+        attributes["at_home"] = device.home
+    return attributes
+
+
+class PetTracerDeviceTracker(PetTracerEntity, TrackerEntity, RestoreEntity):
     """Representation of a PetTracer device tracker."""
 
-    _attr_has_entity_name = True
     _attr_name = None
+    # Has its own sensor; keep it out of the recorder's attribute rows
+    _unrecorded_attributes = frozenset({"battery_voltage_mv"})
 
     def __init__(self, coordinator, device):
         """Initialize the tracker."""
-        super().__init__(coordinator)
-        self._device = device
-        self._device_id = device.id
+        # Only what the state and attributes show; a held fix with a new
+        # position time, or a new contact time, alone writes nothing. Those
+        # have their own sensors, so the tracker carries no attributes for them
+        super().__init__(
+            coordinator,
+            device,
+            ("posLat", "posLong", "acc", "bat", "status", "mode", "home"),
+        )
         self._attr_unique_id = f"pettracer_{device.id}"
         self._attr_suggested_object_id = f"pettracer_{device.id}"
+        # Last state from the previous run, shown until the collar is fetched
+        self._restored_attributes: dict[str, Any] | None = None
 
-    def _get_device_data(self):
-        """Get updated device data from coordinator."""
-        for device in self.coordinator.data.get("devices", []):
-            if device.id == self._device_id:
-                return device
-        return None
-
-    @property
-    def device_info(self) -> dict[str, Any]:
-        """Return device information about this tracker."""
-        device = self._get_device_data() or self._device
-        device_name = (
-            device.details.name if device.details else f"PetTracer {self._device_id}"
-        )
-        return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": device_name,
-            "manufacturer": "PetTracer",
-            "model": "GPS Collar",
-            "sw_version": device.sw if device.sw else None,
-        }
+    async def async_added_to_hass(self) -> None:
+        """Restore the last known position if the collar has no data yet."""
+        await super().async_added_to_hass()
+        if self._get_device_data() is None and (
+            state := await self.async_get_last_state()
+        ):
+            self._restored_attributes = dict(state.attributes)
 
     @property
     def available(self) -> bool:
         """Return True if entity is available."""
-        return self._get_device_data() is not None
+        return (
+            self._get_device_data() is not None or self._restored_attributes is not None
+        )
 
     @property
     def source_type(self) -> SourceType:
@@ -82,6 +119,8 @@ class PetTracerDeviceTracker(CoordinatorEntity, TrackerEntity):
         device = self._get_device_data()
         if device and device.lastPos:
             return device.lastPos.posLat
+        if device is None and self._restored_attributes:
+            return self._restored_attributes.get(ATTR_LATITUDE)
         return None
 
     @property
@@ -90,6 +129,8 @@ class PetTracerDeviceTracker(CoordinatorEntity, TrackerEntity):
         device = self._get_device_data()
         if device and device.lastPos:
             return device.lastPos.posLong
+        if device is None and self._restored_attributes:
+            return self._restored_attributes.get(ATTR_LONGITUDE)
         return None
 
     @property
@@ -98,6 +139,8 @@ class PetTracerDeviceTracker(CoordinatorEntity, TrackerEntity):
         device = self._get_device_data()
         if device and device.lastPos and device.lastPos.acc:
             return device.lastPos.acc
+        if device is None and self._restored_attributes:
+            return self._restored_attributes.get(ATTR_GPS_ACCURACY, 0)
         return 0
 
     @property
@@ -106,31 +149,82 @@ class PetTracerDeviceTracker(CoordinatorEntity, TrackerEntity):
         device = self._get_device_data()
         if device and device.bat:
             return battery_mv_to_percentage(device.bat)
+        if device is None and self._restored_attributes:
+            return self._restored_attributes.get(ATTR_BATTERY_LEVEL)
         return None
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
         """Return additional state attributes."""
-        attributes = {}
         device = self._get_device_data()
 
         if device:
-            if device.bat:
-                attributes["battery_voltage_mv"] = device.bat
-            if device.lastContact:
-                attributes["last_contact"] = device.lastContact
-            if device.lastPos:
-                if device.lastPos.sat:
-                    attributes["satellites"] = device.lastPos.sat
-                if device.lastPos.rssi:
-                    attributes["signal_strength"] = device.lastPos.rssi
-                if device.lastPos.timeMeasure:
-                    attributes["position_time"] = device.lastPos.timeMeasure
-            if device.status is not None:
-                attributes["status"] = device.status
-            if device.mode is not None:
-                attributes["mode"] = device.mode
-            if device.home is not None:
-                attributes["at_home"] = device.home
+            attributes = get_device_record(
+                self.coordinator.data, "tracker_attributes", device, tracker_attributes
+            )
+        elif self._restored_attributes:
+            attributes = {
+                key: self._restored_attributes[key]
+                for key in RESTORED_ATTRIBUTES
+                if key in self._restored_attributes
+            }
+        else:
+            attributes = {}
+
+        # Flags values carried over from before a restart until a live poll
+        if self.coordinator.last_success_time is None:
+            attributes = {**attributes, "restored": True}
 
         return attributes
+
+
+class PetTracerSmoothedTracker(PetTracerEntity, TrackerEntity):
+    """A collar's Kalman-smoothed position.
+
+    Follows the pet with less jitter than the raw fixes, so zone automations
+    built on it flap less. Disabled by default.
+    """
+
+    _attr_entity_registry_enabled_default = False
+    _attr_icon = "mdi:map-marker-path"
+
+    def __init__(self, coordinator, device):
+        """Initialize the tracker."""
+        # The smoothed position only moves with a new fix
+        super().__init__(coordinator, device, ("timeMeasure",))
+        self._attr_unique_id = f"pettracer_{device.id}_smoothed"
+        self._attr_name = "Smoothed Position"
+        self._attr_suggested_object_id = f"pettracer_{device.id}_smoothed"
+
+    def _get_smoothed(self):
+        """Return the collar's smoothed position, if any."""
+        device = self._get_device_data()
+        return device.smoothed if device else None
+
+    @property
+    def available(self) -> bool:
+        """Return True once the collar has a smoothed position."""
+        return self._get_smoothed() is not None
+
+    @property
+    def source_type(self) -> SourceType:
+        """Return the source type, eg gps or router, of the device."""
+        return SourceType.GPS
+
+    @property
+    def latitude(self) -> float | None:
+        """Return the smoothed latitude."""
+        smoothed = self._get_smoothed()
+        return smoothed.posLat if smoothed else None
+
+    @property
+    def longitude(self) -> float | None:
+        """Return the smoothed longitude."""
+        smoothed = self._get_smoothed()
+        return smoothed.posLong if smoothed else None
+
+    @property
+    def location_accuracy(self) -> int:
+        """Return the estimated accuracy of the smoothed position in meters."""
+        smoothed = self._get_smoothed()
+        return smoothed.acc if smoothed else 0
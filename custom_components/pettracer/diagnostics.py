@@ -0,0 +1,78 @@
+"""Diagnostics support for PetTracer."""
+
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+from homeassistant.core import HomeAssistant
+
+from .const import DOMAIN
+
+TO_REDACT = {CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME}
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict[str, Any]:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    scheduler = coordinator.scheduler
+    requests = coordinator.request_stats
+    breaker = coordinator.breaker
+    writes = coordinator.write_stats
+    hours = max(time.monotonic() - coordinator.write_stats_started, 1) / 3600
+
+    return {
+        "entry": async_redact_data(entry.as_dict(), TO_REDACT),
+        "device_count": len(coordinator.data.get("devices", [])),
+        "setup_seconds": coordinator.setup_seconds,
+        "first_refresh_seconds": coordinator.first_refresh_seconds,
+        "restored_from_snapshot": coordinator.restored,
+        "state_writes": dict(writes),
+        # Every state write is a recorder row; skipped writes would have been
+        # rows without change detection and deadbands
+        "recorder_rows_per_hour": {
+            "without_filtering": round(
+                (writes["performed"] + writes["skipped"]) / hours, 1
+            ),
+            "with_filtering": round(writes["performed"] / hours, 1),
+        },
+        "update_interval_seconds": coordinator.update_interval.total_seconds(),
+        "breaker": {
+            "state": breaker.state,
+            "consecutive_failures": breaker.failures,
+            "retry_at": breaker.retry_at.isoformat() if breaker.retry_at else None,
+            "stale": coordinator.data.get("stale", False),
+        },
+        "requests": {
+            "count": requests["count"],
+            "coalesced": requests["coalesced"],
+            "last_seconds": requests["last_seconds"],
+            "mean_seconds": (
+                requests["total_seconds"] / requests["count"]
+                if requests["count"]
+                else None
+            ),
+        },
+        "locate_latency_seconds": dict(coordinator.locate_latency),
+        "escalations": coordinator.escalation.as_dict(),
+        "position_filter": dict(coordinator.position_filter.stats),
+        "position_history": {
+            "fixes": {
+                device_id: len(history)
+                for device_id, history in coordinator.history.fixes.items()
+            },
+            "bytes": coordinator.history.nbytes,
+        },
+        "staleness_seconds": {
+            device_id: {
+                "last": staleness,
+                "mean": scheduler.mean_staleness.get(device_id),
+            }
+            for device_id, staleness in scheduler.staleness.items()
+        },
+    }
@@ -0,0 +1,56 @@
+"""Base entity for PetTracer collars."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+
+from .const import DOMAIN
+from .utils import get_device, get_device_record
+
+
+def collar_device_info(device: Any) -> dict[str, Any]:
+    """Return the device registry information for a collar."""
+    return {
+        "identifiers": {(DOMAIN, device.id)},
+        "name": device.details.name if device.details else f"PetTracer {device.id}",
+        "manufacturer": "PetTracer",
+        "model": "GPS Collar",
+        "sw_version": device.sw if device.sw else None,
+    }
+
+
+class PetTracerEntity(CoordinatorEntity):
+    """An entity that belongs to one PetTracer collar."""
+
+    _attr_has_entity_name = True
+
+    def __init__(self, coordinator, device, fields: tuple[str, ...] = ()) -> None:
+        """Initialize the entity.
+
+        ``fields`` are the collar fields the entity's state is derived from;
+        the entity is only written when one of them changes. An empty tuple
+        subscribes to every change on the collar.
+        """
+        super().__init__(coordinator, context=(device.id, fields))
+        # Only what device_info needs if the collar drops out of the data
+        self._identity = device.identity()
+        self._device_id = device.id
+
+    def _get_device_data(self):
+        """Get updated device data from coordinator."""
+        return get_device(self.coordinator.data, self._device_id)
+
+    @property
+    def device_info(self) -> dict[str, Any]:
+        """Return device information about this collar.
+
+        Built once per collar change and shared by all of its entities.
+        """
+        device = self._get_device_data()
+        if device is None:
+            return collar_device_info(self._identity)
+        return get_device_record(
+            self.coordinator.data, "device_info", device, collar_device_info
+        )
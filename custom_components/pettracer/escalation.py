@@ -0,0 +1,171 @@
+"""Escalate collars to a faster mode while a pet is away from home."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass
+from datetime import datetime, timedelta
+from typing import Any
+
+from homeassistant.core import State
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    CONF_ESCALATE_ON_LEAVE,
+    CONF_ESCALATION_MODE,
+    CONF_ESCALATION_TIMEOUT,
+    DEFAULT_ESCALATION_MODE,
+    DEFAULT_ESCALATION_TIMEOUT,
+    MODE_NAMES,
+    MODE_NORMAL,
+    MODE_POLL_INTERVALS,
+)
+from .utils import haversine_distance
+
+_LOGGER = logging.getLogger(__name__)
+
+MODES_BY_NAME = {name: mode for mode, name in MODE_NAMES.items()}
+
+
+@dataclass
+class Escalation:
+    """A collar switched to a faster mode because its pet left home."""
+
+    mode: int
+    previous_mode: int
+    started: datetime
+
+
+def is_away(device: Any, zone: State | None = None) -> bool | None:
+    """Return whether a collar is outside its home area, or None if unknown.
+
+    With a zone, the collar is away once its last position lies outside the
+    zone's radius; otherwise the collar's own home flag decides. A zone
+    without a valid centre never counts the collar as away.
+    """
+    position = device.lastPos
+    if (
+        zone is not None
+        and position is not None
+        and position.posLat is not None
+        and position.posLong is not None
+    ):
+        try:
+            latitude = float(zone.attributes.get("latitude"))
+            longitude = float(zone.attributes.get("longitude"))
+            radius = float(zone.attributes.get("radius") or 0)
+        except (TypeError, ValueError):
+            return False
+        distance = haversine_distance(
+            position.posLat, position.posLong, latitude, longitude
+        )
+        return distance > radius
+    if device.home is None:
+        return None
+    return not device.home
+
+
+def _reports_as_often(mode: int | None, target: int) -> bool:
+    """Return True if a collar's mode already reports at least as often as target."""
+    interval = MODE_POLL_INTERVALS.get(mode)
+    return interval is not None and interval <= MODE_POLL_INTERVALS[target]
+
+
+class EscalationPolicy:
+    """Decide which collars to escalate or return to their previous mode.
+
+    A collar whose pet leaves home is switched to the configured fast mode,
+    remembering the mode it was in; a collar whose mode already reports at
+    least as often is left alone. It goes back to that mode when the pet
+    returns or after the configured timeout; after a timeout the collar is
+    not escalated again until the pet has been home.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the policy."""
+        self.active: dict[int, Escalation] = {}
+        self._expired: set[int] = set()
+
+    def evaluate(
+        self,
+        devices: list[Any],
+        away: Mapping[int, bool | None],
+        options: Mapping[str, Any],
+        now: datetime,
+    ) -> dict[int, int]:
+        """Return the mode changes to make, keyed by device id."""
+        enabled = options.get(CONF_ESCALATE_ON_LEAVE, False)
+        target = MODES_BY_NAME[
+            options.get(CONF_ESCALATION_MODE, DEFAULT_ESCALATION_MODE)
+        ]
+        timeout = timedelta(
+            minutes=options.get(CONF_ESCALATION_TIMEOUT, DEFAULT_ESCALATION_TIMEOUT)
+        )
+
+        changes: dict[int, int] = {}
+        for device in devices:
+            is_out = away.get(device.id)
+            escalation = self.active.get(device.id)
+            if escalation is not None:
+                if not enabled or is_out is False or now - escalation.started > timeout:
+                    _LOGGER.debug(
+                        "Returning PetTracer %s to mode %s",
+                        device.id,
+                        escalation.previous_mode,
+                    )
+                    changes[device.id] = escalation.previous_mode
+                    del self.active[device.id]
+                    if enabled and is_out:
+                        self._expired.add(device.id)
+                continue
+
+            if is_out is False:
+                self._expired.discard(device.id)
+            if (
+                enabled
+                and is_out
+                and device.id not in self._expired
+                and not _reports_as_often(device.mode, target)
+            ):
+                _LOGGER.debug(
+                    "PetTracer %s left home, switching to mode %s", device.id, target
+                )
+                self.active[device.id] = Escalation(
+                    target,
+                    device.mode if device.mode is not None else MODE_NORMAL,
+                    now,
+                )
+                changes[device.id] = target
+
+        # Collars that disappeared from the account cannot be reverted
+        seen = {device.id for device in devices}
+        for device_id in self.active.keys() - seen:
+            del self.active[device_id]
+        self._expired &= seen
+
+        return changes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the active escalations for persistent storage."""
+        return {
+            str(device_id): {
+                "mode": escalation.mode,
+                "previous_mode": escalation.previous_mode,
+                "started": escalation.started.isoformat(),
+            }
+            for device_id, escalation in self.active.items()
+        }
+
+    def load(self, stored: Mapping[str, Any]) -> None:
+        """Restore escalations saved by a previous run."""
+        active: dict[int, Escalation] = {}
+        for device_id, item in stored.items():
+            started = dt_util.parse_datetime(item["started"])
+            if started is None:
+                continue
+            active[int(device_id)] = Escalation(
+                item["mode"], item["previous_mode"], started
+            )
+        # Nothing is restored from a partly unreadable store
+        self.active.update(active)
@@ -0,0 +1,187 @@
+"""Bounded history of recent position fixes per collar."""
+
+from __future__ import annotations
+
+from array import array
+from collections.abc import Iterator, Mapping
+from typing import Any
+
+from .const import (
+    CONF_HISTORY_DEPTH,
+    CONF_HISTORY_MEMORY,
+    DEFAULT_HISTORY_DEPTH,
+    DEFAULT_HISTORY_MEMORY,
+)
+from .models import CollarSnapshot
+from .utils import fix_timestamp
+
+# Time, latitude and longitude as doubles, accuracy as a 32-bit int
+FIX_BYTES = 3 * 8 + 4
+
+
+class FixHistory:
+    """A ring buffer of one collar's most recent fixes.
+
+    Fixes are stored column-wise in typed arrays allocated up front, so a fix
+    costs ``FIX_BYTES`` rather than a dict or tuple of boxed floats. Once the
+    buffer is full, each new fix overwrites the oldest one.
+    """
+
+    __slots__ = ("_count", "_start", "accs", "lats", "lons", "times")
+
+    def __init__(self, capacity: int) -> None:
+        """Initialize an empty buffer holding up to ``capacity`` fixes."""
+        self.times = array("d", bytes(8 * capacity))
+        self.lats = array("d", bytes(8 * capacity))
+        self.lons = array("d", bytes(8 * capacity))
+        # 0 stands for a fix without a reported accuracy
+        self.accs = array("i", bytes(4 * capacity))
+        self._start = 0
+        self._count = 0
+
+    def __len__(self) -> int:
+        """Return the number of fixes held."""
+        return self._count
+
+    def __iter__(self) -> Iterator[tuple[float, float, float, int | None]]:
+        """Yield (time, latitude, longitude, accuracy) fixes, oldest first."""
+        capacity = self.capacity
+        for offset in range(self._count):
+            index = (self._start + offset) % capacity
+            yield (
+                self.times[index],
+                self.lats[index],
+                self.lons[index],
+                self.accs[index] or None,
+            )
+
+    @property
+    def capacity(self) -> int:
+        """Return the number of fixes the buffer can hold."""
+        return len(self.times)
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory taken by the fix arrays."""
+        return self.capacity * FIX_BYTES
+
+    def append(self, time: float, lat: float, lon: float, acc: int | None) -> None:
+        """Add a fix, dropping the oldest one if the buffer is full."""
+        capacity = self.capacity
+        if not capacity:
+            return
+        index = (self._start + self._count) % capacity
+        self.times[index] = time
+        self.lats[index] = lat
+        self.lons[index] = lon
+        self.accs[index] = acc or 0
+        if self._count < capacity:
+            self._count += 1
+        else:
+            self._start = (self._start + 1) % capacity
+
+    def last(self) -> tuple[float, float, float, int | None] | None:
+        """Return the newest fix, if any."""
+        if not self._count:
+            return None
+        index = (self._start + self._count - 1) % self.capacity
+        return (
+            self.times[index],
+            self.lats[index],
+            self.lons[index],
+            self.accs[index] or None,
+        )
+
+    def resized(self, capacity: int) -> FixHistory:
+        """Return a buffer of another capacity with the newest fixes kept."""
+        history = FixHistory(capacity)
+        for fix in list(self)[max(self._count - capacity, 0) :]:
+            history.append(*fix)
+        return history
+
+    def as_dict(self) -> dict[str, list[float]]:
+        """Return the fixes, oldest first, for persistent storage."""
+        fixes = list(self)
+        return {
+            "time": [fix[0] for fix in fixes],
+            "lat": [fix[1] for fix in fixes],
+            "lon": [fix[2] for fix in fixes],
+            "acc": [fix[3] or 0 for fix in fixes],
+        }
+
+    @classmethod
+    def from_dict(cls, stored: Mapping[str, Any], capacity: int) -> FixHistory:
+        """Rebuild a buffer from stored fixes, keeping the newest that fit."""
+        history = cls(capacity)
+        fixes = list(
+            zip(
+                stored["time"], stored["lat"], stored["lon"], stored["acc"], strict=True
+            )
+        )
+        for fix in fixes[max(len(fixes) - capacity, 0) :]:
+            history.append(*fix)
+        return history
+
+
+class PositionHistory:
+    """Keep a bounded history of fixes for every collar.
+
+    Each collar gets the configured number of fixes, fewer if the collars
+    together would otherwise exceed the configured memory cap. A fix is
+    recorded once, when a poll returns a later ``timeMeasure`` than the
+    collar's newest fix.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the history."""
+        self.fixes: dict[int, FixHistory] = {}
+
+    @staticmethod
+    def capacity(collars: int, options: Mapping[str, Any]) -> int:
+        """Return the number of fixes to keep per collar."""
+        depth = options.get(CONF_HISTORY_DEPTH, DEFAULT_HISTORY_DEPTH)
+        memory = options.get(CONF_HISTORY_MEMORY, DEFAULT_HISTORY_MEMORY) * 1024
+        return min(depth, memory // (FIX_BYTES * max(collars, 1)))
+
+    @property
+    def nbytes(self) -> int:
+        """Return the memory taken by all collars' fix arrays."""
+        return sum(history.nbytes for history in self.fixes.values())
+
+    def record(self, devices: list[CollarSnapshot], options: Mapping[str, Any]) -> None:
+        """Add each collar's fix if it is newer than the last one recorded."""
+        capacity = self.capacity(len(devices), options)
+        fixes: dict[int, FixHistory] = {}
+        for device in devices:
+            history = self.fixes.get(device.id)
+            if history is None:
+                history = FixHistory(capacity)
+            elif history.capacity != capacity:
+                history = history.resized(capacity)
+            fixes[device.id] = history
+
+            position = device.lastPos
+            time = fix_timestamp(position.timeMeasure) if position else None
+            if time is None or position.posLat is None or position.posLong is None:
+                continue
+            last = history.last()
+            if last is None or time > last[0]:
+                history.append(time, position.posLat, position.posLong, position.acc)
+
+        # Collars no longer on the account are forgotten
+        self.fixes = fixes
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return every collar's fixes for persistent storage."""
+        return {
+            str(device_id): history.as_dict()
+            for device_id, history in self.fixes.items()
+        }
+
+    def load(self, stored: Mapping[str, Any], options: Mapping[str, Any]) -> None:
+        """Restore the fixes saved by a previous run."""
+        capacity = self.capacity(len(stored), options)
+        self.fixes = {
+            int(device_id): FixHistory.from_dict(item, capacity)
+            for device_id, item in stored.items()
+        }
@@ -0,0 +1,97 @@
+"""Compact snapshots of the collar data the integration uses."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any
+
+
+@dataclass(frozen=True, slots=True)
+class CollarDetails:
+    """The pet details of a collar."""
+
+    name: str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CollarPosition:
+    """A collar's last position fix."""
+
+    posLat: float | None = None
+    posLong: float | None = None
+    acc: int | None = None
+    sat: int | None = None
+    rssi: int | None = None
+    timeMeasure: datetime | str | None = None
+
+
+@dataclass(frozen=True, slots=True)
+class CollarMotion:
+    """Distance travelled and speed of a collar, from its recent fixes."""
+
+    distance_today: float = 0.0  # Meters since local midnight
+    distance_week: float = 0.0  # Meters since local midnight on Monday
+    speed: float = 0.0  # m/s over the last leg between fixes
+    max_speed_today: float = 0.0  # m/s
+
+
+@dataclass(frozen=True, slots=True)
+class CollarSnapshot:
+    """The fields of a collar that the integration reads, as of one poll.
+
+    The client's ``Device`` carries dozens of fields, nested hub and FIFO
+    records the integration never looks at. Each poll copies just the fields
+    below into a slotted, immutable snapshot and lets the client objects go,
+    so memory does not grow with the API payload. Field names follow the
+    client so the snapshot can be used wherever a ``Device`` was.
+    """
+
+    id: int
+    bat: int | None = None
+    chg: int | None = None
+    home: bool | None = None
+    mode: int | None = None
+    modeSet: int | None = None
+    status: int | None = None
+    sw: int | str | None = None
+    lastContact: datetime | None = None
+    details: CollarDetails | None = None
+    lastPos: CollarPosition | None = None
+    # Not from the client: the Kalman-smoothed position, see smoothing.py.
+    # Derived from the fields above, so it takes no part in comparisons.
+    smoothed: CollarPosition | None = field(default=None, compare=False)
+    # Not from the client either: travel since midnight, see odometer.py
+    motion: CollarMotion | None = field(default=None, compare=False)
+
+    @classmethod
+    def from_device(cls, device: Any) -> CollarSnapshot:
+        """Copy the used fields of a client ``Device``."""
+        details = device.details
+        position = device.lastPos
+        return cls(
+            id=device.id,
+            bat=device.bat,
+            chg=device.chg,
+            home=device.home,
+            mode=device.mode,
+            modeSet=getattr(device, "modeSet", None),
+            status=device.status,
+            sw=device.sw,
+            lastContact=device.lastContact,
+            details=CollarDetails(details.name) if details else None,
+            lastPos=CollarPosition(
+                position.posLat,
+                position.posLong,
+                position.acc,
+                position.sat,
+                position.rssi,
+                position.timeMeasure,
+            )
+            if position
+            else None,
+        )
+
+    def identity(self) -> CollarSnapshot:
+        """Return a snapshot of just the fields that describe the collar."""
+        return CollarSnapshot(id=self.id, sw=self.sw, details=self.details)
@@ -0,0 +1,152 @@
+"""Batched, optimistic collar mode changes for PetTracer."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TYPE_CHECKING, Any
+
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant
+from homeassistant.helpers.event import async_call_later
+
+from .const import MODE_BATCH_DELAY_SECONDS, MODE_CONFIRM_TIMEOUT_SECONDS
+
+if TYPE_CHECKING:
+    from . import PetTracerDataUpdateCoordinator
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingMode:
+    """A mode change that the collar has not confirmed yet."""
+
+    mode: int
+    requested: float
+    sent: bool = False
+
+
+class ModeChangeQueue:
+    """Send collar mode changes in batches and track them until confirmed.
+
+    Changes requested within ``MODE_BATCH_DELAY_SECONDS`` of each other are
+    sent together, with only the last request per collar reaching the API,
+    followed by a single refresh. Until a poll shows the collar running the
+    new mode, the requested mode is reported so the UI responds immediately.
+    """
+
+    def __init__(
+        self, hass: HomeAssistant, coordinator: PetTracerDataUpdateCoordinator
+    ) -> None:
+        """Initialize the queue."""
+        self.hass = hass
+        self.coordinator = coordinator
+        self.pending: dict[int, PendingMode] = {}
+        self._batch: asyncio.Future[dict[int, Exception]] | None = None
+        self._unsub_flush: CALLBACK_TYPE | None = None
+
+    def requested_mode(self, device_id: int) -> int | None:
+        """Return the mode requested for a collar but not yet confirmed."""
+        pending = self.pending.get(device_id)
+        return pending.mode if pending else None
+
+    def request(
+        self, device_id: int, mode: int
+    ) -> asyncio.Future[dict[int, Exception]]:
+        """Queue a mode change and return the batch it will be sent with.
+
+        The batch resolves to the errors of the collars whose change failed.
+        """
+        self.pending[device_id] = PendingMode(mode, time.monotonic())
+        if self._batch is None:
+            self._batch = self.hass.loop.create_future()
+            self._unsub_flush = async_call_later(
+                self.hass, MODE_BATCH_DELAY_SECONDS, self._async_flush
+            )
+        return self._batch
+
+    async def _async_flush(self, _now: datetime) -> None:
+        """Send every queued mode change, then refresh once."""
+        batch, self._batch = self._batch, None
+        self._unsub_flush = None
+        changes = {
+            device_id: pending
+            for device_id, pending in self.pending.items()
+            if not pending.sent
+        }
+        results = await asyncio.gather(
+            *(
+                self._async_send(device_id, pending.mode)
+                for device_id, pending in changes.items()
+            ),
+            return_exceptions=True,
+        )
+
+        errors: dict[int, Exception] = {}
+        for (device_id, pending), result in zip(changes.items(), results):
+            if isinstance(result, Exception):
+                _LOGGER.warning(
+                    "Failed to set PetTracer %s to mode %s: %s",
+                    device_id,
+                    pending.mode,
+                    result,
+                )
+                errors[device_id] = result
+                if self.pending.get(device_id) is pending:
+                    del self.pending[device_id]
+            else:
+                pending.sent = True
+        if batch is not None and not batch.done():
+            batch.set_result(errors)
+
+        await self.coordinator.async_request_refresh()
+
+    async def _async_send(self, device_id: int, mode: int) -> None:
+        """Send one mode change to the API."""
+        _LOGGER.debug("Setting PetTracer %s to mode %s", device_id, mode)
+        client = self.coordinator.client
+        await client.get_device(device_id).set_tracking_mode(mode)
+
+    def reconcile(self, devices: list[Any]) -> set[int]:
+        """Settle sent changes against a poll and return the collars settled.
+
+        A change is confirmed once the collar reports the new mode. While the
+        server still lists it as the collar's requested mode (``modeSet``) it
+        stays pending, up to ``MODE_CONFIRM_TIMEOUT_SECONDS``; otherwise the
+        optimistic mode is dropped and the reported mode shown again.
+        """
+        now = time.monotonic()
+        settled = set()
+        for device in devices:
+            pending = self.pending.get(device.id)
+            if pending is None or not pending.sent:
+                continue
+            if device.mode == pending.mode:
+                _LOGGER.debug("PetTracer %s confirmed mode %s", device.id, device.mode)
+            elif (
+                getattr(device, "modeSet", None) == pending.mode
+                and now - pending.requested < MODE_CONFIRM_TIMEOUT_SECONDS
+            ):
+                continue
+            else:
+                _LOGGER.warning(
+                    "PetTracer %s did not switch to mode %s, still in mode %s",
+                    device.id,
+                    pending.mode,
+                    device.mode,
+                )
+            del self.pending[device.id]
+            settled.add(device.id)
+        return settled
+
+    def cancel(self) -> None:
+        """Stop a batch that has not been sent yet."""
+        if self._unsub_flush is not None:
+            self._unsub_flush()
+            self._unsub_flush = None
+        if self._batch is not None and not self._batch.done():
+            self._batch.cancel()
+        self._batch = None
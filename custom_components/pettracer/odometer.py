@@ -0,0 +1,178 @@
+"""Distance travelled and speed of each collar, updated fix by fix."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from dataclasses import dataclass, replace
+from datetime import datetime
+from typing import Any
+
+from homeassistant.util import dt as dt_util
+
+from .const import ODOMETER_MAX_SPEED
+from .models import CollarMotion, CollarSnapshot
+from .utils import fix_timestamp, haversine_distance
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@dataclass
+class Trip:
+    """A collar's running totals and the last fix they were counted to."""
+
+    time: float
+    lat: float
+    lon: float
+    day: str
+    week: str
+    distance_today: float = 0.0
+    distance_week: float = 0.0
+    speed: float = 0.0
+    max_speed_today: float = 0.0
+    # A fix too far from the last one, kept to tell a GPS jump from a car ride
+    jump: tuple[float, float, float] | None = None
+
+    def roll_over(self, day: str, week: str) -> None:
+        """Start new daily and weekly totals once their period has passed."""
+        if self.week != week:
+            self.week, self.distance_week = week, 0.0
+        if self.day != day:
+            self.day, self.distance_today, self.max_speed_today = day, 0.0, 0.0
+
+    def motion(self) -> CollarMotion:
+        """Return the totals as attached to the collar snapshot."""
+        return CollarMotion(
+            self.distance_today,
+            self.distance_week,
+            self.speed,
+            self.max_speed_today,
+        )
+
+
+def _periods(now: datetime) -> tuple[str, str]:
+    """Return the local day and ISO week that ``now`` falls in."""
+    today = dt_util.as_local(now).date()
+    year, week, _ = today.isocalendar()
+    return today.isoformat(), f"{year}-W{week:02d}"
+
+
+class Odometer:
+    """Add up each collar's distance travelled and track its speed.
+
+    Every new fix, recognized by a later ``timeMeasure``, adds the haversine
+    distance from the previous fix, so the cost per poll does not depend on
+    how far back the totals go. Daily totals and the top speed reset at local
+    midnight, weekly totals at midnight on Monday.
+
+    A leg faster than ``ODOMETER_MAX_SPEED`` is a GPS jump and is not
+    counted. If the next fix is plausible from the jump rather than from the
+    last counted fix, the pet really was moved, by car say; counting carries
+    on from the jump without the leg that got it there.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the odometer."""
+        self.trips: dict[int, Trip] = {}
+
+    def apply(
+        self, devices: list[CollarSnapshot], now: datetime
+    ) -> list[CollarSnapshot]:
+        """Return the collars with their distance and speed attached."""
+        day, week = _periods(now)
+        trips: dict[int, Trip] = {}
+        measured: list[CollarSnapshot] = []
+        for device in devices:
+            trip = self.trips.get(device.id)
+            position = device.lastPos
+            time = fix_timestamp(position.timeMeasure) if position else None
+            has_fix = (
+                time is not None
+                and position.posLat is not None
+                and position.posLong is not None
+            )
+            if trip is None:
+                if not has_fix:
+                    measured.append(device)
+                    continue
+                trip = Trip(time, position.posLat, position.posLong, day, week)
+            else:
+                trip.roll_over(day, week)
+                if has_fix and time > trip.time:
+                    self._advance(
+                        device.id, trip, time, position.posLat, position.posLong
+                    )
+            trips[device.id] = trip
+            measured.append(replace(device, motion=trip.motion()))
+
+        # Collars no longer on the account are forgotten
+        self.trips = trips
+        return measured
+
+    def current(
+        self, devices: list[CollarSnapshot], now: datetime
+    ) -> list[CollarSnapshot]:
+        """Return the collars with their totals for the day of ``now`` attached.
+
+        Unlike ``apply``, no fix is counted, so this serves restored data and
+        the reset at midnight while polls may be failing.
+        """
+        day, week = _periods(now)
+        current: list[CollarSnapshot] = []
+        for device in devices:
+            trip = self.trips.get(device.id)
+            if trip is None:
+                current.append(device)
+                continue
+            trip.roll_over(day, week)
+            current.append(replace(device, motion=trip.motion()))
+        return current
+
+    @staticmethod
+    def _advance(
+        device_id: int, trip: Trip, time: float, lat: float, lon: float
+    ) -> None:
+        """Count the leg from the trip's last fix to a new one."""
+        distance = haversine_distance(trip.lat, trip.lon, lat, lon)
+        speed = distance / (time - trip.time)
+        if speed > ODOMETER_MAX_SPEED:
+            jump, trip.jump = trip.jump, (time, lat, lon)
+            # Plausible from an earlier jump: the pet was moved there
+            if jump is not None and time > jump[0]:
+                distance = haversine_distance(jump[1], jump[2], lat, lon)
+                speed = distance / (time - jump[0])
+            if speed > ODOMETER_MAX_SPEED:
+                _LOGGER.debug(
+                    "Not counting PetTracer %s jump to %s, %s", device_id, lat, lon
+                )
+                return
+
+        trip.jump = None
+        trip.time, trip.lat, trip.lon = time, lat, lon
+        trip.distance_today += distance
+        trip.distance_week += distance
+        trip.speed = speed
+        trip.max_speed_today = max(trip.max_speed_today, speed)
+
+    def as_dict(self) -> dict[str, Any]:
+        """Return the running totals for persistent storage."""
+        return {
+            str(device_id): {
+                "time": trip.time,
+                "lat": trip.lat,
+                "lon": trip.lon,
+                "day": trip.day,
+                "week": trip.week,
+                "distance_today": trip.distance_today,
+                "distance_week": trip.distance_week,
+                "speed": trip.speed,
+                "max_speed_today": trip.max_speed_today,
+            }
+            for device_id, trip in self.trips.items()
+        }
+
+    def load(self, stored: Mapping[str, Any]) -> None:
+        """Restore the running totals saved by a previous run."""
+        self.trips = {
+            int(device_id): Trip(**item) for device_id, item in stored.items()
+        }
@@ -0,0 +1,141 @@
+"""Filter GPS jitter and implausible fixes out of collar positions."""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Mapping
+from dataclasses import replace
+from typing import Any
+
+from .const import (
+    CONF_JITTER_FLOOR,
+    CONF_MAX_ACCURACY,
+    CONF_MIN_SATELLITES,
+    DEFAULT_JITTER_FLOOR,
+    DEFAULT_MAX_ACCURACY,
+    DEFAULT_MIN_SATELLITES,
+)
+from .models import CollarPosition, CollarSnapshot
+from .utils import haversine_distance
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def _has_coordinates(position: CollarPosition | None) -> bool:
+    """Return True if a position has both coordinates."""
+    return (
+        position is not None
+        and position.posLat is not None
+        and position.posLong is not None
+    )
+
+
+class PositionFilter:
+    """Hold a collar's coordinates until the pet has really moved.
+
+    A fix closer to the last accepted position than its own reported
+    accuracy, or the configured floor if that is larger, is treated as GPS
+    jitter around a stationary pet. A fix less accurate than the configured
+    limit, or from fewer satellites than the configured minimum, is rejected.
+    Either way the collar keeps the accepted coordinates and accuracy, while
+    the fix's time, satellites and signal strength are still taken so a new
+    fix is reported as such. A collar's first fix is always accepted.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the filter."""
+        self.accepted: dict[int, CollarPosition] = {}
+        # Last fix reported per collar, so a repeated fix is only counted once
+        self._reported: dict[int, CollarPosition] = {}
+        self.stats = {"accepted": 0, "suppressed": 0, "rejected": 0}
+
+    def seed(self, devices: list[CollarSnapshot]) -> None:
+        """Start from the positions of restored collars."""
+        self.accepted = {
+            device.id: device.lastPos
+            for device in devices
+            if _has_coordinates(device.lastPos)
+        }
+
+    def apply(
+        self, devices: list[CollarSnapshot], options: Mapping[str, Any]
+    ) -> list[CollarSnapshot]:
+        """Return the collars with jittery or implausible fixes held back."""
+        floor = options.get(CONF_JITTER_FLOOR, DEFAULT_JITTER_FLOOR)
+        max_accuracy = options.get(CONF_MAX_ACCURACY, DEFAULT_MAX_ACCURACY)
+        min_satellites = options.get(CONF_MIN_SATELLITES, DEFAULT_MIN_SATELLITES)
+
+        accepted: dict[int, CollarPosition] = {}
+        reported: dict[int, CollarPosition] = {}
+        filtered: list[CollarSnapshot] = []
+        for device in devices:
+            position = device.lastPos
+            previous = self.accepted.get(device.id)
+            new_fix = position != self._reported.get(device.id)
+            if position is not None:
+                reported[device.id] = position
+            if not _has_coordinates(position):
+                if previous is not None:
+                    accepted[device.id] = previous
+                filtered.append(device)
+                continue
+            if previous is None:
+                accepted[device.id] = position
+                self.stats["accepted"] += 1
+                filtered.append(device)
+                continue
+            if (position.posLat, position.posLong) == (
+                previous.posLat,
+                previous.posLong,
+            ):
+                # The same fix again, or a collar that has not moved at all
+                accepted[device.id] = position
+                filtered.append(device)
+                continue
+
+            if (
+                max_accuracy
+                and position.acc is not None
+                and position.acc > max_accuracy
+            ) or (
+                min_satellites
+                and position.sat is not None
+                and position.sat < min_satellites
+            ):
+                if new_fix:
+                    _LOGGER.debug(
+                        "Rejecting PetTracer %s fix with accuracy %s m from %s "
+                        "satellites",
+                        device.id,
+                        position.acc,
+                        position.sat,
+                    )
+                    self.stats["rejected"] += 1
+            elif haversine_distance(
+                previous.posLat, previous.posLong, position.posLat, position.posLong
+            ) < max(position.acc or 0, floor):
+                if new_fix:
+                    self.stats["suppressed"] += 1
+            else:
+                accepted[device.id] = position
+                self.stats["accepted"] += 1
+                filtered.append(device)
+                continue
+
+            accepted[device.id] = previous
+            filtered.append(
+                replace(
+                    device,
+                    lastPos=replace(
+                        position,
+                        posLat=previous.posLat,
+                        posLong=previous.posLong,
+                        acc=previous.acc,
+                    ),
+                )
+            )
+
+        # Collars no longer on the account are forgotten
+        self.accepted = accepted
+        self._reported = reported
+        return filtered
@@ -0,0 +1,79 @@
+"""Support for PetTracer selects."""
+
+from __future__ import annotations
+
+from typing import Any
+
+from homeassistant.components.select import SelectEntity
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+
+from .const import DOMAIN, MODE_NAMES, SETTABLE_MODES
+from .entity import PetTracerEntity
+from .utils import async_add_device_entities
+
+MODE_OPTIONS = {MODE_NAMES[mode]: mode for mode in SETTABLE_MODES}
+
+
+async def async_setup_entry(
+    hass: HomeAssistant,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+) -> None:
+    """Set up PetTracer selects based on a config entry."""
+    coordinator = hass.data[DOMAIN][config_entry.entry_id]
+
+    async_add_device_entities(
+        coordinator,
+        config_entry,
+        async_add_entities,
+        lambda device: (PetTracerModeSelect(coordinator, device),),
+    )
+
+
+class PetTracerModeSelect(PetTracerEntity, SelectEntity):
+    """Select a collar's tracking mode."""
+
+    _attr_icon = "mdi:map-marker-radius"
+
+    def __init__(self, coordinator, device):
+        """Initialize the select."""
+        super().__init__(coordinator, device, ("mode",))
+        self._attr_unique_id = f"pettracer_{device.id}_mode_select"
+        self._attr_name = "Tracking Mode"
+        self._attr_suggested_object_id = f"pettracer_{device.id}_tracking_mode"
+        self._attr_options = list(MODE_OPTIONS)
+
+    @property
+    def current_option(self) -> str | None:
+        """Return the requested mode until confirmed, then the reported one."""
+        mode = self.coordinator.mode_changes.requested_mode(self._device_id)
+        if mode is None:
+            device = self._get_device_data()
+            mode = device.mode if device else None
+        name = MODE_NAMES.get(mode)
+        return name if name in MODE_OPTIONS else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return whether a mode change is waiting for the collar."""
+        return {
+            "pending": self.coordinator.mode_changes.requested_mode(self._device_id)
+            is not None
+        }
+
+    async def async_select_option(self, option: str) -> None:
+        """Change the collar's tracking mode."""
+        batch = self.coordinator.mode_changes.request(
+            self._device_id, MODE_OPTIONS[option]
+        )
+        # Show the new mode straight away; the next poll confirms it
+        self.async_write_ha_state()
+        errors = await batch
+        if self._device_id in errors:
+            self.async_write_ha_state()
+            raise HomeAssistantError(
+                f"Failed to set PetTracer mode to {option}: {errors[self._device_id]}"
+            ) from errors[self._device_id]
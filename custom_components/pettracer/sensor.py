@@ -9,6 +9,7 @@ from datetime import datetime
 from typing import Any
 
 from homeassistant.components.sensor import (
+    RestoreSensor,
     SensorDeviceClass,
     SensorEntity,
     SensorEntityDescription,
@@ -21,18 +22,30 @@ from homeassistant.const import (
     EntityCategory,
     UnitOfElectricPotential,
     UnitOfLength,
+    UnitOfSpeed,
+    UnitOfTime,
 )
 from homeassistant.core import HomeAssistant
+from homeassistant.helpers.device_registry import DeviceEntryType
 from homeassistant.helpers.entity_platform import AddEntitiesCallback
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util.dt import parse_datetime
 
 from .const import (
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
     DOMAIN,
     MODE_NAMES,
     VALID_MODES,
 )
-from .utils import battery_mv_to_percentage
+from .entity import PetTracerEntity
+from .utils import (
+    async_add_device_entities,
+    battery_mv_to_percentage,
+    get_device,
+    get_device_record,
+)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,6 +57,8 @@ class PetTracerSensorEntityDescription(SensorEntityDescription):
     value_fn: Callable[[Any], Any]
     extra_attrs_fn: Callable[[Any], dict[str, Any]] | None = None
     display_name: str = ""
+    # Device fields the value depends on; state is only written when they change
+    fields: tuple[str, ...] = ()
 
 
 def _get_battery_level(device: Any) -> int | None:
@@ -144,6 +159,17 @@ def _get_mode_attrs(device: Any) -> dict[str, Any]:
     return {}
 
 
+def _get_motion(attribute: str, digits: int) -> Callable[[Any], float | None]:
+    """Return a getter for a rounded distance or speed of the collar."""
+
+    def _get(device: Any) -> float | None:
+        if device and device.motion:
+            return round(getattr(device.motion, attribute), digits)
+        return None
+
+    return _get
+
+
 SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
     PetTracerSensorEntityDescription(
         key="battery_level",
@@ -152,6 +178,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         native_unit_of_measurement=PERCENTAGE,
         state_class=SensorStateClass.MEASUREMENT,
         value_fn=_get_battery_level,
+        fields=("bat",),
     ),
     PetTracerSensorEntityDescription(
         key="battery_voltage",
@@ -162,6 +189,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         entity_category=EntityCategory.DIAGNOSTIC,
         value_fn=_get_battery_voltage,
+        fields=("bat",),
     ),
     PetTracerSensorEntityDescription(
         key="latitude",
@@ -170,6 +198,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:crosshairs-gps",
         value_fn=_get_latitude,
+        fields=("posLat",),
     ),
     PetTracerSensorEntityDescription(
         key="longitude",
@@ -178,6 +207,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         state_class=SensorStateClass.MEASUREMENT,
         icon="mdi:crosshairs-gps",
         value_fn=_get_longitude,
+        fields=("posLong",),
     ),
     PetTracerSensorEntityDescription(
         key="gps_accuracy",
@@ -189,6 +219,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:map-marker-radius",
         value_fn=_get_gps_accuracy,
+        fields=("acc",),
     ),
     PetTracerSensorEntityDescription(
         key="last_contact",
@@ -197,6 +228,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         icon="mdi:clock-outline",
         value_fn=_get_last_contact,
+        fields=("lastContact",),
     ),
     PetTracerSensorEntityDescription(
         key="satellites",
@@ -206,6 +238,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:satellite-variant",
         value_fn=_get_satellites,
+        fields=("sat",),
     ),
     PetTracerSensorEntityDescription(
         key="signal_strength",
@@ -217,6 +250,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         entity_category=EntityCategory.DIAGNOSTIC,
         icon="mdi:signal",
         value_fn=_get_signal_strength,
+        fields=("rssi",),
     ),
     PetTracerSensorEntityDescription(
         key="position_time",
@@ -225,6 +259,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         device_class=SensorDeviceClass.TIMESTAMP,
         icon="mdi:map-clock",
         value_fn=_get_position_time,
+        fields=("timeMeasure",),
     ),
     PetTracerSensorEntityDescription(
         key="status",
@@ -233,6 +268,7 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         icon="mdi:information-outline",
         entity_category=EntityCategory.DIAGNOSTIC,
         value_fn=_get_status,
+        fields=("status",),
     ),
     PetTracerSensorEntityDescription(
         key="mode",
@@ -240,11 +276,94 @@ SENSOR_DESCRIPTIONS: tuple[PetTracerSensorEntityDescription, ...] = (
         translation_key="mode",
         icon="mdi:cog-outline",
         value_fn=_get_mode,
+        fields=("mode",),
         extra_attrs_fn=_get_mode_attrs,
     ),
+    PetTracerSensorEntityDescription(
+        key="distance_today",
+        display_name="Distance Today",
+        translation_key="distance_today",
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.METERS,
+        suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:map-marker-distance",
+        value_fn=_get_motion("distance_today", 1),
+        fields=("motion",),
+    ),
+    PetTracerSensorEntityDescription(
+        key="distance_week",
+        display_name="Distance This Week",
+        translation_key="distance_week",
+        device_class=SensorDeviceClass.DISTANCE,
+        native_unit_of_measurement=UnitOfLength.METERS,
+        suggested_unit_of_measurement=UnitOfLength.KILOMETERS,
+        suggested_display_precision=2,
+        state_class=SensorStateClass.TOTAL_INCREASING,
+        icon="mdi:map-marker-distance",
+        value_fn=_get_motion("distance_week", 1),
+        fields=("motion",),
+    ),
+    PetTracerSensorEntityDescription(
+        key="speed",
+        display_name="Speed",
+        translation_key="speed",
+        device_class=SensorDeviceClass.SPEED,
+        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+        suggested_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
+        suggested_display_precision=1,
+        state_class=SensorStateClass.MEASUREMENT,
+        icon="mdi:speedometer",
+        value_fn=_get_motion("speed", 2),
+        fields=("motion",),
+    ),
+    PetTracerSensorEntityDescription(
+        key="max_speed_today",
+        display_name="Top Speed Today",
+        translation_key="max_speed_today",
+        device_class=SensorDeviceClass.SPEED,
+        native_unit_of_measurement=UnitOfSpeed.METERS_PER_SECOND,
+        suggested_unit_of_measurement=UnitOfSpeed.KILOMETERS_PER_HOUR,
+        suggested_display_precision=1,
+        icon="mdi:speedometer",
+        value_fn=_get_motion("max_speed_today", 2),
+        fields=("motion",),
+    ),
 )
 
 
+# Where each description's value sits in a collar's per-poll record
+_RECORD_INDEX = {
+    description.key: index for index, description in enumerate(SENSOR_DESCRIPTIONS)
+}
+
+
+def get_sensor_values(
+    data: dict[str, Any], device: Any
+) -> tuple[tuple[Any, dict[str, Any] | None], ...]:
+    """Return a collar's ``(value, attributes)`` for every sensor description.
+
+    The record is built on first use and kept in the coordinator data, so the
+    sensors of a collar share a single evaluation of ``SENSOR_DESCRIPTIONS``
+    until the collar changes, however often they are read.
+    """
+    return get_device_record(data, "sensor_values", device, _evaluate_descriptions)
+
+
+def _evaluate_descriptions(
+    device: Any,
+) -> tuple[tuple[Any, dict[str, Any] | None], ...]:
+    """Evaluate every sensor description for a collar."""
+    return tuple(
+        (
+            description.value_fn(device),
+            description.extra_attrs_fn(device) if description.extra_attrs_fn else None,
+        )
+        for description in SENSOR_DESCRIPTIONS
+    )
+
+
 async def async_setup_entry(
     hass: HomeAssistant,
     config_entry: ConfigEntry,
@@ -253,65 +372,167 @@ async def async_setup_entry(
     """Set up PetTracer sensors based on a config entry."""
     coordinator = hass.data[DOMAIN][config_entry.entry_id]
 
-    entities: list[PetTracerSensor] = []
-    for device in coordinator.data.get("devices", []):
-        entities.extend(
+    def _create_entities(device) -> list[SensorEntity]:
+        entities: list[SensorEntity] = [
             PetTracerSensor(coordinator, device, description)
             for description in SENSOR_DESCRIPTIONS
-        )
+        ]
+        entities.append(PetTracerStalenessSensor(coordinator, device))
+        return entities
 
-    async_add_entities(entities, True)
+    async_add_device_entities(
+        coordinator, config_entry, async_add_entities, _create_entities
+    )
+    async_add_entities([PetTracerApiStatusSensor(coordinator, config_entry)])
 
 
-class PetTracerSensor(CoordinatorEntity, SensorEntity):
+class PetTracerSensor(PetTracerEntity, RestoreSensor):
     """Representation of a PetTracer sensor."""
 
     entity_description: PetTracerSensorEntityDescription
-    _attr_has_entity_name = True
 
-    def __init__(self, coordinator, device, description: PetTracerSensorEntityDescription):
+    def __init__(
+        self, coordinator, device, description: PetTracerSensorEntityDescription
+    ):
         """Initialize the sensor."""
-        super().__init__(coordinator)
+        super().__init__(coordinator, device, description.fields)
         self.entity_description = description
-        self._device = device
-        self._device_id = device.id
         self._attr_unique_id = f"pettracer_{device.id}_{description.key}"
         self._attr_name = description.display_name
         self._attr_suggested_object_id = f"pettracer_{device.id}_{description.key}"
+        self._record_index = _RECORD_INDEX[description.key]
+        self._restored_value: Any = None
+
+    async def async_added_to_hass(self) -> None:
+        """Restore the last value if the collar has no data yet."""
+        await super().async_added_to_hass()
+        if self._get_device_data() is None and (
+            data := await self.async_get_last_sensor_data()
+        ):
+            self._restored_value = data.native_value
+
+    def _get_value(self) -> tuple[Any, dict[str, Any] | None] | None:
+        """Return this sensor's value and attributes from the poll's record."""
+        data = self.coordinator.data
+        if not data:
+            return None
+        record = data["sensor_values"].get(self._device_id)
+        if record is None:
+            device = get_device(data, self._device_id)
+            if device is None:
+                return None
+            record = get_sensor_values(data, device)
+        return record[self._record_index]
+
+    @property
+    def native_value(self):
+        """Return the state of the sensor."""
+        value = self._get_value()
+        if value is None:
+            return self._restored_value
+        return value[0]
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return additional attributes."""
+        attributes: dict[str, Any] = {}
+        if self.entity_description.extra_attrs_fn and (value := self._get_value()):
+            attributes.update(value[1])
+        # Flags values carried over from before a restart until a live poll
+        if self.coordinator.last_success_time is None:
+            attributes["restored"] = True
+        return attributes
+
+
+class PetTracerStalenessSensor(PetTracerEntity, SensorEntity):
+    """How old a collar's upload was when the integration first fetched it."""
+
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.SECONDS
+    _attr_state_class = SensorStateClass.MEASUREMENT
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:timer-sand"
+    _attr_translation_key = "staleness"
+
+    def __init__(self, coordinator, device):
+        """Initialize the sensor."""
+        super().__init__(coordinator, device, ("lastContact",))
+        self._attr_unique_id = f"pettracer_{device.id}_staleness"
+        self._attr_name = "Data Staleness"
+        self._attr_suggested_object_id = f"pettracer_{device.id}_staleness"
+
+    @property
+    def native_value(self) -> float | None:
+        """Return the age of the latest upload when it was fetched."""
+        staleness = self.coordinator.scheduler.staleness.get(self._device_id)
+        return round(staleness, 1) if staleness is not None else None
+
+    @property
+    def extra_state_attributes(self) -> dict[str, Any]:
+        """Return the smoothed staleness and learned reporting period."""
+        scheduler = self.coordinator.scheduler
+        attributes: dict[str, Any] = {}
+        mean = scheduler.mean_staleness.get(self._device_id)
+        if mean is not None:
+            attributes["mean_staleness"] = round(mean, 1)
+        device = self._get_device_data()
+        if device:
+            attributes["reporting_period"] = round(scheduler.collar_interval(device), 1)
+        return attributes
+
+
+class PetTracerApiStatusSensor(CoordinatorEntity, SensorEntity):
+    """State of the circuit breaker guarding the PetTracer cloud API."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.ENUM
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_icon = "mdi:cloud-check-outline"
+    _attr_translation_key = "api_status"
+
+    def __init__(self, coordinator, config_entry: ConfigEntry):
+        """Initialize the sensor."""
+        # No context: the breaker changes on every poll, not with collar fields
+        super().__init__(coordinator)
+        self._entry_id = config_entry.entry_id
+        self._entry_title = config_entry.title
+        self._attr_unique_id = f"pettracer_{config_entry.entry_id}_api_status"
+        self._attr_name = "API Status"
+        self._attr_options = [BREAKER_CLOSED, BREAKER_HALF_OPEN, BREAKER_OPEN]
+
+    @property
+    def available(self) -> bool:
+        """Return True; the breaker state is most useful during outages."""
+        return True
 
     @property
     def device_info(self) -> dict[str, Any]:
-        """Return device information about this sensor."""
-        device = self._get_device_data() or self._device
-        device_name = (
-            device.details.name if device.details else f"PetTracer {self._device_id}"
-        )
+        """Return information about the PetTracer account."""
         return {
-            "identifiers": {(DOMAIN, self._device_id)},
-            "name": device_name,
+            "identifiers": {(DOMAIN, self._entry_id)},
+            "name": self._entry_title,
             "manufacturer": "PetTracer",
-            "model": "GPS Collar",
-            "sw_version": device.sw if device.sw else None,
+            "model": "Cloud Account",
+            "entry_type": DeviceEntryType.SERVICE,
         }
 
-    def _get_device_data(self):
-        """Get updated device data from coordinator."""
-        for device in self.coordinator.data.get("devices", []):
-            if device.id == self._device_id:
-                return device
-        return None
-
     @property
-    def native_value(self):
-        """Return the state of the sensor."""
-        device = self._get_device_data()
-        return self.entity_description.value_fn(device)
+    def native_value(self) -> str:
+        """Return the circuit breaker state."""
+        return self.coordinator.breaker.state
 
     @property
     def extra_state_attributes(self) -> dict[str, Any]:
-        """Return additional attributes."""
-        if self.entity_description.extra_attrs_fn:
-            device = self._get_device_data()
-            return self.entity_description.extra_attrs_fn(device)
-        return {}
-
+        """Return the failure count, next retry and whether data is stale."""
+        breaker = self.coordinator.breaker
+        data = self.coordinator.data or {}
+        return {
+            "consecutive_failures": breaker.failures,
+            "retry_at": breaker.retry_at.isoformat() if breaker.retry_at else None,
+            "stale": data.get("stale", False),
+            "last_success": (
+                self.coordinator.last_success_time.isoformat()
+                if self.coordinator.last_success_time
+                else None
+            ),
+        }
@@ -0,0 +1,156 @@
+"""Kalman-smoothed collar positions."""
+
+from __future__ import annotations
+
+import math
+from dataclasses import replace
+
+from .const import (
+    SMOOTHING_DEFAULT_ACCURACY,
+    SMOOTHING_INITIAL_SPEED,
+    SMOOTHING_MIN_ACCURACY,
+    SMOOTHING_PROCESS_NOISE,
+    SMOOTHING_RESET_SECONDS,
+)
+from .models import CollarPosition, CollarSnapshot
+from .utils import EARTH_RADIUS_METERS, fix_timestamp
+
+METERS_PER_DEGREE = EARTH_RADIUS_METERS * math.pi / 180
+
+
+class KalmanTrack:
+    """A constant-velocity Kalman filter over one collar's fixes.
+
+    Positions are tracked in meters north and east of the track's first fix,
+    each axis with its own position and velocity. Both axes see the same
+    fix times and accuracies, so they share one 2x2 covariance and every
+    update is a fixed handful of float operations.
+    """
+
+    __slots__ = (
+        "_east_per_degree",
+        "_lat0",
+        "_lon0",
+        "east",
+        "north",
+        "p_cross",
+        "p_pos",
+        "p_vel",
+        "time",
+        "v_east",
+        "v_north",
+    )
+
+    def __init__(self, lat: float, lon: float, accuracy: float, time: float) -> None:
+        """Start a track at a fix."""
+        self._lat0 = lat
+        self._lon0 = lon
+        self._east_per_degree = METERS_PER_DEGREE * math.cos(math.radians(lat))
+        self.time = time
+        self.north = self.east = 0.0
+        self.v_north = self.v_east = 0.0
+        self.p_pos = accuracy * accuracy
+        self.p_cross = 0.0
+        self.p_vel = SMOOTHING_INITIAL_SPEED * SMOOTHING_INITIAL_SPEED
+
+    def update(self, lat: float, lon: float, accuracy: float, time: float) -> None:
+        """Predict the track forward to a fix's time and correct it by the fix."""
+        dt = time - self.time
+        self.time = time
+
+        # Predict: move by the velocity, growing the uncertainty
+        q = SMOOTHING_PROCESS_NOISE
+        p_pos = (
+            self.p_pos
+            + 2 * dt * self.p_cross
+            + dt * dt * self.p_vel
+            + q * dt * dt * dt / 3
+        )
+        p_cross = self.p_cross + dt * self.p_vel + q * dt * dt / 2
+        p_vel = self.p_vel + q * dt
+        north = self.north + dt * self.v_north
+        east = self.east + dt * self.v_east
+
+        # Correct: blend in the fix by the Kalman gain
+        innovation = p_pos + accuracy * accuracy
+        gain_pos = p_pos / innovation
+        gain_vel = p_cross / innovation
+        residual_north = (lat - self._lat0) * METERS_PER_DEGREE - north
+        residual_east = (lon - self._lon0) * self._east_per_degree - east
+        self.north = north + gain_pos * residual_north
+        self.east = east + gain_pos * residual_east
+        self.v_north += gain_vel * residual_north
+        self.v_east += gain_vel * residual_east
+        self.p_pos = (1 - gain_pos) * p_pos
+        self.p_cross = (1 - gain_pos) * p_cross
+        self.p_vel = p_vel - gain_vel * p_cross
+
+    @property
+    def latitude(self) -> float:
+        """Return the smoothed latitude."""
+        return self._lat0 + self.north / METERS_PER_DEGREE
+
+    @property
+    def longitude(self) -> float:
+        """Return the smoothed longitude."""
+        return self._lon0 + self.east / self._east_per_degree
+
+    @property
+    def accuracy(self) -> float:
+        """Return the standard deviation of the smoothed position in meters."""
+        return math.sqrt(self.p_pos)
+
+
+class PositionSmoother:
+    """Keep a Kalman track per collar and attach its smoothed position.
+
+    Each new fix, recognized by a later ``timeMeasure``, updates the collar's
+    track once; polls that return the same fix leave it alone. A gap of more
+    than ``SMOOTHING_RESET_SECONDS`` starts a new track rather than
+    extrapolating an old velocity.
+    """
+
+    def __init__(self) -> None:
+        """Initialize the smoother."""
+        self.tracks: dict[int, KalmanTrack] = {}
+
+    def apply(self, devices: list[CollarSnapshot]) -> list[CollarSnapshot]:
+        """Return the collars with their smoothed positions attached."""
+        tracks: dict[int, KalmanTrack] = {}
+        smoothed: list[CollarSnapshot] = []
+        for device in devices:
+            track = self.tracks.get(device.id)
+            position = device.lastPos
+            time = fix_timestamp(position.timeMeasure) if position else None
+            if (
+                time is not None
+                and position.posLat is not None
+                and position.posLong is not None
+            ):
+                accuracy = max(
+                    position.acc or SMOOTHING_DEFAULT_ACCURACY, SMOOTHING_MIN_ACCURACY
+                )
+                if track is None or time - track.time > SMOOTHING_RESET_SECONDS:
+                    track = KalmanTrack(
+                        position.posLat, position.posLong, accuracy, time
+                    )
+                elif time > track.time:
+                    track.update(position.posLat, position.posLong, accuracy, time)
+            if track is None:
+                smoothed.append(device)
+                continue
+            tracks[device.id] = track
+            smoothed.append(
+                replace(
+                    device,
+                    smoothed=CollarPosition(
+                        posLat=track.latitude,
+                        posLong=track.longitude,
+                        acc=round(track.accuracy),
+                    ),
+                )
+            )
+
+        # Collars no longer on the account are forgotten
+        self.tracks = tracks
+        return smoothed
@@ -2,6 +2,23 @@
 
 from __future__ import annotations
 
+import math
+from collections.abc import Callable, Iterable
+from datetime import UTC, datetime
+from typing import Any
+
+from aiohttp import ClientResponseError
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.const import CONF_TOKEN
+from homeassistant.core import callback
+from homeassistant.helpers.entity import Entity
+from homeassistant.helpers.entity_platform import AddEntitiesCallback
+from homeassistant.util import dt as dt_util
+
+from .const import AUTH_ERROR_STATUSES, CONF_TOKEN_EXPIRES, TOKEN_EXPIRY_MARGIN
+
+EARTH_RADIUS_METERS = 6371008.8
+
 
 def battery_mv_to_percentage(mv: int) -> int:
     """Convert battery millivolts to percentage.
@@ -14,3 +31,247 @@ def battery_mv_to_percentage(mv: int) -> int:
     if mv <= 3600:
         return 0
     return int(((mv - 3600) / 600) * 100)
+
+
+def haversine_distance(lat1: float, lon1: float, lat2: float, lon2: float) -> float:
+    """Return the great-circle distance between two coordinates in meters."""
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lon2 - lon1)
+    a = (
+        math.sin(dphi / 2) ** 2
+        + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_METERS * math.asin(math.sqrt(a))
+
+
+# Values derived from each collar, built on first use and shared by its entities
+DEVICE_RECORDS = ("device_info", "sensor_values", "tracker_attributes")
+
+
+def build_device_data(
+    devices: list[Any],
+    stale: bool = False,
+    previous: dict[str, Any] | None = None,
+    unchanged: Iterable[int] = (),
+) -> dict[str, Any]:
+    """Build the coordinator data payload for a list of devices.
+
+    Alongside the ordered device list, an index keyed by device id is
+    published so entities can look up their collar in constant time instead
+    of scanning the list on every property read. ``stale`` marks data kept
+    from an earlier poll because the API could not be reached.
+
+    Each of ``DEVICE_RECORDS`` maps a device id to values derived from that
+    collar, filled in by ``get_device_record`` when first read. Records of the
+    ``unchanged`` collars are carried over from the ``previous`` data, so they
+    are only rebuilt when their collar changes.
+    """
+    data: dict[str, Any] = {
+        "devices": devices,
+        "devices_by_id": {device.id: device for device in devices},
+        "stale": stale,
+    }
+    for key in DEVICE_RECORDS:
+        kept = previous[key] if previous else {}
+        data[key] = {
+            device_id: kept[device_id] for device_id in unchanged if device_id in kept
+        }
+    return data
+
+
+def get_device_record(
+    data: dict[str, Any], key: str, device: Any, build: Callable[[Any], Any]
+) -> Any:
+    """Return a collar's record in ``data[key]``, building it on first use."""
+    records = data[key]
+    record = records.get(device.id)
+    if record is None:
+        record = records[device.id] = build(device)
+    return record
+
+
+def get_device(data: dict[str, Any] | None, device_id: int) -> Any | None:
+    """Return the device with the given id from coordinator data."""
+    if not data:
+        return None
+    return data.get("devices_by_id", {}).get(device_id)
+
+
+@callback
+def async_add_device_entities(
+    coordinator: Any,
+    config_entry: ConfigEntry,
+    async_add_entities: AddEntitiesCallback,
+    create_entities: Callable[[Any], Iterable[Entity]],
+) -> None:
+    """Add entities for each collar now and for collars that appear later."""
+    known: set[int] = set()
+
+    @callback
+    def _async_add_devices(devices: list[Any]) -> None:
+        new_devices = [device for device in devices if device.id not in known]
+        if not new_devices:
+            return
+        known.update(device.id for device in new_devices)
+        # Entities read coordinator data, so there is nothing to update first
+        async_add_entities(
+            [entity for device in new_devices for entity in create_entities(device)]
+        )
+
+    @callback
+    def _async_add_new_devices() -> None:
+        devices = coordinator.data.get("devices", []) if coordinator.data else []
+        if devices:
+            # A removed collar gets fresh entities if it comes back
+            known.intersection_update(device.id for device in devices)
+        _async_add_devices(devices)
+
+    _async_add_new_devices()
+    # Collars seen by a previous run restore their last state until polled
+    _async_add_devices(coordinator.registered_devices())
+    config_entry.async_on_unload(coordinator.async_add_listener(_async_add_new_devices))
+
+
+def device_fingerprint(device: Any) -> dict[str, Any]:
+    """Return the device fields that entity states are derived from."""
+    details = device.details
+    position = device.lastPos
+    return {
+        "bat": device.bat,
+        "chg": device.chg,
+        "home": device.home,
+        "mode": device.mode,
+        "modeSet": device.modeSet,
+        "status": device.status,
+        "sw": device.sw,
+        "name": details.name if details else None,
+        "lastContact": device.lastContact,
+        "posLat": position.posLat if position else None,
+        "posLong": position.posLong if position else None,
+        "acc": position.acc if position else None,
+        "sat": position.sat if position else None,
+        "rssi": position.rssi if position else None,
+        "timeMeasure": position.timeMeasure if position else None,
+        # Derived by the coordinator, so a reset at midnight is noticed too
+        "motion": device.motion,
+    }
+
+
+def changed_fields(
+    previous: dict[str, Any] | None, current: dict[str, Any]
+) -> set[str]:
+    """Return the names of fingerprint fields that differ between snapshots."""
+    if previous is None:
+        return set(current)
+    return {field for field, value in current.items() if previous.get(field) != value}
+
+
+def apply_deadbands(
+    previous: dict[str, Any] | None,
+    current: dict[str, Any],
+    deadbands: dict[str, float],
+) -> None:
+    """Hold fingerprint fields that moved less than their deadband.
+
+    A field whose numeric change since ``previous`` is smaller than its
+    deadband keeps its previous value in ``current``, so it is not reported
+    as changed and slow drift is measured from the last value written.
+    """
+    if previous is None:
+        return
+    for field, deadband in deadbands.items():
+        old, new = previous.get(field), current.get(field)
+        if old is not None and new is not None and abs(new - old) < deadband:
+            current[field] = old
+
+
+def _format_datetime(value: Any) -> str | None:
+    """Format a timestamp the way the PetTracer API returns it."""
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=UTC)
+        return value.strftime("%Y-%m-%dT%H:%M:%S.%f%z")
+    if isinstance(value, str):
+        return value
+    return None
+
+
+def fix_timestamp(value: datetime | str | None) -> float | None:
+    """Return a fix's timeMeasure as a POSIX timestamp."""
+    if isinstance(value, str):
+        value = dt_util.parse_datetime(value)
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=UTC)
+    return value.timestamp()
+
+
+def device_to_dict(device: Any) -> dict[str, Any]:
+    """Serialize the device fields the integration uses to API-shaped JSON.
+
+    The result can be parsed back with ``pettracer.Device.from_dict``.
+    """
+    details = device.details
+    position = device.lastPos
+    return {
+        "id": device.id,
+        "bat": device.bat,
+        "chg": device.chg,
+        "home": device.home,
+        "mode": device.mode,
+        "modeSet": device.modeSet,
+        "status": device.status,
+        "sw": device.sw,
+        "lastContact": _format_datetime(device.lastContact),
+        "details": {"name": details.name} if details else None,
+        "lastPos": {
+            "posLat": position.posLat,
+            "posLong": position.posLong,
+            "acc": position.acc,
+            "sat": position.sat,
+            "rssi": position.rssi,
+            "timeMeasure": _format_datetime(position.timeMeasure),
+        }
+        if position
+        else None,
+    }
+
+
+def token_data(client: Any) -> dict[str, Any]:
+    """Return the client's session token for storing in the config entry."""
+    expires = client.token_expires
+    return {
+        CONF_TOKEN: client.token,
+        CONF_TOKEN_EXPIRES: (
+            expires.isoformat() if isinstance(expires, datetime) else None
+        ),
+    }
+
+
+def stored_token(data: dict[str, Any], now: datetime) -> str | None:
+    """Return the stored session token if it has not expired yet."""
+    token = data.get(CONF_TOKEN)
+    if not token:
+        return None
+    expires = data.get(CONF_TOKEN_EXPIRES)
+    if expires is None:
+        return token
+    try:
+        expires_at = datetime.fromisoformat(expires)
+    except (TypeError, ValueError):
+        return None
+    if expires_at.tzinfo is None:
+        expires_at = expires_at.replace(tzinfo=UTC)
+    if expires_at - TOKEN_EXPIRY_MARGIN <= now:
+        return None
+    return token
+
+
+def is_auth_error(err: BaseException) -> bool:
+    """Return True if a PetTracer error was caused by a rejected token."""
+    cause = err.__cause__
+    return (
+        isinstance(cause, ClientResponseError) and cause.status in AUTH_ERROR_STATUSES
+    )
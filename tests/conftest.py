@@ -3,7 +3,9 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from datetime import datetime
 
 import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
 
+from homeassistant.config_entries import ConfigEntryState
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 
 from custom_components.pettracer.const import DOMAIN
@@ -33,6 +35,7 @@ def mock_pettracer_client():
     with patch("custom_components.pettracer.config_flow.PetTracerClient") as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
         client_instance.is_authenticated = True
         client_instance.token = "test-token"
         client_instance.user_name = "Test User"
@@ -46,6 +49,7 @@ def mock_pettracer_client_init():
     with patch("custom_components.pettracer.PetTracerClient") as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
         client_instance.is_authenticated = True
         client_instance.token = "test-token"
         client_instance.get_all_devices = AsyncMock()
@@ -53,6 +57,47 @@ def mock_pettracer_client_init():
         yield client_instance
 
 
+@pytest.fixture
+def setup_coordinator(hass, mock_pettracer_client_init):
+    """Return a factory for a coordinator that has completed its first refresh."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    async def _setup(devices):
+        entry = MockConfigEntry(
+            domain=DOMAIN,
+            data={
+                CONF_USERNAME: "test@example.com",
+                CONF_PASSWORD: "test_password",
+            },
+            entry_id="test_entry",
+        )
+        entry.add_to_hass(hass)
+        entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+        mock_pettracer_client_init.get_all_devices.return_value = devices
+        coordinator = PetTracerDataUpdateCoordinator(
+            hass, mock_pettracer_client_init, entry
+        )
+        await coordinator.async_config_entry_first_refresh()
+        return coordinator
+
+    return _setup
+
+
+@pytest.fixture
+def make_collar():
+    """Return a factory for a collar snapshot with a fix."""
+    from custom_components.pettracer.models import CollarPosition, CollarSnapshot
+
+    def _collar(lat, when, lon=-0.1278, acc=10, device_id=12345):
+        return CollarSnapshot(
+            id=device_id,
+            lastPos=CollarPosition(lat, lon, acc=acc, timeMeasure=when),
+        )
+
+    return _collar
+
+
 @pytest.fixture
 def mock_device():
     """Create a mock PetTracer device."""
@@ -61,6 +106,7 @@ def mock_device():
     device.bat = 4100
     device.status = 0
     device.mode = 1
+    device.modeSet = 1
     device.home = True
     device.chg = 1
     device.sw = 656393
@@ -78,6 +124,7 @@ def mock_device():
     device.lastPos.sat = 8
     device.lastPos.rssi = -65
     device.lastPos.timeMeasure = "2026-01-11T10:30:00.000+0000"
+    device.motion = None
     
     return device
 
@@ -90,6 +137,7 @@ def mock_device_no_position():
     device.bat = 3800
     device.status = 0
     device.mode = 1
+    device.modeSet = 1
     device.home = False
     device.chg = 0
     device.sw = 656393
@@ -101,6 +149,7 @@ def mock_device_no_position():
     
     # No position
     device.lastPos = None
+    device.motion = None
     
     return device
 
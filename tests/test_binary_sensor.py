@@ -9,6 +9,7 @@ from homeassistant.config_entries import ConfigEntryState
 from homeassistant.components.binary_sensor import BinarySensorDeviceClass
 
 from custom_components.pettracer.const import DOMAIN
+from custom_components.pettracer.utils import build_device_data
 from custom_components.pettracer.binary_sensor import (
     PetTracerAtHomeBinarySensor,
     PetTracerChargingBinarySensor,
@@ -46,7 +47,7 @@ async def test_binary_sensor_setup(hass, mock_pettracer_client_init, mock_device
 
         entities = []
 
-        def mock_add_entities(new_entities, update_before_add):
+        def mock_add_entities(new_entities, update_before_add=False):
             entities.extend(new_entities)
 
         await binary_sensor_setup(hass, entry, mock_add_entities)
@@ -55,11 +56,13 @@ async def test_binary_sensor_setup(hass, mock_pettracer_client_init, mock_device
         assert isinstance(entities[0], PetTracerAtHomeBinarySensor)
         assert isinstance(entities[1], PetTracerChargingBinarySensor)
 
+        await hass.data[DOMAIN][entry.entry_id].async_shutdown()
+
 
 async def test_at_home_binary_sensor_true(hass, mock_device):
     """Test at home binary sensor when pet is home."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     sensor = PetTracerAtHomeBinarySensor(coordinator, mock_device)
 
@@ -74,7 +77,7 @@ async def test_at_home_binary_sensor_true(hass, mock_device):
 async def test_at_home_binary_sensor_false(hass, mock_device_no_position):
     """Test at home binary sensor when pet is not home."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device_no_position])
 
     sensor = PetTracerAtHomeBinarySensor(coordinator, mock_device_no_position)
 
@@ -93,7 +96,7 @@ async def test_at_home_binary_sensor_none(hass):
     device.sw = None
 
     coordinator = MagicMock()
-    coordinator.data = {"devices": [device]}
+    coordinator.data = build_device_data([device])
 
     sensor = PetTracerAtHomeBinarySensor(coordinator, device)
 
@@ -103,7 +106,7 @@ async def test_at_home_binary_sensor_none(hass):
 async def test_at_home_binary_sensor_device_info(hass, mock_device):
     """Test at home binary sensor device info."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     sensor = PetTracerAtHomeBinarySensor(coordinator, mock_device)
     device_info = sensor.device_info
@@ -117,13 +120,13 @@ async def test_at_home_binary_sensor_device_info(hass, mock_device):
 async def test_at_home_binary_sensor_device_info_reflects_pet_rename(hass, mock_device):
     """Renaming the pet must update device_info without changing identifiers."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     sensor = PetTracerAtHomeBinarySensor(coordinator, mock_device)
     assert sensor.device_info["name"] == "Fluffy"
 
     mock_device.details.name = "Buddy"
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     assert sensor.device_info["name"] == "Buddy"
     # Stable identifiers never move, regardless of the pet's current name.
@@ -135,7 +138,7 @@ async def test_at_home_binary_sensor_device_info_reflects_pet_rename(hass, mock_
 async def test_charging_binary_sensor_true(hass, mock_device):
     """Test charging binary sensor when collar is charging."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     sensor = PetTracerChargingBinarySensor(coordinator, mock_device)
 
@@ -149,7 +152,7 @@ async def test_charging_binary_sensor_true(hass, mock_device):
 async def test_charging_binary_sensor_false(hass, mock_device_no_position):
     """Test charging binary sensor when collar is not charging."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device_no_position])
 
     sensor = PetTracerChargingBinarySensor(coordinator, mock_device_no_position)
 
@@ -168,7 +171,7 @@ async def test_charging_binary_sensor_none(hass):
     device.sw = None
 
     coordinator = MagicMock()
-    coordinator.data = {"devices": [device]}
+    coordinator.data = build_device_data([device])
 
     sensor = PetTracerChargingBinarySensor(coordinator, device)
 
@@ -178,7 +181,7 @@ async def test_charging_binary_sensor_none(hass):
 async def test_charging_binary_sensor_device_info(hass, mock_device):
     """Test charging binary sensor device info."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     sensor = PetTracerChargingBinarySensor(coordinator, mock_device)
     device_info = sensor.device_info
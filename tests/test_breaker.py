@@ -0,0 +1,79 @@
+"""Tests for the PetTracer API circuit breaker."""
+from datetime import UTC, datetime, timedelta
+
+from custom_components.pettracer.breaker import CircuitBreaker
+from custom_components.pettracer.const import (
+    BACKOFF_MAX_SECONDS,
+    BREAKER_CLOSED,
+    BREAKER_HALF_OPEN,
+    BREAKER_OPEN,
+)
+
+NOW = datetime(2026, 1, 11, 10, 30, tzinfo=UTC)
+
+
+def test_backoff_doubles_with_each_failure():
+    """Test consecutive failures widen the retry delay."""
+    breaker = CircuitBreaker(rand=lambda: 0.0)
+
+    assert [breaker.record_failure(NOW) for _ in range(4)] == [30, 60, 120, 240]
+
+
+def test_backoff_is_capped():
+    """Test the delay never exceeds the maximum."""
+    breaker = CircuitBreaker(rand=lambda: 0.0)
+
+    for _ in range(20):
+        delay = breaker.record_failure(NOW)
+
+    assert delay == BACKOFF_MAX_SECONDS
+
+
+def test_backoff_jitter_shortens_delay():
+    """Test jitter spreads retries below the nominal delay."""
+    breaker = CircuitBreaker(rand=lambda: 1.0)
+
+    assert breaker.record_failure(NOW) == 15
+
+
+def test_breaker_opens_after_threshold():
+    """Test requests are refused once failures reach the threshold."""
+    breaker = CircuitBreaker(rand=lambda: 0.0)
+
+    breaker.record_failure(NOW)
+    breaker.record_failure(NOW)
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.allow_request(NOW) is True
+
+    breaker.record_failure(NOW)
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.allow_request(NOW + timedelta(seconds=60)) is False
+    assert breaker.retry_in(NOW + timedelta(seconds=60)) == 60
+
+
+def test_breaker_half_opens_to_probe():
+    """Test one probe is allowed once the delay has passed."""
+    breaker = CircuitBreaker(rand=lambda: 0.0)
+    for _ in range(3):
+        breaker.record_failure(NOW)
+
+    assert breaker.allow_request(NOW + timedelta(seconds=120)) is True
+    assert breaker.state == BREAKER_HALF_OPEN
+
+    breaker.record_success()
+    assert breaker.state == BREAKER_CLOSED
+    assert breaker.failures == 0
+    assert breaker.retry_at is None
+
+
+def test_breaker_failed_probe_reopens():
+    """Test a failed probe re-opens the breaker with a longer delay."""
+    breaker = CircuitBreaker(rand=lambda: 0.0)
+    for _ in range(3):
+        breaker.record_failure(NOW)
+
+    probe_time = NOW + timedelta(seconds=120)
+    assert breaker.allow_request(probe_time) is True
+    assert breaker.record_failure(probe_time) == 240
+    assert breaker.state == BREAKER_OPEN
+    assert breaker.allow_request(probe_time + timedelta(seconds=120)) is False
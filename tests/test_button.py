@@ -0,0 +1,177 @@
+"""Tests for the PetTracer button platform."""
+
+import time
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from custom_components.pettracer.button import PetTracerLocateButton
+from custom_components.pettracer.const import (
+    DOMAIN,
+    LOCATE_TIMEOUT_SECONDS,
+    MIN_UPDATE_INTERVAL_SECONDS,
+)
+from custom_components.pettracer.utils import build_device_data
+
+
+async def test_button_setup(hass, mock_pettracer_client_init, mock_device):
+    """Test a locate button is created per collar."""
+    from custom_components.pettracer import async_setup_entry
+    from custom_components.pettracer.button import async_setup_entry as button_setup
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        await async_setup_entry(hass, entry)
+
+    entities = []
+
+    def mock_add_entities(new_entities, update_before_add=False):
+        entities.extend(new_entities)
+
+    await button_setup(hass, entry, mock_add_entities)
+
+    assert len(entities) == 1
+    assert isinstance(entities[0], PetTracerLocateButton)
+    assert entities[0].unique_id == "pettracer_12345_locate"
+    assert entities[0].name == "Locate Now"
+    assert entities[0].device_info["name"] == "Fluffy"
+
+    await hass.data[DOMAIN][entry.entry_id].async_shutdown()
+
+
+async def test_button_press_requests_locate(hass, mock_device):
+    """Test pressing the button asks the coordinator for a fix."""
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    coordinator.async_request_locate = AsyncMock()
+    coordinator.locate_pending.return_value = False
+    coordinator.locate_latency = {}
+
+    button = PetTracerLocateButton(coordinator, mock_device)
+    button.hass = hass
+    button.entity_id = "button.fluffy_locate_now"
+    await button.async_press()
+
+    coordinator.async_request_locate.assert_awaited_once_with(12345)
+    assert button.extra_state_attributes == {
+        "pending": False,
+        "last_fix_latency": None,
+    }
+    await button.async_will_remove_from_hass()
+
+
+async def test_button_state_follows_locate(hass, mock_pettracer_client_init, mock_device):
+    """Test the pending attribute is written on press, fix and timeout."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    entity_id = er.async_get(hass).async_get_entity_id(
+        "button", DOMAIN, "pettracer_12345_locate"
+    )
+
+    async def press():
+        await hass.services.async_call(
+            "button", "press", {"entity_id": entity_id}, blocking=True
+        )
+
+    # The press right after setup waits for the minimum spacing
+    await press()
+    assert hass.states.get(entity_id).attributes["pending"] is True
+
+    mock_device.lastPos.timeMeasure = "2026-01-11T10:31:00.000+0000"
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=MIN_UPDATE_INTERVAL_SECONDS + 1)
+    )
+    await hass.async_block_till_done()
+    state = hass.states.get(entity_id)
+    assert state.attributes["pending"] is False
+    assert state.attributes["last_fix_latency"] is not None
+
+    # No new fix arrives: the request is given up after the timeout
+    await press()
+    assert hass.states.get(entity_id).attributes["pending"] is True
+    with patch(
+        "custom_components.pettracer.time.monotonic",
+        return_value=time.monotonic() + LOCATE_TIMEOUT_SECONDS,
+    ):
+        async_fire_time_changed(
+            hass, dt_util.utcnow() + timedelta(seconds=LOCATE_TIMEOUT_SECONDS + 1)
+        )
+        await hass.async_block_till_done()
+        assert hass.states.get(entity_id).attributes["pending"] is False
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+
+
+async def test_locate_measures_time_to_new_fix(hass, setup_coordinator, mock_pettracer_client_init, mock_device):
+    """Test the latency from press until a newer fix is recorded."""
+    coordinator = await setup_coordinator([mock_device])
+    # Let the locate refresh run right away
+    coordinator._last_poll_started = None
+
+    await coordinator.async_request_locate(12345)
+    assert mock_pettracer_client_init.get_all_devices.await_count == 2
+    # The collar has not sent a new fix yet
+    assert coordinator.locate_pending(12345) is True
+    assert 12345 not in coordinator.locate_latency
+
+    mock_device.lastPos.timeMeasure = "2026-01-11T10:31:00.000+0000"
+    await coordinator.async_refresh()
+
+    assert coordinator.locate_pending(12345) is False
+    assert coordinator.locate_latency[12345] >= 0
+
+    await coordinator.async_shutdown()
+
+
+async def test_locate_respects_minimum_spacing(hass, setup_coordinator, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test presses right after a poll share one deferred refresh."""
+    coordinator = await setup_coordinator([mock_device, mock_device_no_position])
+
+    await coordinator.async_request_locate(12345)
+    await coordinator.async_request_locate(12346)
+    await coordinator.async_request_locate(12345)
+    assert mock_pettracer_client_init.get_all_devices.await_count == 1
+    assert coordinator.locate_pending(12345) is True
+    assert coordinator.locate_pending(12346) is True
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=MIN_UPDATE_INTERVAL_SECONDS + 1)
+    )
+    await hass.async_block_till_done()
+    assert mock_pettracer_client_init.get_all_devices.await_count == 2
+
+    await coordinator.async_shutdown()
+
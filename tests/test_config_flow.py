@@ -1,14 +1,31 @@
 """Tests for the PetTracer config flow."""
+from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
 from pettracer import PetTracerError
 
 from homeassistant import config_entries
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
 from homeassistant.data_entry_flow import FlowResultType
 
-from custom_components.pettracer.const import DOMAIN
+from custom_components.pettracer.const import (
+    CONF_BACKGROUND_SETUP,
+    CONF_BATTERY_DEADBAND,
+    CONF_ESCALATE_ON_LEAVE,
+    CONF_ESCALATION_MODE,
+    CONF_ESCALATION_TIMEOUT,
+    CONF_ESCALATION_ZONE,
+    CONF_HISTORY_DEPTH,
+    CONF_HISTORY_MEMORY,
+    CONF_JITTER_FLOOR,
+    CONF_MAX_ACCURACY,
+    CONF_MIN_SATELLITES,
+    CONF_RSSI_DEADBAND,
+    CONF_TOKEN_EXPIRES,
+    DATA_VALIDATED_CLIENTS,
+    DOMAIN,
+)
 
 
 async def test_form_user(hass, mock_setup_entry):
@@ -32,6 +49,9 @@ async def test_form_user_success(hass, mock_setup_entry, mock_pettracer_client):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
+        client_instance.token = "test-token"
+        client_instance.token_expires = datetime(2026, 2, 1)
         mock_client.return_value = client_instance
         
         result2 = await hass.config_entries.flow.async_configure(
@@ -47,8 +67,13 @@ async def test_form_user_success(hass, mock_setup_entry, mock_pettracer_client):
     assert result2["data"] == {
         CONF_USERNAME: "test@example.com",
         CONF_PASSWORD: "test_password",
+        CONF_TOKEN: "test-token",
+        CONF_TOKEN_EXPIRES: "2026-02-01T00:00:00",
     }
     assert len(mock_setup_entry.mock_calls) == 1
+    # The logged-in client is kept for setup rather than thrown away
+    assert hass.data[DATA_VALIDATED_CLIENTS]["test@example.com"] is client_instance
+    client_instance.close.assert_not_awaited()
 
 
 async def test_form_invalid_auth(hass, mock_setup_entry):
@@ -62,6 +87,7 @@ async def test_form_invalid_auth(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock(side_effect=PetTracerError("Invalid credentials"))
+        client_instance.close = AsyncMock()
         mock_client.return_value = client_instance
         
         result2 = await hass.config_entries.flow.async_configure(
@@ -74,6 +100,7 @@ async def test_form_invalid_auth(hass, mock_setup_entry):
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "invalid_auth"}
+    client_instance.close.assert_awaited_once()
 
 
 async def test_form_unknown_exception(hass, mock_setup_entry):
@@ -87,6 +114,7 @@ async def test_form_unknown_exception(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock(side_effect=Exception("Unexpected error"))
+        client_instance.close = AsyncMock()
         mock_client.return_value = client_instance
         
         result2 = await hass.config_entries.flow.async_configure(
@@ -125,6 +153,7 @@ async def test_form_duplicate_entry(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
         mock_client.return_value = client_instance
         
         result2 = await hass.config_entries.flow.async_configure(
@@ -137,6 +166,7 @@ async def test_form_duplicate_entry(hass, mock_setup_entry):
 
     assert result2["type"] == FlowResultType.ABORT
     assert result2["reason"] == "already_configured"
+    client_instance.login.assert_not_awaited()
 
 
 async def test_form_case_insensitive_username(hass, mock_setup_entry):
@@ -150,6 +180,7 @@ async def test_form_case_insensitive_username(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
         mock_client.return_value = client_instance
         
         result2 = await hass.config_entries.flow.async_configure(
@@ -206,6 +237,9 @@ async def test_reauth_flow_success(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
+        client_instance.token = "new-token"
+        client_instance.token_expires = None
         mock_client.return_value = client_instance
 
         result2 = await hass.config_entries.flow.async_configure(
@@ -216,6 +250,7 @@ async def test_reauth_flow_success(hass, mock_setup_entry):
     assert result2["type"] == FlowResultType.ABORT
     assert result2["reason"] == "reauth_successful"
     assert entry.data[CONF_PASSWORD] == "new_password"
+    assert entry.data[CONF_TOKEN] == "new-token"
 
 
 async def test_reauth_flow_unknown_exception(hass, mock_setup_entry):
@@ -239,6 +274,7 @@ async def test_reauth_flow_unknown_exception(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock(side_effect=Exception("Unexpected error"))
+        client_instance.close = AsyncMock()
         mock_client.return_value = client_instance
 
         result2 = await hass.config_entries.flow.async_configure(
@@ -271,6 +307,7 @@ async def test_reauth_flow_invalid_auth(hass, mock_setup_entry):
     ) as mock_client:
         client_instance = MagicMock()
         client_instance.login = AsyncMock(side_effect=PetTracerError("Invalid"))
+        client_instance.close = AsyncMock()
         mock_client.return_value = client_instance
 
         result2 = await hass.config_entries.flow.async_configure(
@@ -280,3 +317,123 @@ async def test_reauth_flow_invalid_auth(hass, mock_setup_entry):
 
     assert result2["type"] == FlowResultType.FORM
     assert result2["errors"] == {"base": "invalid_auth"}
+
+
+async def test_reauth_flow_updates_loaded_entry_in_place(hass, mock_setup_entry):
+    """Test reauth of a running entry swaps credentials without a reload."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "old_password",
+        },
+        unique_id="test@example.com",
+        state=config_entries.ConfigEntryState.LOADED,
+    )
+    entry.add_to_hass(hass)
+
+    coordinator = MagicMock()
+    coordinator.async_reauthenticate = AsyncMock()
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    result = await entry.start_reauth_flow(hass)
+
+    with patch(
+        "custom_components.pettracer.config_flow.PetTracerClient"
+    ) as mock_client, patch.object(
+        hass.config_entries, "async_reload"
+    ) as mock_reload:
+        client_instance = MagicMock()
+        client_instance.login = AsyncMock()
+        client_instance.close = AsyncMock()
+        client_instance.token = "new-token"
+        client_instance.token_expires = None
+        mock_client.return_value = client_instance
+
+        result2 = await hass.config_entries.flow.async_configure(
+            result["flow_id"],
+            {CONF_PASSWORD: "new_password"},
+        )
+
+    assert result2["type"] == FlowResultType.ABORT
+    assert result2["reason"] == "reauth_successful"
+    assert entry.data[CONF_PASSWORD] == "new_password"
+    assert entry.data[CONF_TOKEN] == "new-token"
+    coordinator.async_reauthenticate.assert_awaited_once()
+    mock_reload.assert_not_called()
+    assert entry.state is config_entries.ConfigEntryState.LOADED
+
+
+async def test_options_flow(hass, mock_setup_entry):
+    """Test the setup, escalation, deadband and position options are stored."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+    assert result["type"] == FlowResultType.FORM
+    assert result["step_id"] == "init"
+
+    result2 = await hass.config_entries.options.async_configure(
+        result["flow_id"],
+        {
+            CONF_BACKGROUND_SETUP: True,
+            CONF_ESCALATE_ON_LEAVE: True,
+            CONF_ESCALATION_MODE: "Fast",
+            CONF_ESCALATION_TIMEOUT: 45,
+            CONF_ESCALATION_ZONE: "zone.home",
+            CONF_RSSI_DEADBAND: 5,
+            CONF_MIN_SATELLITES: 4,
+            CONF_HISTORY_DEPTH: 500,
+        },
+    )
+
+    assert result2["type"] == FlowResultType.CREATE_ENTRY
+    assert entry.options == {
+        CONF_BACKGROUND_SETUP: True,
+        CONF_ESCALATE_ON_LEAVE: True,
+        CONF_ESCALATION_MODE: "Fast",
+        CONF_ESCALATION_TIMEOUT: 45,
+        CONF_ESCALATION_ZONE: "zone.home",
+        CONF_BATTERY_DEADBAND: 20,
+        CONF_RSSI_DEADBAND: 5,
+        CONF_JITTER_FLOOR: 10,
+        CONF_MAX_ACCURACY: 250,
+        CONF_MIN_SATELLITES: 4,
+        CONF_HISTORY_DEPTH: 500,
+        CONF_HISTORY_MEMORY: 1024,
+    }
+
+
+async def test_options_flow_rejects_slow_modes(hass, mock_setup_entry):
+    """Test only fast modes can be chosen for escalation."""
+    from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+    import voluptuous as vol
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+
+    result = await hass.config_entries.options.async_init(entry.entry_id)
+
+    with pytest.raises(vol.Invalid):
+        await hass.config_entries.options.async_configure(
+            result["flow_id"], {CONF_ESCALATION_MODE: "Slow"}
+        )
@@ -15,6 +15,10 @@ from custom_components.pettracer.const import (
     MODE_SLOW,
     VALID_MODES,
     MODE_NAMES,
+    MODE_POLL_INTERVALS,
+    MIN_UPDATE_INTERVAL_SECONDS,
+    MAX_UPDATE_INTERVAL_SECONDS,
+    STORAGE_SAVE_DELAY_SECONDS,
 )
 
 
@@ -70,3 +74,21 @@ def test_mode_names():
     assert MODE_NAMES[MODE_SLOW_PLUS] == "Slow+"
     assert MODE_NAMES[MODE_SLOW] == "Slow"
     assert len(MODE_NAMES) == 7
+
+
+def test_mode_poll_intervals():
+    """Test every mode has a polling interval, faster modes polling sooner."""
+    assert set(MODE_POLL_INTERVALS) == VALID_MODES
+    assert MODE_POLL_INTERVALS[MODE_LIVE] < MODE_POLL_INTERVALS[MODE_FAST_PLUS]
+    assert MODE_POLL_INTERVALS[MODE_FAST_PLUS] < MODE_POLL_INTERVALS[MODE_FAST]
+    assert MODE_POLL_INTERVALS[MODE_FAST] < MODE_POLL_INTERVALS[MODE_NORMAL_PLUS]
+    assert MODE_POLL_INTERVALS[MODE_NORMAL_PLUS] < MODE_POLL_INTERVALS[MODE_NORMAL]
+    assert MODE_POLL_INTERVALS[MODE_NORMAL] < MODE_POLL_INTERVALS[MODE_SLOW]
+    # Slow+ is the least frequent mode
+    assert MODE_POLL_INTERVALS[MODE_SLOW] < MODE_POLL_INTERVALS[MODE_SLOW_PLUS]
+    assert MIN_UPDATE_INTERVAL_SECONDS < UPDATE_INTERVAL_SECONDS < MAX_UPDATE_INTERVAL_SECONDS
+
+
+def test_snapshot_saved_between_polls():
+    """Test a save is not postponed indefinitely by polls restarting its delay."""
+    assert STORAGE_SAVE_DELAY_SECONDS < MIN_UPDATE_INTERVAL_SECONDS
@@ -8,6 +8,7 @@ from homeassistant.components.device_tracker import SourceType
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
 
 from custom_components.pettracer.const import DOMAIN
+from custom_components.pettracer.utils import build_device_data
 
 
 async def test_device_tracker_setup(hass, mock_pettracer_client_init, mock_device):
@@ -45,13 +46,20 @@ async def test_device_tracker_setup(hass, mock_pettracer_client_init, mock_devic
         # Setup device tracker platform
         entities = []
         
-        def mock_add_entities(new_entities, update_before_add):
+        def mock_add_entities(new_entities, update_before_add=False):
             entities.extend(new_entities)
         
         await tracker_setup(hass, entry, mock_add_entities)
         
-        assert len(entities) == 1
-        assert entities[0]._device.id == 12345
+        assert [entity.unique_id for entity in entities] == [
+            "pettracer_12345",
+            "pettracer_12345_smoothed",
+        ]
+        assert entities[0]._device_id == 12345
+        # The smoothed tracker is opt-in
+        assert entities[1].entity_registry_enabled_default is False
+
+        await hass.data[DOMAIN][entry.entry_id].async_shutdown()
 
 
 async def test_device_tracker_properties(hass, mock_device):
@@ -59,7 +67,7 @@ async def test_device_tracker_properties(hass, mock_device):
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     
     tracker = PetTracerDeviceTracker(coordinator, mock_device)
     
@@ -81,7 +89,7 @@ async def test_device_tracker_battery_conversion(hass, mock_device):
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     
     # Test with 4100mV (83% battery)
     mock_device.bat = 4100
@@ -91,19 +99,19 @@ async def test_device_tracker_battery_conversion(hass, mock_device):
     
     # Test with full battery (4200mV = 100%)
     mock_device.bat = 4200
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     battery = tracker.battery_level
     assert battery == 100
     
     # Test with low battery (3600mV = 0%)
     mock_device.bat = 3600
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     battery = tracker.battery_level
     assert battery == 0
     
     # Test with very high battery (above 4200mV)
     mock_device.bat = 4500
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     battery = tracker.battery_level
     assert battery == 100
 
@@ -114,7 +122,7 @@ async def test_device_tracker_no_position(hass, mock_device_no_position):
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device_no_position])
     
     tracker = PetTracerDeviceTracker(coordinator, mock_device_no_position)
     
@@ -131,18 +139,19 @@ async def test_device_tracker_attributes(hass, mock_device):
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     
     tracker = PetTracerDeviceTracker(coordinator, mock_device)
     attributes = tracker.extra_state_attributes
     
     assert "battery_voltage_mv" in attributes
     assert attributes["battery_voltage_mv"] == 4100
-    assert "last_contact" in attributes
-    assert "satellites" in attributes
-    assert attributes["satellites"] == 8
-    assert "signal_strength" in attributes
-    assert attributes["signal_strength"] == -65
+    assert not attributes.keys() & {
+        "last_contact",
+        "satellites",
+        "signal_strength",
+        "position_time",
+    }
     assert "at_home" in attributes
     assert attributes["at_home"] is True
     assert "status" in attributes
@@ -156,7 +165,7 @@ async def test_device_tracker_attributes_no_position(hass, mock_device_no_positi
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device_no_position])
     
     tracker = PetTracerDeviceTracker(coordinator, mock_device_no_position)
     attributes = tracker.extra_state_attributes
@@ -174,7 +183,7 @@ async def test_device_tracker_device_info(hass, mock_device):
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     
     tracker = PetTracerDeviceTracker(coordinator, mock_device)
     device_info = tracker.device_info
@@ -191,7 +200,7 @@ async def test_device_tracker_multiple_devices(hass, mock_device, mock_device_no
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device, mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device, mock_device_no_position])
     
     tracker1 = PetTracerDeviceTracker(coordinator, mock_device)
     tracker2 = PetTracerDeviceTracker(coordinator, mock_device_no_position)
@@ -209,7 +218,7 @@ async def test_device_tracker_coordinator_update(hass, mock_device):
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     
     tracker = PetTracerDeviceTracker(coordinator, mock_device)
     
@@ -220,7 +229,7 @@ async def test_device_tracker_coordinator_update(hass, mock_device):
     # Update device position
     mock_device.lastPos.posLat = 51.5100
     mock_device.lastPos.posLong = -0.1300
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
     
     # Values should update
     assert tracker.latitude == 51.5100
@@ -232,13 +241,13 @@ async def test_device_tracker_device_info_reflects_pet_rename(hass, mock_device)
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
 
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     tracker = PetTracerDeviceTracker(coordinator, mock_device)
     assert tracker.device_info["name"] == "Fluffy"
 
     mock_device.details.name = "Buddy"
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     assert tracker.device_info["name"] == "Buddy"
     # Stable identifiers never move, regardless of the pet's current name.
@@ -259,7 +268,7 @@ async def test_device_tracker_no_details(hass):
     device.sw = None
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [device]}
+    coordinator.data = build_device_data([device])
     
     tracker = PetTracerDeviceTracker(coordinator, device)
     
@@ -275,17 +284,89 @@ async def test_device_tracker_no_details(hass):
     assert device_info["sw_version"] is None
 
 
+async def test_device_tracker_attributes_built_once_per_change(hass, mock_device):
+    """Test the attributes are built once and shared until the data changes."""
+    from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
+
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    tracker = PetTracerDeviceTracker(coordinator, mock_device)
+
+    attributes = tracker.extra_state_attributes
+    assert tracker.extra_state_attributes is attributes
+
+    mock_device.bat = 3900
+    coordinator.data = build_device_data([mock_device])
+
+    assert tracker.extra_state_attributes["battery_voltage_mv"] == 3900
+
+
+async def test_device_tracker_volatile_attributes_unrecorded(hass, mock_device):
+    """Test the battery voltage, which has its own sensor, is kept out of the recorder."""
+    from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
+
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    tracker = PetTracerDeviceTracker(coordinator, mock_device)
+
+    assert "battery_voltage_mv" in tracker.extra_state_attributes
+    assert tracker._unrecorded_attributes == {"battery_voltage_mv"}
+    assert not tracker._unrecorded_attributes & {"status", "mode", "at_home"}
+
+
+async def test_smoothed_tracker(hass, mock_device):
+    """Test the smoothed tracker reports the collar's smoothed position."""
+    from dataclasses import replace
+
+    from custom_components.pettracer.device_tracker import PetTracerSmoothedTracker
+    from custom_components.pettracer.models import CollarPosition, CollarSnapshot
+
+    snapshot = CollarSnapshot.from_device(mock_device)
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([snapshot])
+    tracker = PetTracerSmoothedTracker(coordinator, snapshot)
+
+    assert tracker.name == "Smoothed Position"
+    assert tracker.source_type == SourceType.GPS
+    # No smoothed position yet
+    assert tracker.available is False
+    assert tracker.latitude is None
+
+    smoothed = replace(snapshot, smoothed=CollarPosition(51.5075, -0.1279, acc=6))
+    coordinator.data = build_device_data([smoothed])
+
+    assert tracker.available is True
+    assert tracker.latitude == 51.5075
+    assert tracker.longitude == -0.1279
+    assert tracker.location_accuracy == 6
+    assert tracker.device_info["name"] == "Fluffy"
+
+
+async def test_device_info_shared_by_collar_entities(hass, mock_device):
+    """Test the entities of a collar share one device_info."""
+    from custom_components.pettracer.binary_sensor import PetTracerAtHomeBinarySensor
+    from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
+
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+
+    tracker = PetTracerDeviceTracker(coordinator, mock_device)
+    sensor = PetTracerAtHomeBinarySensor(coordinator, mock_device)
+
+    assert tracker.device_info is sensor.device_info
+
+
 async def test_device_tracker_unavailable(hass, mock_device):
     """Test device tracker available property when device is removed from coordinator."""
     from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
 
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     tracker = PetTracerDeviceTracker(coordinator, mock_device)
     assert tracker.available is True
 
-    coordinator.data = {"devices": []}
+    coordinator.data = build_device_data([])
     assert tracker.available is False
 
 
@@ -314,7 +395,7 @@ async def test_device_tracker_partial_attributes(hass):
     device.lastPos.timeMeasure = None
     
     coordinator = MagicMock()
-    coordinator.data = {"devices": [device]}
+    coordinator.data = build_device_data([device])
     
     tracker = PetTracerDeviceTracker(coordinator, device)
     attributes = tracker.extra_state_attributes
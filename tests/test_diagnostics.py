@@ -0,0 +1,92 @@
+"""Tests for PetTracer diagnostics."""
+import time
+from datetime import timedelta
+from unittest.mock import MagicMock
+
+import pytest
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
+
+from custom_components.pettracer.breaker import CircuitBreaker
+from custom_components.pettracer.const import DOMAIN
+from custom_components.pettracer.diagnostics import (
+    async_get_config_entry_diagnostics,
+)
+from custom_components.pettracer.history import FixHistory
+from custom_components.pettracer.utils import build_device_data
+
+
+async def test_diagnostics(hass, mock_device):
+    """Test diagnostics redact credentials and report write counters."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+            CONF_TOKEN: "test-token",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    coordinator.write_stats = {"performed": 3, "skipped": 11}
+    # Counted over the last half hour
+    coordinator.write_stats_started = time.monotonic() - 1800
+    coordinator.setup_seconds = 0.05
+    coordinator.first_refresh_seconds = 1.5
+    coordinator.restored = True
+    coordinator.update_interval = timedelta(seconds=20)
+    coordinator.breaker = CircuitBreaker()
+    coordinator.locate_latency = {12345: 42.0}
+    coordinator.escalation.as_dict.return_value = {}
+    coordinator.position_filter.stats = {"accepted": 5, "suppressed": 7, "rejected": 1}
+    coordinator.history.fixes = {12345: FixHistory(100)}
+    coordinator.history.fixes[12345].append(1_700_000_000.0, 51.5, -0.1, 10)
+    coordinator.history.nbytes = 2800
+    coordinator.request_stats = {
+        "count": 4,
+        "coalesced": 2,
+        "total_seconds": 2.0,
+        "last_seconds": 0.25,
+    }
+    coordinator.scheduler.staleness = {12345: 7.5}
+    coordinator.scheduler.mean_staleness = {12345: 9.0}
+    hass.data[DOMAIN] = {entry.entry_id: coordinator}
+
+    result = await async_get_config_entry_diagnostics(hass, entry)
+
+    assert result["entry"]["data"] == {
+        CONF_USERNAME: "**REDACTED**",
+        CONF_PASSWORD: "**REDACTED**",
+        CONF_TOKEN: "**REDACTED**",
+    }
+    assert result["device_count"] == 1
+    assert result["setup_seconds"] == 0.05
+    assert result["first_refresh_seconds"] == 1.5
+    assert result["restored_from_snapshot"] is True
+    assert result["state_writes"] == {"performed": 3, "skipped": 11}
+    assert result["recorder_rows_per_hour"] == {
+        "without_filtering": pytest.approx(28, abs=0.1),
+        "with_filtering": pytest.approx(6, abs=0.1),
+    }
+    assert result["update_interval_seconds"] == 20
+    assert result["breaker"] == {
+        "state": "closed",
+        "consecutive_failures": 0,
+        "retry_at": None,
+        "stale": False,
+    }
+    assert result["requests"] == {
+        "count": 4,
+        "coalesced": 2,
+        "last_seconds": 0.25,
+        "mean_seconds": 0.5,
+    }
+    assert result["locate_latency_seconds"] == {12345: 42.0}
+    assert result["escalations"] == {}
+    assert result["position_filter"] == {"accepted": 5, "suppressed": 7, "rejected": 1}
+    assert result["position_history"] == {"fixes": {12345: 1}, "bytes": 2800}
+    assert result["staleness_seconds"] == {12345: {"last": 7.5, "mean": 9.0}}
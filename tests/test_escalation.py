@@ -0,0 +1,182 @@
+"""Tests for PetTracer leave-home escalation."""
+from datetime import UTC, datetime, timedelta
+
+import pytest
+
+from homeassistant.core import State
+
+from custom_components.pettracer.const import (
+    CONF_ESCALATE_ON_LEAVE,
+    CONF_ESCALATION_MODE,
+    CONF_ESCALATION_TIMEOUT,
+    MODE_FAST,
+    MODE_FAST_PLUS,
+    MODE_LIVE,
+    MODE_SLOW,
+)
+from custom_components.pettracer.escalation import EscalationPolicy, is_away
+
+NOW = datetime(2026, 1, 11, 10, 30, tzinfo=UTC)
+ENABLED = {CONF_ESCALATE_ON_LEAVE: True, CONF_ESCALATION_TIMEOUT: 30}
+
+
+def _zone(radius=100):
+    """Return a zone state centred on the mock device's home."""
+    return State(
+        "zone.home",
+        "0",
+        {"latitude": 51.5074, "longitude": -0.1278, "radius": radius},
+    )
+
+
+def test_is_away_uses_zone(mock_device):
+    """Test a zone decides by distance from its centre."""
+    assert is_away(mock_device, _zone()) is False
+
+    mock_device.lastPos.posLat = 51.5174  # about 1.1 km north
+    assert is_away(mock_device, _zone()) is True
+    assert is_away(mock_device, _zone(radius=2000)) is False
+
+
+def test_is_away_ignores_invalid_zone(mock_device):
+    """Test a zone without a usable centre never counts the collar as away."""
+    mock_device.lastPos.posLat = 51.5174
+
+    assert is_away(mock_device, State("zone.home", "0", {})) is False
+    assert (
+        is_away(
+            mock_device,
+            State("zone.home", "0", {"latitude": "north", "longitude": -0.1278}),
+        )
+        is False
+    )
+    assert (
+        is_away(
+            mock_device,
+            State(
+                "zone.home",
+                "0",
+                {"latitude": 51.5074, "longitude": -0.1278, "radius": None},
+            ),
+        )
+        is True
+    )
+
+
+def test_is_away_falls_back_to_home_flag(mock_device, mock_device_no_position):
+    """Test the collar's home flag is used without a zone or position."""
+    assert is_away(mock_device) is False
+    assert is_away(mock_device_no_position, _zone()) is True
+
+    mock_device.home = None
+    assert is_away(mock_device) is None
+
+
+def test_escalates_when_pet_leaves(mock_device):
+    """Test leaving home switches to the configured mode and back on return."""
+    mock_device.mode = MODE_SLOW
+    policy = EscalationPolicy()
+
+    assert policy.evaluate([mock_device], {12345: True}, ENABLED, NOW) == {
+        12345: MODE_LIVE
+    }
+    assert policy.active[12345].previous_mode == MODE_SLOW
+
+    # Nothing more to do while the pet stays out
+    mock_device.mode = MODE_LIVE
+    later = NOW + timedelta(minutes=5)
+    assert policy.evaluate([mock_device], {12345: True}, ENABLED, later) == {}
+
+    assert policy.evaluate([mock_device], {12345: False}, ENABLED, later) == {
+        12345: MODE_SLOW
+    }
+    assert policy.active == {}
+
+
+def test_escalation_uses_configured_mode(mock_device):
+    """Test the escalation mode option is honoured."""
+    mock_device.mode = MODE_SLOW
+    options = {**ENABLED, CONF_ESCALATION_MODE: "Fast"}
+
+    assert EscalationPolicy().evaluate(
+        [mock_device], {12345: True}, options, NOW
+    ) == {12345: MODE_FAST}
+
+
+def test_no_escalation_when_disabled_or_unknown(mock_device):
+    """Test nothing happens when off, at home or with an unknown location."""
+    mock_device.mode = MODE_SLOW
+    policy = EscalationPolicy()
+
+    assert policy.evaluate([mock_device], {12345: True}, {}, NOW) == {}
+    assert policy.evaluate([mock_device], {12345: None}, ENABLED, NOW) == {}
+    assert policy.evaluate([mock_device], {12345: False}, ENABLED, NOW) == {}
+    assert policy.active == {}
+
+
+@pytest.mark.parametrize("mode", [MODE_LIVE, MODE_FAST_PLUS, MODE_FAST])
+def test_no_escalation_when_already_fast_enough(mock_device, mode):
+    """Test a collar reporting at least as often as the target is left alone."""
+    mock_device.mode = mode
+    options = {**ENABLED, CONF_ESCALATION_MODE: "Fast"}
+
+    assert EscalationPolicy().evaluate(
+        [mock_device], {12345: True}, options, NOW
+    ) == {}
+
+
+def test_escalation_times_out(mock_device):
+    """Test a timed out escalation reverts and waits for the pet to return."""
+    mock_device.mode = MODE_SLOW
+    policy = EscalationPolicy()
+    policy.evaluate([mock_device], {12345: True}, ENABLED, NOW)
+    mock_device.mode = MODE_LIVE
+
+    later = NOW + timedelta(minutes=31)
+    assert policy.evaluate([mock_device], {12345: True}, ENABLED, later) == {
+        12345: MODE_SLOW
+    }
+
+    # Still out: not escalated again
+    mock_device.mode = MODE_SLOW
+    later += timedelta(minutes=1)
+    assert policy.evaluate([mock_device], {12345: True}, ENABLED, later) == {}
+
+    # Home and out again: escalated afresh
+    policy.evaluate([mock_device], {12345: False}, ENABLED, later)
+    assert policy.evaluate([mock_device], {12345: True}, ENABLED, later) == {
+        12345: MODE_LIVE
+    }
+
+
+def test_disabling_reverts_active_escalations(mock_device):
+    """Test turning the option off returns collars to their previous mode."""
+    mock_device.mode = MODE_SLOW
+    policy = EscalationPolicy()
+    policy.evaluate([mock_device], {12345: True}, ENABLED, NOW)
+
+    assert policy.evaluate([mock_device], {12345: True}, {}, NOW) == {
+        12345: MODE_SLOW
+    }
+
+
+def test_escalations_for_removed_collars_are_dropped(mock_device):
+    """Test collars no longer on the account are forgotten."""
+    mock_device.mode = MODE_SLOW
+    policy = EscalationPolicy()
+    policy.evaluate([mock_device], {12345: True}, ENABLED, NOW)
+
+    assert policy.evaluate([], {}, ENABLED, NOW) == {}
+    assert policy.active == {}
+
+
+def test_escalations_round_trip(mock_device):
+    """Test active escalations survive a save and load."""
+    mock_device.mode = MODE_SLOW
+    policy = EscalationPolicy()
+    policy.evaluate([mock_device], {12345: True}, ENABLED, NOW)
+
+    restored = EscalationPolicy()
+    restored.load(policy.as_dict())
+
+    assert restored.active == policy.active
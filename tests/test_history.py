@@ -0,0 +1,112 @@
+"""Tests for the PetTracer position history."""
+
+from datetime import UTC, datetime, timedelta
+
+from custom_components.pettracer.const import CONF_HISTORY_DEPTH, CONF_HISTORY_MEMORY
+from custom_components.pettracer.history import FIX_BYTES, FixHistory, PositionHistory
+from custom_components.pettracer.models import CollarSnapshot
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=UTC)
+
+
+def test_ring_buffer_overwrites_oldest():
+    """Test a full buffer drops its oldest fix for each new one."""
+    history = FixHistory(3)
+    assert history.last() is None
+
+    for second in range(5):
+        history.append(float(second), 51.0 + second, -0.1, 10)
+
+    assert len(history) == 3
+    assert [fix[0] for fix in history] == [2.0, 3.0, 4.0]
+    assert history.last() == (4.0, 55.0, -0.1, 10)
+    assert history.nbytes == 3 * FIX_BYTES
+
+
+def test_missing_accuracy_round_trips():
+    """Test a fix without an accuracy reads back without one."""
+    history = FixHistory(2)
+    history.append(1.0, 51.0, -0.1, None)
+
+    assert history.last() == (1.0, 51.0, -0.1, None)
+
+
+def test_resized_keeps_newest_fixes():
+    """Test shrinking a buffer keeps its newest fixes in order."""
+    history = FixHistory(4)
+    for second in range(6):
+        history.append(float(second), 51.0, -0.1, 10)
+
+    smaller = history.resized(2)
+    larger = history.resized(10)
+
+    assert [fix[0] for fix in smaller] == [4.0, 5.0]
+    assert [fix[0] for fix in larger] == [2.0, 3.0, 4.0, 5.0]
+    assert larger.capacity == 10
+
+
+def test_capacity_within_memory_cap():
+    """Test the memory cap is shared between collars."""
+    options = {CONF_HISTORY_DEPTH: 1000, CONF_HISTORY_MEMORY: 64}
+
+    assert PositionHistory.capacity(1, options) == 1000
+    assert PositionHistory.capacity(10, options) == 64 * 1024 // (FIX_BYTES * 10)
+    assert PositionHistory.capacity(10, {CONF_HISTORY_DEPTH: 0}) == 0
+
+
+def test_records_new_fixes_only(make_collar):
+    """Test a fix is recorded once, however many polls return it."""
+    history = PositionHistory()
+
+    history.record([make_collar(51.5, START)], {})
+    history.record([make_collar(51.5, START)], {})
+    history.record([make_collar(51.6, START + timedelta(minutes=1))], {})
+    # An older fix never goes behind a newer one
+    history.record([make_collar(51.4, START - timedelta(minutes=1))], {})
+
+    assert [fix[1] for fix in history.fixes[12345]] == [51.5, 51.6]
+    assert history.fixes[12345].last()[0] == (START + timedelta(minutes=1)).timestamp()
+
+
+def test_collars_without_position_and_removed_collars(make_collar):
+    """Test collars without a fix get an empty buffer and removed ones go."""
+    history = PositionHistory()
+    no_fix = CollarSnapshot(id=67890)
+
+    history.record([make_collar(51.5, START), no_fix], {})
+    assert len(history.fixes[12345]) == 1
+    assert len(history.fixes[67890]) == 0
+
+    history.record([no_fix], {})
+    assert list(history.fixes) == [67890]
+
+
+def test_depth_option_resizes_buffers(make_collar):
+    """Test changing the depth option resizes existing buffers."""
+    history = PositionHistory()
+    for minute in range(5):
+        history.record([make_collar(51.5, START + timedelta(minutes=minute))], {})
+
+    history.record([make_collar(51.5, START)], {CONF_HISTORY_DEPTH: 2})
+
+    assert history.fixes[12345].capacity == 2
+    assert len(history.fixes[12345]) == 2
+    assert history.nbytes == 2 * FIX_BYTES
+
+
+def test_round_trip_through_storage(make_collar):
+    """Test stored fixes load back, trimmed to the configured depth."""
+    history = PositionHistory()
+    for minute in range(5):
+        history.record(
+            [make_collar(51.5 + minute / 1000, START + timedelta(minutes=minute))], {}
+        )
+
+    stored = history.as_dict()
+    assert list(stored) == ["12345"]
+    assert stored["12345"]["lat"] == [51.5, 51.501, 51.502, 51.503, 51.504]
+
+    restored = PositionHistory()
+    restored.load(stored, {CONF_HISTORY_DEPTH: 3})
+
+    assert list(restored.fixes[12345]) == list(history.fixes[12345])[2:]
@@ -1,15 +1,56 @@
 """Tests for the PetTracer integration init."""
+import asyncio
+from datetime import UTC, datetime, timedelta
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import pytest
+from aiohttp import ClientConnectorError, ClientResponseError
 from pettracer import PetTracerError
-from pytest_homeassistant_custom_component.common import MockConfigEntry
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
 
 from homeassistant.config_entries import ConfigEntry, ConfigEntryState
-from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.const import CONF_PASSWORD, CONF_TOKEN, CONF_USERNAME
 from homeassistant.exceptions import ConfigEntryAuthFailed, ConfigEntryNotReady
+from homeassistant.util import dt as dt_util
 
-from custom_components.pettracer.const import DOMAIN
+from custom_components.pettracer.const import (
+    CONF_BACKGROUND_SETUP,
+    CONF_ESCALATE_ON_LEAVE,
+    CONF_RSSI_DEADBAND,
+    CONF_TOKEN_EXPIRES,
+    DOMAIN,
+    MAX_UPDATE_INTERVAL_SECONDS,
+    MODE_LIVE,
+    MODE_NORMAL,
+    MODE_SLOW,
+)
+from custom_components.pettracer.models import CollarSnapshot
+
+
+def _auth_error():
+    """Return a PetTracer error caused by a rejected token."""
+    cause = ClientResponseError(MagicMock(), (), status=401)
+    try:
+        raise PetTracerError("HTTP error while fetching CCS status") from cause
+    except PetTracerError as err:
+        return err
+
+
+def _outage_errors():
+    """Return PetTracer login errors caused by an outage, as the client wraps them."""
+    errors = []
+    for cause in (
+        ClientResponseError(MagicMock(), (), status=503),
+        ClientConnectorError(MagicMock(), OSError("Connection refused")),
+    ):
+        try:
+            raise PetTracerError(f"HTTP error during login: {cause}") from cause
+        except PetTracerError as err:
+            errors.append(err)
+    return errors
 
 
 async def test_setup_entry_success(hass, mock_pettracer_client_init, mock_device):
@@ -59,7 +100,7 @@ async def test_setup_entry_auth_failed(hass, mock_pettracer_client_init):
     )
     entry.add_to_hass(hass)
     
-    mock_pettracer_client_init.login.side_effect = PetTracerError("Invalid credentials")
+    mock_pettracer_client_init.login.side_effect = _auth_error()
     
     with patch("custom_components.pettracer.PetTracerClient") as mock_client:
         mock_client.return_value = mock_pettracer_client_init
@@ -70,6 +111,26 @@ async def test_setup_entry_auth_failed(hass, mock_pettracer_client_init):
             await async_setup_entry(hass, entry)
 
 
+@pytest.mark.parametrize("error", _outage_errors())
+async def test_setup_entry_login_outage(hass, mock_pettracer_client_init, error):
+    """Test an outage during login retries setup rather than asking to reauth."""
+    from custom_components.pettracer import async_setup_entry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    mock_pettracer_client_init.login.side_effect = error
+
+    with pytest.raises(ConfigEntryNotReady):
+        await async_setup_entry(hass, entry)
+
+
 async def test_setup_entry_not_ready(hass, mock_pettracer_client_init):
     """Test setup fails with unexpected error."""
     entry = MockConfigEntry(
@@ -132,6 +193,32 @@ async def test_unload_entry(hass, mock_pettracer_client_init, mock_device):
             assert entry.entry_id not in hass.data[DOMAIN]
 
 
+async def test_remove_entry_deletes_saved_data(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test removing an entry deletes its saved snapshot and position history."""
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    for key in (f"{DOMAIN}.test_entry", f"{DOMAIN}.test_entry.history"):
+        hass_storage[key] = {"version": 1, "key": key, "data": {}}
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+    await hass.config_entries.async_remove(entry.entry_id)
+    # Saves scheduled by the last poll do not write the data back
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(hours=1))
+    await hass.async_block_till_done()
+
+    assert f"{DOMAIN}.test_entry" not in hass_storage
+    assert f"{DOMAIN}.test_entry.history" not in hass_storage
+
+
 async def test_coordinator_update_success(hass, mock_pettracer_client_init, mock_device):
     """Test coordinator successfully fetches data."""
     from custom_components.pettracer import PetTracerDataUpdateCoordinator
@@ -215,6 +302,50 @@ async def test_coordinator_multiple_devices(hass, mock_pettracer_client_init, mo
     assert len(coordinator.data["devices"]) == 2
     assert coordinator.data["devices"][0].id == 12345
     assert coordinator.data["devices"][1].id == 12346
+    assert coordinator.data["devices_by_id"] == {
+        12345: CollarSnapshot.from_device(mock_device),
+        12346: CollarSnapshot.from_device(mock_device_no_position),
+    }
+
+
+async def test_coordinator_reuses_records_of_unchanged_collars(hass, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test entity records are rebuilt only for collars that changed."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.device_tracker import tracker_attributes
+    from custom_components.pettracer.utils import get_device_record
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device, mock_device_no_position]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    def _records():
+        data = coordinator.data
+        return [
+            get_device_record(data, "tracker_attributes", device, tracker_attributes)
+            for device in data["devices"]
+        ]
+
+    first, second = _records()
+
+    mock_device.bat = 3900
+    await coordinator.async_refresh()
+
+    changed, unchanged = _records()
+    assert changed is not first
+    assert changed["battery_voltage_mv"] == 3900
+    assert unchanged is second
+    await coordinator.async_shutdown()
 
 
 async def test_coordinator_empty_devices(hass, mock_pettracer_client_init):
@@ -243,3 +374,1527 @@ async def test_coordinator_empty_devices(hass, mock_pettracer_client_init):
     assert coordinator.data is not None
     assert "devices" in coordinator.data
     assert len(coordinator.data["devices"]) == 0
+
+
+async def test_coordinator_notifies_only_changed_fields(hass, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test only listeners whose collar fields changed are notified."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device, mock_device_no_position]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    battery = MagicMock()
+    position = MagicMock()
+    tracker = MagicMock()
+    other_collar = MagicMock()
+    global_listener = MagicMock()
+    coordinator.async_add_listener(battery, (12345, ("bat",)))
+    coordinator.async_add_listener(position, (12345, ("posLat", "posLong")))
+    coordinator.async_add_listener(tracker, (12345, ()))
+    coordinator.async_add_listener(other_collar, (12346, ("bat",)))
+    coordinator.async_add_listener(global_listener)
+
+    # Nothing changed: only the global listener runs
+    await coordinator.async_refresh()
+    battery.assert_not_called()
+    position.assert_not_called()
+    tracker.assert_not_called()
+    other_collar.assert_not_called()
+    assert global_listener.call_count == 1
+    assert coordinator.write_stats == {"performed": 0, "skipped": 4}
+
+    # Only the position moved on the first collar
+    mock_device.lastPos.posLat = 51.6
+    await coordinator.async_refresh()
+    battery.assert_not_called()
+    assert position.call_count == 1
+    assert tracker.call_count == 1
+    other_collar.assert_not_called()
+    assert coordinator.write_stats == {"performed": 2, "skipped": 6}
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_deadbands(hass, mock_pettracer_client_init, mock_device):
+    """Test small battery and signal changes don't notify on their own."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        options={CONF_RSSI_DEADBAND: 3},
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    battery = MagicMock()
+    signal = MagicMock()
+    coordinator.async_add_listener(battery, (12345, ("bat",)))
+    coordinator.async_add_listener(signal, (12345, ("rssi",)))
+
+    # Within the default 20 mV and the configured 3 dBm
+    mock_device.bat = 4085
+    mock_device.lastPos.rssi = -67
+    await coordinator.async_refresh()
+    battery.assert_not_called()
+    signal.assert_not_called()
+
+    # Drift is measured from the last value written
+    mock_device.bat = 4075
+    mock_device.lastPos.rssi = -68
+    await coordinator.async_refresh()
+    assert battery.call_count == 1
+    assert signal.call_count == 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_holds_jittery_positions(hass, mock_pettracer_client_init, mock_device):
+    """Test GPS jitter around a resting pet doesn't move the collar."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.device_tracker import PetTracerDeviceTracker
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    position = MagicMock()
+    coordinator.async_add_listener(position, (12345, ("posLat", "posLong")))
+    tracker = MagicMock()
+    coordinator.async_add_listener(
+        tracker, PetTracerDeviceTracker(coordinator, mock_device).coordinator_context
+    )
+
+    # A new fix 5 m away with 10 m accuracy
+    mock_device.lastPos.posLat = 51.50745
+    mock_device.lastPos.timeMeasure = "2026-01-11T10:31:00.000+0000"
+    await coordinator.async_refresh()
+    position.assert_not_called()
+    # The held fix's new position time alone does not write the tracker
+    tracker.assert_not_called()
+    assert coordinator.data["devices_by_id"][12345].lastPos.posLat == 51.5074
+
+    mock_device.lastPos.posLat = 51.51
+    await coordinator.async_refresh()
+    assert position.call_count == 1
+    assert coordinator.data["devices_by_id"][12345].lastPos.posLat == 51.51
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_measures_distance(hass, mock_pettracer_client_init, mock_device):
+    """Test new fixes add up distance and notify the motion sensors."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.utils import haversine_distance
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+    assert coordinator.data["devices_by_id"][12345].motion.distance_today == 0
+
+    motion = MagicMock()
+    coordinator.async_add_listener(motion, (12345, ("motion",)))
+
+    # 1.1 km in two minutes
+    mock_device.lastPos.posLat = 51.5174
+    mock_device.lastPos.timeMeasure = "2026-01-11T10:32:00.000+0000"
+    await coordinator.async_refresh()
+
+    assert motion.call_count == 1
+    distance = haversine_distance(51.5074, -0.1278, 51.5174, -0.1278)
+    collar = coordinator.data["devices_by_id"][12345]
+    assert collar.motion.distance_today == pytest.approx(distance)
+    assert collar.motion.speed == pytest.approx(distance / 120)
+
+    # The same fix again changes nothing
+    await coordinator.async_refresh()
+    assert motion.call_count == 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_notifies_all_after_failure(hass, mock_pettracer_client_init, mock_device):
+    """Test every listener is notified when availability changes."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    battery = MagicMock()
+    coordinator.async_add_listener(battery, (12345, ("bat",)))
+
+    # Once the last good data is too old to serve, entities become unavailable
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("API Error")
+    with patch("custom_components.pettracer.STALE_DATA_MAX_SECONDS", -1):
+        await coordinator.async_refresh()
+    assert coordinator.last_update_success is False
+    assert battery.call_count == 1
+
+    # Recovery with unchanged data still refreshes availability
+    mock_pettracer_client_init.get_all_devices.side_effect = None
+    await coordinator.async_refresh()
+    assert coordinator.last_update_success is True
+    assert battery.call_count == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_notifies_removed_device(hass, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test listeners of a collar that disappears are notified."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device, mock_device_no_position]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    tracker = MagicMock()
+    remove_listener = coordinator.async_add_listener(tracker, (12346, ()))
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    await coordinator.async_refresh()
+    assert tracker.call_count == 1
+
+    remove_listener()
+    await coordinator.async_refresh()
+    assert tracker.call_count == 1
+
+
+def test_poll_scheduler_uses_fastest_mode(mock_device, mock_device_no_position):
+    """Test the interval follows the fastest collar mode."""
+    from custom_components.pettracer import PollScheduler
+
+    scheduler = PollScheduler()
+    mock_device.mode = MODE_NORMAL
+    mock_device_no_position.mode = MODE_LIVE
+    devices = [mock_device, mock_device_no_position]
+
+    now = datetime(2026, 1, 11, 10, 31, 0, tzinfo=UTC)
+    scheduler.observe(devices, now)
+    assert scheduler.interval(devices, now) == timedelta(seconds=20)
+
+    mock_device_no_position.mode = MODE_SLOW
+    assert scheduler.interval(devices, now) == timedelta(seconds=180)
+
+
+def test_poll_scheduler_backs_off_for_idle_collars(mock_device):
+    """Test slow collars are polled no less often than the maximum interval."""
+    from custom_components.pettracer import PollScheduler
+
+    scheduler = PollScheduler()
+    mock_device.mode = MODE_SLOW
+    now = datetime(2026, 1, 11, 10, 31, 0, tzinfo=UTC)
+    scheduler.observe([mock_device], now)
+
+    assert scheduler.interval([mock_device], now) == timedelta(
+        seconds=MAX_UPDATE_INTERVAL_SECONDS
+    )
+
+
+def test_poll_scheduler_no_devices():
+    """Test the default interval is used without collars."""
+    from custom_components.pettracer import PollScheduler
+
+    now = datetime(2026, 1, 11, 10, 31, 0, tzinfo=UTC)
+    assert PollScheduler().interval([], now) == timedelta(seconds=60)
+
+
+def test_poll_scheduler_learns_cadence(mock_device):
+    """Test the observed lastContact cadence refines the mode period."""
+    from custom_components.pettracer import PollScheduler
+
+    scheduler = PollScheduler()
+    start = datetime(2026, 1, 11, 10, 0, 0, tzinfo=UTC)
+    for step in range(5):
+        mock_device.lastContact = start + timedelta(seconds=40 * step)
+        scheduler.observe([mock_device], mock_device.lastContact + timedelta(seconds=8))
+
+    # Fast mode nominally reports every 60 s but this collar reports every 40 s
+    assert scheduler.collar_interval(mock_device) == 40
+    assert scheduler.staleness[12345] == 8
+
+    # A long gap is bounded to twice the nominal period
+    mock_device.lastContact = start + timedelta(hours=5)
+    for _ in range(10):
+        scheduler.observe([mock_device], mock_device.lastContact)
+        mock_device.lastContact += timedelta(hours=1)
+    assert scheduler.collar_interval(mock_device) == 120
+
+
+def test_poll_scheduler_phase_locks_to_uploads(mock_device):
+    """Test polls are placed just after the collar's next expected upload."""
+    from custom_components.pettracer import PollScheduler
+    from custom_components.pettracer.const import UPLOAD_LAG_SECONDS
+
+    scheduler = PollScheduler()
+    start = datetime(2026, 1, 11, 10, 0, 0, tzinfo=UTC)
+    for step in range(4):
+        mock_device.lastContact = start + timedelta(seconds=40 * step)
+        scheduler.observe([mock_device], mock_device.lastContact)
+    last_upload = mock_device.lastContact
+
+    # 10 s after the last upload, the next one is due in 30 s
+    now = last_upload + timedelta(seconds=10)
+    assert scheduler.interval([mock_device], now) == timedelta(
+        seconds=30 + UPLOAD_LAG_SECONDS
+    )
+
+    # Several missed uploads later we still target the next expected slot
+    now = last_upload + timedelta(seconds=130)
+    assert scheduler.interval([mock_device], now) == timedelta(
+        seconds=30 + UPLOAD_LAG_SECONDS
+    )
+
+
+def test_poll_scheduler_naive_last_contact(mock_device):
+    """Test contact times without a timezone are treated as UTC."""
+    from custom_components.pettracer import PollScheduler
+
+    scheduler = PollScheduler()
+    mock_device.lastContact = datetime(2026, 1, 11, 10, 0, 0)
+    scheduler.observe([mock_device], datetime(2026, 1, 11, 10, 0, 5, tzinfo=UTC))
+    mock_device.lastContact = datetime(2026, 1, 11, 10, 1, 0)
+    scheduler.observe([mock_device], datetime(2026, 1, 11, 10, 1, 12, tzinfo=UTC))
+
+    assert scheduler.staleness[12345] == 12
+    assert scheduler.mean_staleness[12345] == 12
+
+
+def test_poll_scheduler_forgets_removed_collars(mock_device):
+    """Test cadence state is dropped for collars that disappear."""
+    from custom_components.pettracer import PollScheduler
+
+    scheduler = PollScheduler()
+    for step in range(3):
+        mock_device.lastContact = datetime(2026, 1, 11, 10, 0, 0, tzinfo=UTC) + timedelta(
+            seconds=40 * step
+        )
+        scheduler.observe([mock_device], mock_device.lastContact)
+    scheduler.observe([], mock_device.lastContact)
+
+    assert scheduler.collar_interval(mock_device) == 60
+    assert 12345 not in scheduler.staleness
+
+
+async def test_coordinator_adapts_update_interval(hass, mock_pettracer_client_init, mock_device):
+    """Test the coordinator reschedules polling from collar modes."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+    assert coordinator.update_interval == timedelta(seconds=60)
+
+    mock_device.mode = MODE_LIVE
+    await coordinator.async_refresh()
+    assert coordinator.update_interval == timedelta(seconds=20)
+
+
+async def test_setup_entry_restores_snapshot(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test setup hydrates from the stored snapshot and refreshes in the background."""
+    from custom_components.pettracer import async_setup_entry
+    from custom_components.pettracer.utils import device_to_dict
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    hass_storage[f"{DOMAIN}.test_entry"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry",
+        "data": {"devices": [device_to_dict(mock_device)]},
+    }
+    mock_pettracer_client_init.is_authenticated = False
+    release = asyncio.Event()
+
+    async def delayed_fetch():
+        await release.wait()
+        return [mock_device]
+
+    mock_pettracer_client_init.get_all_devices.side_effect = delayed_fetch
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ) as mock_forward:
+        assert await async_setup_entry(hass, entry) is True
+
+        coordinator = hass.data[DOMAIN][entry.entry_id]
+        assert coordinator.restored is True
+        assert coordinator.setup_seconds is not None
+        mock_forward.assert_called_once()
+
+        restored = coordinator.data["devices_by_id"][12345]
+        assert isinstance(restored, CollarSnapshot)
+        assert restored.details.name == "Fluffy"
+        assert restored.lastPos.posLat == 51.5074
+
+        release.set()
+        await hass.async_block_till_done()
+
+    # Login and the first fetch happen after setup has returned
+    mock_pettracer_client_init.login.assert_awaited_once_with(
+        "test@example.com", "test_password"
+    )
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+    await coordinator.async_shutdown()
+
+
+async def test_setup_entry_ignores_unreadable_snapshot(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test a corrupt snapshot falls back to a blocking first refresh."""
+    from custom_components.pettracer import async_setup_entry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    hass_storage[f"{DOMAIN}.test_entry"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry",
+        "data": {"devices": [{"bat": 4100}]},
+    }
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        assert await async_setup_entry(hass, entry) is True
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.restored is False
+    mock_pettracer_client_init.login.assert_awaited_once()
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+
+
+async def test_coordinator_saves_snapshot(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test each successful refresh persists the device snapshot."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.const import (
+        HISTORY_SAVE_DELAY_SECONDS,
+        STORAGE_SAVE_DELAY_SECONDS,
+    )
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+    assert f"{DOMAIN}.test_entry" not in hass_storage
+
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=STORAGE_SAVE_DELAY_SECONDS + 1)
+    )
+    await hass.async_block_till_done()
+
+    stored = hass_storage[f"{DOMAIN}.test_entry"]["data"]["devices"]
+    assert stored[0]["id"] == 12345
+    assert stored[0]["details"] == {"name": "Fluffy"}
+    assert "history" not in hass_storage[f"{DOMAIN}.test_entry"]["data"]
+    odometer = hass_storage[f"{DOMAIN}.test_entry"]["data"]["odometer"]
+    assert odometer["12345"]["distance_today"] == 0
+
+    # The history is saved on its own, and later polls do not postpone it
+    assert f"{DOMAIN}.test_entry.history" not in hass_storage
+    await coordinator.async_refresh()
+    async_fire_time_changed(
+        hass, dt_util.utcnow() + timedelta(seconds=HISTORY_SAVE_DELAY_SECONDS + 1)
+    )
+    await hass.async_block_till_done()
+
+    history = hass_storage[f"{DOMAIN}.test_entry.history"]["data"]
+    assert history["12345"]["lat"] == [51.5074]
+
+
+async def test_coordinator_restores_position_history(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test recent fixes saved by a previous run are kept and extended."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    earlier = datetime(2026, 1, 11, 10, 29, tzinfo=UTC).timestamp()
+    hass_storage[f"{DOMAIN}.test_entry.history"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry.history",
+        "data": {
+            "12345": {
+                "time": [earlier],
+                "lat": [51.5],
+                "lon": [-0.1278],
+                "acc": [12],
+            }
+        },
+    }
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_restore_snapshot()
+    await coordinator.async_config_entry_first_refresh()
+
+    assert [fix[1] for fix in coordinator.history.fixes[12345]] == [51.5, 51.5074]
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_ages_restored_snapshot(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test a restored snapshot is served stale only until it is too old."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.utils import device_to_dict
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("API Error")
+
+    for age, available in ((timedelta(minutes=5), True), (timedelta(hours=2), False)):
+        hass_storage[f"{DOMAIN}.test_entry"] = {
+            "version": 1,
+            "key": f"{DOMAIN}.test_entry",
+            "data": {
+                "devices": [device_to_dict(mock_device)],
+                "fetched": (dt_util.utcnow() - age).isoformat(),
+            },
+        }
+        coordinator = PetTracerDataUpdateCoordinator(
+            hass, mock_pettracer_client_init, entry
+        )
+        await coordinator.async_restore_snapshot()
+        await coordinator.async_refresh()
+
+        assert coordinator.last_update_success is available
+        await coordinator.async_shutdown()
+
+
+async def test_coordinator_restores_motion(hass, hass_storage, mock_pettracer_client_init, mock_device):
+    """Test restored collars show their saved distance before the first poll."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.odometer import _periods
+    from custom_components.pettracer.utils import device_to_dict
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+
+    day, week = _periods(dt_util.utcnow())
+    hass_storage[f"{DOMAIN}.test_entry"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry",
+        "data": {
+            "devices": [device_to_dict(mock_device)],
+            "odometer": {
+                "12345": {
+                    "time": 0.0,
+                    "lat": 51.5074,
+                    "lon": -0.1278,
+                    "day": day,
+                    "week": week,
+                    "distance_today": 1500.0,
+                    "distance_week": 4000.0,
+                    "speed": 0.0,
+                    "max_speed_today": 2.0,
+                }
+            },
+        },
+    }
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    assert await coordinator.async_restore_snapshot() is True
+
+    motion = coordinator.data["devices_by_id"][12345].motion
+    assert motion.distance_today == 1500.0
+    assert motion.distance_week == 4000.0
+
+
+async def test_coordinator_resets_distance_at_midnight(hass, mock_pettracer_client_init, mock_device):
+    """Test the daily distance resets at midnight while polls are failing."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+    motion = MagicMock()
+    coordinator.async_add_listener(motion, (12345, ("motion",)))
+
+    mock_device.lastPos.posLat = 51.51
+    mock_device.lastPos.timeMeasure = "2026-01-11T10:40:00.000+0000"
+    await coordinator.async_refresh()
+    assert coordinator.data["devices_by_id"][12345].motion.distance_today > 0
+
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("down")
+    await coordinator.async_refresh()
+    assert coordinator.data["stale"] is True
+    motion.reset_mock()
+
+    async_fire_time_changed(hass, dt_util.start_of_local_day() + timedelta(days=1))
+    await hass.async_block_till_done()
+
+    assert motion.call_count == 1
+    assert coordinator.data["devices_by_id"][12345].motion.distance_today == 0
+    assert coordinator.last_update_success is True
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_ignores_unreadable_position_history(hass, hass_storage, mock_pettracer_client_init):
+    """Test a corrupt history or escalation is dropped without failing setup."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+
+    hass_storage[f"{DOMAIN}.test_entry.history"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry.history",
+        "data": {"12345": {"time": [1.0]}},
+    }
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    assert await coordinator.async_restore_snapshot() is False
+    assert coordinator.history.fixes == {}
+
+    hass_storage[f"{DOMAIN}.test_entry"] = {
+        "version": 1,
+        "key": f"{DOMAIN}.test_entry",
+        "data": {
+            "escalations": {"12345": {"started": "2026-01-11T10:30:00+00:00"}},
+        },
+    }
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    assert await coordinator.async_restore_snapshot() is False
+    assert coordinator.escalation.active == {}
+
+
+async def test_setup_entry_reuses_stored_token(hass, mock_pettracer_client_init, mock_device):
+    """Test setup skips login when the entry holds a valid token."""
+    from custom_components.pettracer import async_setup_entry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+            CONF_TOKEN: "stored-token",
+            CONF_TOKEN_EXPIRES: (dt_util.utcnow() + timedelta(days=7)).isoformat(),
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        assert await async_setup_entry(hass, entry) is True
+
+    mock_pettracer_client_init.login.assert_not_awaited()
+    assert mock_pettracer_client_init._token == "stored-token"
+    assert hass.data[DOMAIN][entry.entry_id].data["devices"] == [CollarSnapshot.from_device(mock_device)]
+
+
+async def test_setup_entry_stores_new_token(hass, mock_pettracer_client_init, mock_device):
+    """Test setup logs in when the stored token expired and keeps the new one."""
+    from custom_components.pettracer import async_setup_entry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+            CONF_TOKEN: "expired-token",
+            CONF_TOKEN_EXPIRES: "2020-01-01T00:00:00",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    mock_pettracer_client_init.token_expires = datetime(2030, 1, 1)
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        assert await async_setup_entry(hass, entry) is True
+
+    mock_pettracer_client_init.login.assert_awaited_once()
+    assert entry.data[CONF_TOKEN] == "test-token"
+    assert entry.data[CONF_TOKEN_EXPIRES] == "2030-01-01T00:00:00"
+
+
+async def test_coordinator_relogin_on_rejected_token(hass, mock_pettracer_client_init, mock_device):
+    """Test a rejected token triggers one transparent login and retry."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+            CONF_TOKEN: "stale-token",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.token = "fresh-token"
+    mock_pettracer_client_init.token_expires = None
+    mock_pettracer_client_init.get_all_devices.side_effect = [
+        _auth_error(),
+        [mock_device],
+    ]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    mock_pettracer_client_init.login.assert_awaited_once_with(
+        "test@example.com", "test_password"
+    )
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+    assert entry.data[CONF_TOKEN] == "fresh-token"
+
+
+async def test_coordinator_relogin_failure(hass, mock_pettracer_client_init):
+    """Test a rejected token with bad credentials requests reauthentication."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.side_effect = _auth_error()
+    mock_pettracer_client_init.login.side_effect = _auth_error()
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    with pytest.raises(ConfigEntryAuthFailed):
+        await coordinator.async_config_entry_first_refresh()
+
+
+async def test_coordinator_relogin_outage(hass, mock_pettracer_client_init, mock_device):
+    """Test an outage while logging in again backs off instead of reauthenticating."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    mock_pettracer_client_init.get_all_devices.side_effect = _auth_error()
+    mock_pettracer_client_init.login.side_effect = _outage_errors()
+    for failures in (1, 2):
+        await coordinator.async_refresh()
+        assert coordinator.breaker.failures == failures
+
+    # The last good data is served and no reauthentication is started
+    assert coordinator.last_update_success is True
+    assert coordinator.data["stale"] is True
+    assert hass.config_entries.flow.async_progress() == []
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_no_relogin_on_other_errors(hass, mock_pettracer_client_init):
+    """Test ordinary API errors do not cost a login."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("API Error")
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    with pytest.raises(ConfigEntryNotReady):
+        await coordinator.async_config_entry_first_refresh()
+
+    mock_pettracer_client_init.login.assert_not_awaited()
+
+
+async def test_coordinator_reauthenticate(hass, mock_pettracer_client_init, mock_device):
+    """Test new credentials are picked up by the live client."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "new_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    mock_pettracer_client_init._token = "rejected-token"
+
+    await coordinator.async_reauthenticate()
+    assert mock_pettracer_client_init._token is None
+
+    # The reauth flow stored a fresh token with the new password
+    hass.config_entries.async_update_entry(
+        entry, data={**entry.data, CONF_TOKEN: "fresh-token"}
+    )
+    await coordinator.async_reauthenticate()
+    assert mock_pettracer_client_init._token == "fresh-token"
+
+    await hass.async_block_till_done()
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+    await coordinator.async_shutdown()
+
+
+async def test_setup_entry_uses_validated_client(hass, mock_pettracer_client_init, mock_device):
+    """Test setup adopts the client logged in by the config flow."""
+    from custom_components.pettracer import async_setup_entry
+    from custom_components.pettracer.const import DATA_VALIDATED_CLIENTS
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+            CONF_TOKEN: "flow-token",
+        },
+        entry_id="test_entry",
+        unique_id="test@example.com",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    validated_client = MagicMock()
+    validated_client.login = AsyncMock()
+    validated_client.is_authenticated = True
+    validated_client.get_all_devices = AsyncMock(return_value=[mock_device])
+    hass.data[DATA_VALIDATED_CLIENTS] = {"test@example.com": validated_client}
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        assert await async_setup_entry(hass, entry) is True
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    assert coordinator.client is validated_client
+    assert hass.data[DATA_VALIDATED_CLIENTS] == {}
+    validated_client.login.assert_not_awaited()
+    mock_pettracer_client_init.get_all_devices.assert_not_awaited()
+
+
+async def test_unload_entry_closes_client(hass, mock_pettracer_client_init, mock_device):
+    """Test unloading releases the client's HTTP session."""
+    from custom_components.pettracer import async_setup_entry, async_unload_entry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        assert await async_setup_entry(hass, entry) is True
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_unload_platforms",
+        return_value=True,
+    ):
+        assert await async_unload_entry(hass, entry) is True
+
+    mock_pettracer_client_init.close.assert_awaited_once()
+
+
+async def test_setup_entry_failure_closes_client(hass, mock_pettracer_client_init):
+    """Test a failed setup does not leave the client's session open."""
+    from custom_components.pettracer import async_setup_entry
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("API Error")
+
+    with pytest.raises(ConfigEntryNotReady):
+        await async_setup_entry(hass, entry)
+
+    mock_pettracer_client_init.close.assert_awaited_once()
+
+
+async def test_setup_entries_share_http_session(hass, mock_pettracer_client_init, mock_device):
+    """Test every account's client uses Home Assistant's pooled session."""
+    from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+    from custom_components.pettracer import async_setup_entry
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    with patch(
+        "custom_components.pettracer.PetTracerClient",
+        return_value=mock_pettracer_client_init,
+    ) as mock_client, patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        for index in range(2):
+            entry = MockConfigEntry(
+                domain=DOMAIN,
+                data={
+                    CONF_USERNAME: f"user{index}@example.com",
+                    CONF_PASSWORD: "test_password",
+                },
+                entry_id=f"test_entry_{index}",
+            )
+            entry.add_to_hass(hass)
+            entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+            assert await async_setup_entry(hass, entry) is True
+
+    shared_session = async_get_clientsession(hass)
+    assert [call.kwargs["session"] for call in mock_client.call_args_list] == [
+        shared_session,
+        shared_session,
+    ]
+
+
+async def test_coordinator_times_requests(hass, mock_pettracer_client_init, mock_device):
+    """Test each device request is timed, including failed ones."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("API Error")
+    await coordinator.async_refresh()
+
+    assert coordinator.request_stats["count"] == 2
+    assert coordinator.request_stats["last_seconds"] >= 0
+    assert coordinator.request_stats["total_seconds"] >= (
+        coordinator.request_stats["last_seconds"]
+    )
+
+
+async def test_coordinator_serves_stale_data_during_outage(hass, mock_pettracer_client_init, mock_device):
+    """Test an outage keeps the last data, backs off and probes for recovery."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.const import BREAKER_CLOSED, BREAKER_OPEN
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    coordinator.breaker._rand = lambda: 0.0
+    await coordinator.async_config_entry_first_refresh()
+    assert coordinator.data["stale"] is False
+
+    battery = MagicMock()
+    coordinator.async_add_listener(battery, (12345, ("bat",)))
+
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("API Error")
+    intervals = []
+    for _ in range(3):
+        await coordinator.async_refresh()
+        intervals.append(coordinator.update_interval.total_seconds())
+
+    # Entities keep the last data and are not rewritten
+    assert coordinator.last_update_success is True
+    assert coordinator.data["stale"] is True
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+    assert battery.call_count == 0
+    assert intervals == [30, 60, 120]
+    assert coordinator.breaker.state == BREAKER_OPEN
+
+    # An open breaker answers manual refreshes without calling the API
+    calls = mock_pettracer_client_init.get_all_devices.await_count
+    await coordinator.async_refresh()
+    assert mock_pettracer_client_init.get_all_devices.await_count == calls
+
+    # Once the delay has passed, a probe goes through and closes the breaker
+    mock_pettracer_client_init.get_all_devices.side_effect = None
+    coordinator.breaker.retry_at = dt_util.utcnow() - timedelta(seconds=1)
+    await coordinator.async_refresh()
+    assert coordinator.breaker.state == BREAKER_CLOSED
+    assert coordinator.data["stale"] is False
+    assert mock_pettracer_client_init.get_all_devices.await_count == calls + 1
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_backs_off_on_timeouts(hass, mock_pettracer_client_init, mock_device):
+    """Test timeouts the client does not wrap go through the breaker too."""
+    from aiohttp import ClientConnectionError
+
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+    from custom_components.pettracer.const import BREAKER_OPEN
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    coordinator.breaker._rand = lambda: 0.0
+    await coordinator.async_config_entry_first_refresh()
+
+    mock_pettracer_client_init.get_all_devices.side_effect = TimeoutError()
+    intervals = []
+    for _ in range(2):
+        await coordinator.async_refresh()
+        intervals.append(coordinator.update_interval.total_seconds())
+    mock_pettracer_client_init.get_all_devices.side_effect = ClientConnectionError()
+    await coordinator.async_refresh()
+    intervals.append(coordinator.update_interval.total_seconds())
+
+    assert coordinator.breaker.failures == 3
+    assert coordinator.breaker.state == BREAKER_OPEN
+    assert intervals == [30, 60, 120]
+    assert coordinator.last_update_success is True
+    assert coordinator.data["stale"] is True
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_coalesces_concurrent_refreshes(hass, mock_pettracer_client_init, mock_device):
+    """Test refreshes during a slow poll join it instead of calling the API."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    battery = MagicMock()
+    coordinator.async_add_listener(battery, (12345, ("bat",)))
+
+    release = asyncio.Event()
+
+    async def slow_fetch():
+        await release.wait()
+        return [mock_device]
+
+    mock_device.bat = 3900
+    mock_pettracer_client_init.get_all_devices.side_effect = slow_fetch
+    refreshes = [
+        hass.async_create_task(coordinator.async_refresh()) for _ in range(3)
+    ]
+    await asyncio.sleep(0)
+    release.set()
+    await asyncio.gather(*refreshes)
+
+    assert mock_pettracer_client_init.get_all_devices.await_count == 2
+    assert coordinator.request_stats["coalesced"] == 2
+    # Every refresh hands on the poll's changes, whichever wakes first
+    assert battery.call_count == 3
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+
+    # Once the poll has finished, the next refresh fetches again
+    mock_pettracer_client_init.get_all_devices.side_effect = None
+    await coordinator.async_refresh()
+    assert mock_pettracer_client_init.get_all_devices.await_count == 3
+
+    await coordinator.async_shutdown()
+
+
+async def test_coordinator_escalates_collar_leaving_home(hass, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test a pet leaving home speeds up its collar and polling."""
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        options={CONF_ESCALATE_ON_LEAVE: True},
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_device.mode = MODE_SLOW
+    mock_device_no_position.mode = MODE_SLOW
+    mock_device_no_position.home = True
+    mock_pettracer_client_init.get_all_devices.return_value = [
+        mock_device,
+        mock_device_no_position,
+    ]
+    set_mode = AsyncMock()
+    mock_pettracer_client_init.get_device.return_value.set_tracking_mode = set_mode
+
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+    assert coordinator.update_interval == timedelta(seconds=MAX_UPDATE_INTERVAL_SECONDS)
+
+    mock_device.home = False
+    await coordinator.async_refresh()
+
+    assert coordinator.mode_changes.requested_mode(12345) == MODE_LIVE
+    assert coordinator.mode_changes.requested_mode(12346) is None
+    assert coordinator.update_interval == timedelta(seconds=20)
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await hass.async_block_till_done()
+    set_mode.assert_awaited_once_with(MODE_LIVE)
+    mock_pettracer_client_init.get_device.assert_called_once_with(12345)
+
+    # Back home: the collar returns to its previous mode
+    mock_device.mode = MODE_LIVE
+    mock_device.home = True
+    await coordinator.async_refresh()
+    assert coordinator.mode_changes.requested_mode(12345) == MODE_SLOW
+    assert coordinator.escalation.active == {}
+
+    await coordinator.async_shutdown()
+
+
+async def test_new_collars_get_entities_without_reload(hass, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test a collar added to the account gets entities on the next poll."""
+    from custom_components.pettracer import async_setup_entry
+    from custom_components.pettracer.select import async_setup_entry as select_setup
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        await async_setup_entry(hass, entry)
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+
+    added = []
+
+    def mock_add_entities(new_entities, update_before_add=False):
+        added.append([entity.unique_id for entity in new_entities])
+
+    await select_setup(hass, entry, mock_add_entities)
+    assert added == [["pettracer_12345_mode_select"]]
+
+    mock_pettracer_client_init.get_all_devices.return_value = [
+        mock_device,
+        mock_device_no_position,
+    ]
+    await coordinator.async_refresh()
+    assert added[1:] == [["pettracer_12346_mode_select"]]
+
+    # Existing collars are not added again
+    await coordinator.async_refresh()
+    assert len(added) == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_removed_collars_leave_device_registry(hass, mock_pettracer_client_init, mock_device):
+    """Test collars no longer on the account are removed from the registry."""
+    from homeassistant.helpers import device_registry as dr
+
+    from custom_components.pettracer import PetTracerDataUpdateCoordinator
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    device_registry = dr.async_get(hass)
+    for identifier in (12345, 12346, entry.entry_id):
+        device_registry.async_get_or_create(
+            config_entry_id=entry.entry_id, identifiers={(DOMAIN, identifier)}
+        )
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    coordinator = PetTracerDataUpdateCoordinator(hass, mock_pettracer_client_init, entry)
+    await coordinator.async_config_entry_first_refresh()
+
+    assert device_registry.async_get_device(identifiers={(DOMAIN, 12345)})
+    assert device_registry.async_get_device(identifiers={(DOMAIN, entry.entry_id)})
+    assert device_registry.async_get_device(identifiers={(DOMAIN, 12346)}) is None
+
+    # An empty device list does not wipe the account
+    mock_pettracer_client_init.get_all_devices.return_value = []
+    await coordinator.async_refresh()
+    assert device_registry.async_get_device(identifiers={(DOMAIN, 12345)})
+
+    await coordinator.async_shutdown()
+
+
+async def test_setup_entry_in_background(hass, mock_pettracer_client_init, mock_device):
+    """Test background setup returns before the cloud has answered."""
+    from custom_components.pettracer import async_setup_entry
+    from custom_components.pettracer.select import async_setup_entry as select_setup
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        options={CONF_BACKGROUND_SETUP: True},
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.is_authenticated = False
+    release = asyncio.Event()
+
+    async def delayed_fetch():
+        await release.wait()
+        return [mock_device]
+
+    mock_pettracer_client_init.get_all_devices.side_effect = delayed_fetch
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ) as mock_forward:
+        assert await async_setup_entry(hass, entry) is True
+
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    mock_forward.assert_called_once()
+    assert coordinator.data["devices"] == []
+    assert coordinator.setup_seconds is not None
+    assert coordinator.first_refresh_seconds is None
+
+    added = []
+
+    def mock_add_entities(new_entities, update_before_add=False):
+        added.extend(new_entities)
+
+    await select_setup(hass, entry, mock_add_entities)
+    assert added == []
+
+    release.set()
+    await hass.async_block_till_done()
+
+    mock_pettracer_client_init.login.assert_awaited_once_with(
+        "test@example.com", "test_password"
+    )
+    assert coordinator.data["devices"] == [CollarSnapshot.from_device(mock_device)]
+    assert coordinator.first_refresh_seconds >= coordinator.setup_seconds
+    assert [entity.unique_id for entity in added] == ["pettracer_12345_mode_select"]
+
+    await coordinator.async_shutdown()
+
+
+async def test_entities_restore_state_until_first_poll(hass, mock_pettracer_client_init, mock_device):
+    """Test known collars show their last state while the cloud is queried."""
+    from pytest_homeassistant_custom_component.common import (
+        mock_restore_cache_with_extra_data,
+    )
+
+    from homeassistant.core import State
+    from homeassistant.helpers import device_registry as dr, entity_registry as er
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        options={CONF_BACKGROUND_SETUP: True},
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+
+    dr.async_get(hass).async_get_or_create(
+        config_entry_id=entry.entry_id,
+        identifiers={(DOMAIN, 12345)},
+        name="Fluffy",
+    )
+    entity_registry = er.async_get(hass)
+    for domain, unique_id, object_id in (
+        ("device_tracker", "pettracer_12345", "fluffy"),
+        ("sensor", "pettracer_12345_battery_level", "fluffy_battery_level"),
+        ("binary_sensor", "pettracer_12345_at_home", "fluffy_at_home"),
+    ):
+        entity_registry.async_get_or_create(
+            domain,
+            DOMAIN,
+            unique_id,
+            suggested_object_id=object_id,
+            config_entry=entry,
+        )
+
+    mock_restore_cache_with_extra_data(
+        hass,
+        [
+            (
+                State(
+                    "device_tracker.fluffy",
+                    "not_home",
+                    {
+                        "latitude": 51.5,
+                        "longitude": -0.12,
+                        "gps_accuracy": 12,
+                        "battery_level": 80,
+                        "mode": MODE_SLOW,
+                    },
+                ),
+                {},
+            ),
+            (State("binary_sensor.fluffy_at_home", "off"), {}),
+            (
+                State("sensor.fluffy_battery_level", "80"),
+                {"native_value": 80, "native_unit_of_measurement": "%"},
+            ),
+        ],
+    )
+
+    # The cloud is unreachable at startup
+    mock_pettracer_client_init.get_all_devices.side_effect = PetTracerError("down")
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    tracker = hass.states.get("device_tracker.fluffy")
+    assert tracker.attributes["latitude"] == 51.5
+    assert tracker.attributes["battery_level"] == 80
+    assert tracker.attributes["mode"] == MODE_SLOW
+    assert tracker.attributes["restored"] is True
+    battery = hass.states.get("sensor.fluffy_battery_level")
+    assert battery.state == "80"
+    assert battery.attributes["restored"] is True
+    at_home = hass.states.get("binary_sensor.fluffy_at_home")
+    assert at_home.state == "off"
+    assert at_home.attributes["restored"] is True
+
+    mock_device.lastContact = datetime(2026, 1, 11, 10, 30, tzinfo=UTC)
+    mock_pettracer_client_init.get_all_devices.side_effect = None
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+    await hass.data[DOMAIN][entry.entry_id].async_refresh()
+    await hass.async_block_till_done()
+
+    tracker = hass.states.get("device_tracker.fluffy")
+    assert tracker.attributes["latitude"] == 51.5074
+    assert "restored" not in tracker.attributes
+    battery = hass.states.get("sensor.fluffy_battery_level")
+    assert battery.state == "83"
+    assert "restored" not in battery.attributes
+    at_home = hass.states.get("binary_sensor.fluffy_at_home")
+    assert at_home.state == "on"
+    assert "restored" not in at_home.attributes
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
@@ -0,0 +1,62 @@
+"""Tests for PetTracer collar snapshots."""
+
+from dataclasses import FrozenInstanceError
+
+import pytest
+from pettracer import Device
+
+from custom_components.pettracer.models import CollarSnapshot
+from custom_components.pettracer.utils import device_to_dict
+
+
+def test_snapshot_copies_used_fields(mock_device):
+    """Test a snapshot holds the fields entities read."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+
+    assert snapshot.id == 12345
+    assert snapshot.bat == 4100
+    assert snapshot.modeSet == 1
+    assert snapshot.details.name == "Fluffy"
+    assert snapshot.lastPos.posLat == 51.5074
+    assert snapshot.lastPos.timeMeasure == "2026-01-11T10:30:00.000+0000"
+
+
+def test_snapshot_without_optional_data(mock_device_no_position):
+    """Test collars without details or a position are copied."""
+    mock_device_no_position.details = None
+
+    snapshot = CollarSnapshot.from_device(mock_device_no_position)
+
+    assert snapshot.details is None
+    assert snapshot.lastPos is None
+
+
+def test_snapshot_is_compact_and_immutable(mock_device):
+    """Test snapshots have no instance dict and cannot be changed."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+
+    assert not hasattr(snapshot, "__dict__")
+    with pytest.raises(FrozenInstanceError):
+        snapshot.bat = 0
+
+
+def test_snapshot_round_trips_through_storage(mock_device):
+    """Test a stored snapshot parses back to an equal snapshot."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+
+    restored = CollarSnapshot.from_device(Device.from_dict(device_to_dict(snapshot)))
+
+    assert restored.id == snapshot.id
+    assert restored.modeSet == snapshot.modeSet
+    assert restored.details == snapshot.details
+    assert restored.lastPos.posLat == snapshot.lastPos.posLat
+
+
+def test_identity_keeps_only_device_info_fields(mock_device):
+    """Test the identity drops the live readings."""
+    identity = CollarSnapshot.from_device(mock_device).identity()
+
+    assert identity == CollarSnapshot(id=12345, sw=656393, details=identity.details)
+    assert identity.details.name == "Fluffy"
+    assert identity.bat is None
+    assert identity.lastPos is None
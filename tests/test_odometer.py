@@ -0,0 +1,157 @@
+"""Tests for PetTracer distance travelled and speed."""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.pettracer.models import CollarSnapshot
+from custom_components.pettracer.odometer import Odometer
+from custom_components.pettracer.utils import haversine_distance
+
+LAT, LON = 51.5074, -0.1278
+# About 111 m of latitude
+STEP = 0.001
+
+
+@pytest.fixture
+def start():
+    """Return a Sunday morning in the local time zone."""
+    return datetime(2026, 1, 11, 10, 0, tzinfo=dt_util.get_default_time_zone())
+
+
+def test_first_fix_starts_at_zero(make_collar, start):
+    """Test a collar's first fix has travelled nowhere yet."""
+    odometer = Odometer()
+
+    (collar,) = odometer.apply([make_collar(LAT, start)], start)
+
+    assert collar.motion.distance_today == 0
+    assert collar.motion.distance_week == 0
+    assert collar.motion.speed == 0
+
+
+def test_walking_adds_up_each_leg(make_collar, start):
+    """Test each new fix adds the distance from the previous one."""
+    odometer = Odometer()
+    odometer.apply([make_collar(LAT, start)], start)
+
+    leg = haversine_distance(LAT, LON, LAT + STEP, LON)
+    odometer.apply([make_collar(LAT + STEP, start + timedelta(minutes=1))], start)
+    # The same fix polled again adds nothing
+    odometer.apply([make_collar(LAT + STEP, start + timedelta(minutes=1))], start)
+    (collar,) = odometer.apply(
+        [make_collar(LAT + 2 * STEP, start + timedelta(minutes=3))], start
+    )
+
+    assert collar.motion.distance_today == pytest.approx(2 * leg)
+    assert collar.motion.distance_week == pytest.approx(2 * leg)
+    assert collar.motion.speed == pytest.approx(leg / 120)
+    assert collar.motion.max_speed_today == pytest.approx(leg / 60)
+
+
+def test_gps_jump_is_not_counted(make_collar, start):
+    """Test a single fix far off the track adds no distance."""
+    odometer = Odometer()
+    odometer.apply([make_collar(LAT, start)], start)
+
+    # 5.5 km in a minute, then straight back next to where the pet was
+    odometer.apply([make_collar(LAT + 50 * STEP, start + timedelta(minutes=1))], start)
+    (collar,) = odometer.apply(
+        [make_collar(LAT + STEP, start + timedelta(minutes=2))], start
+    )
+
+    leg = haversine_distance(LAT, LON, LAT + STEP, LON)
+    assert collar.motion.distance_today == pytest.approx(leg)
+    assert collar.motion.max_speed_today == pytest.approx(leg / 120)
+
+
+def test_carried_pet_continues_from_new_place(make_collar, start):
+    """Test fixes that stay near a jump are counted from there on."""
+    odometer = Odometer()
+    odometer.apply([make_collar(LAT, start)], start)
+
+    far = LAT + 50 * STEP
+    odometer.apply([make_collar(far, start + timedelta(minutes=1))], start)
+    (collar,) = odometer.apply(
+        [make_collar(far + STEP, start + timedelta(minutes=2))], start
+    )
+
+    leg = haversine_distance(far, LON, far + STEP, LON)
+    assert collar.motion.distance_today == pytest.approx(leg)
+    assert odometer.trips[12345].lat == far + STEP
+
+
+def test_resets_at_local_midnight(make_collar, start):
+    """Test daily totals reset at midnight and weekly ones on Monday."""
+    odometer = Odometer()
+    odometer.apply([make_collar(LAT, start)], start)
+    odometer.apply([make_collar(LAT + STEP, start + timedelta(minutes=1))], start)
+    leg = haversine_distance(LAT, LON, LAT + STEP, LON)
+
+    # Monday, shortly after midnight, without a new fix
+    monday = start.replace(day=12, hour=0, minute=5)
+    (collar,) = odometer.apply(
+        [make_collar(LAT + STEP, start + timedelta(minutes=1))], monday
+    )
+    assert collar.motion.distance_today == 0
+    assert collar.motion.max_speed_today == 0
+    assert collar.motion.distance_week == 0
+
+    odometer.apply([make_collar(LAT + 2 * STEP, monday)], monday)
+    tuesday = monday + timedelta(days=1)
+    (collar,) = odometer.apply([make_collar(LAT + 2 * STEP, monday)], tuesday)
+    assert collar.motion.distance_today == 0
+    assert collar.motion.distance_week == pytest.approx(leg)
+
+
+def test_current_totals_without_counting(make_collar, start):
+    """Test restored collars get their totals, reset for a new day, but no leg."""
+    odometer = Odometer()
+    odometer.apply([make_collar(LAT, start)], start)
+    odometer.apply([make_collar(LAT + STEP, start + timedelta(minutes=1))], start)
+    leg = haversine_distance(LAT, LON, LAT + STEP, LON)
+
+    (collar, no_trip) = odometer.current(
+        [
+            make_collar(LAT + 2 * STEP, start + timedelta(minutes=2)),
+            CollarSnapshot(id=1),
+        ],
+        start,
+    )
+    assert collar.motion.distance_today == pytest.approx(leg)
+    assert no_trip.motion is None
+
+    # Sunday's totals are cleared on Monday, the week's included
+    (collar,) = odometer.current([collar], start + timedelta(days=1))
+    assert collar.motion.distance_today == 0
+    assert collar.motion.distance_week == 0
+
+
+def test_collars_without_position_and_removed_collars(make_collar, start):
+    """Test collars without a fix have no motion and removed ones go."""
+    odometer = Odometer()
+    no_fix = CollarSnapshot(id=67890)
+
+    _, collar = odometer.apply([make_collar(LAT, start), no_fix], start)
+    assert collar.motion is None
+
+    odometer.apply([no_fix], start)
+    assert odometer.trips == {}
+
+
+def test_round_trip_through_storage(make_collar, start):
+    """Test the running totals carry on after a restart."""
+    odometer = Odometer()
+    odometer.apply([make_collar(LAT, start)], start)
+    odometer.apply([make_collar(LAT + STEP, start + timedelta(minutes=1))], start)
+
+    restored = Odometer()
+    restored.load(odometer.as_dict())
+    (collar,) = restored.apply(
+        [make_collar(LAT + 2 * STEP, start + timedelta(minutes=2))], start
+    )
+
+    leg = haversine_distance(LAT, LON, LAT + STEP, LON)
+    assert collar.motion.distance_today == pytest.approx(2 * leg)
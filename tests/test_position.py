@@ -0,0 +1,106 @@
+"""Tests for PetTracer GPS jitter suppression."""
+from dataclasses import replace
+
+from custom_components.pettracer.const import (
+    CONF_JITTER_FLOOR,
+    CONF_MAX_ACCURACY,
+    CONF_MIN_SATELLITES,
+)
+from custom_components.pettracer.models import CollarSnapshot
+from custom_components.pettracer.position import PositionFilter
+
+# About 11 m per 0.0001 degrees of latitude
+NEARBY = 51.5074 + 0.00005
+FAR = 51.5074 + 0.001
+
+
+def _fix(snapshot, **changes):
+    """Return the snapshot with a new fix."""
+    return replace(snapshot, lastPos=replace(snapshot.lastPos, **changes))
+
+
+def test_first_fix_is_accepted(mock_device):
+    """Test a collar's first fix passes through unchanged."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+    position_filter = PositionFilter()
+
+    assert position_filter.apply([snapshot], {}) == [snapshot]
+    assert position_filter.accepted == {12345: snapshot.lastPos}
+
+
+def test_jitter_within_accuracy_is_held(mock_device):
+    """Test movement smaller than the fix's accuracy keeps the position."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+    position_filter = PositionFilter()
+    position_filter.apply([snapshot], {})
+
+    jitter = _fix(snapshot, posLat=NEARBY, acc=12, timeMeasure="later", sat=9)
+    (held,) = position_filter.apply([jitter], {})
+
+    assert held.lastPos.posLat == 51.5074
+    assert held.lastPos.acc == 10
+    # The fix itself is still reported
+    assert held.lastPos.timeMeasure == "later"
+    assert held.lastPos.sat == 9
+    assert position_filter.stats["suppressed"] == 1
+
+    # Polling the same fix again is not counted twice
+    position_filter.apply([jitter], {})
+    assert position_filter.stats["suppressed"] == 1
+
+
+def test_jitter_floor(mock_device):
+    """Test the floor applies when the fix claims a better accuracy."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+    position_filter = PositionFilter()
+    position_filter.apply([snapshot], {})
+
+    jitter = _fix(snapshot, posLat=NEARBY, acc=2)
+    assert position_filter.apply([jitter], {CONF_JITTER_FLOOR: 10})[0] != jitter
+    assert position_filter.apply([jitter], {CONF_JITTER_FLOOR: 0}) == [jitter]
+
+
+def test_real_movement_is_accepted(mock_device):
+    """Test movement beyond the accuracy moves the collar."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+    position_filter = PositionFilter()
+    position_filter.apply([snapshot], {})
+
+    moved = _fix(snapshot, posLat=FAR)
+    assert position_filter.apply([moved], {}) == [moved]
+    assert position_filter.accepted[12345].posLat == FAR
+
+
+def test_implausible_fixes_are_rejected(mock_device):
+    """Test inaccurate fixes and fixes from too few satellites are ignored."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+    position_filter = PositionFilter()
+    position_filter.apply([snapshot], {})
+
+    inaccurate = _fix(snapshot, posLat=FAR, acc=900)
+    assert position_filter.apply([inaccurate], {})[0].lastPos.posLat == 51.5074
+
+    few_satellites = _fix(snapshot, posLat=FAR, sat=2)
+    assert position_filter.apply([few_satellites], {})[0].lastPos.posLat == 51.5074
+    assert position_filter.stats["rejected"] == 2
+
+    # Limits of 0 turn the checks off; the poor fix is then just jitter
+    options = {CONF_MAX_ACCURACY: 0, CONF_MIN_SATELLITES: 0}
+    assert position_filter.apply([few_satellites], options) == [few_satellites]
+    inaccurate = _fix(few_satellites, posLat=FAR + 0.001, acc=900)
+    assert position_filter.apply([inaccurate], options)[0].lastPos.posLat == FAR
+    assert position_filter.stats == {"accepted": 2, "suppressed": 1, "rejected": 2}
+
+
+def test_seed_and_removed_collars(mock_device, mock_device_no_position):
+    """Test restored positions are the starting point and removed collars forgotten."""
+    snapshot = CollarSnapshot.from_device(mock_device)
+    position_filter = PositionFilter()
+    position_filter.seed([snapshot, CollarSnapshot.from_device(mock_device_no_position)])
+    assert position_filter.accepted == {12345: snapshot.lastPos}
+
+    jitter = _fix(snapshot, posLat=NEARBY)
+    assert position_filter.apply([jitter], {})[0].lastPos.posLat == 51.5074
+
+    position_filter.apply([], {})
+    assert position_filter.accepted == {}
@@ -0,0 +1,200 @@
+"""Tests for the PetTracer select platform."""
+
+import asyncio
+from datetime import timedelta
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+from pettracer import PetTracerError
+from pytest_homeassistant_custom_component.common import (
+    MockConfigEntry,
+    async_fire_time_changed,
+)
+
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.const import CONF_PASSWORD, CONF_USERNAME
+from homeassistant.exceptions import HomeAssistantError
+from homeassistant.util import dt as dt_util
+
+from custom_components.pettracer.const import (
+    DOMAIN,
+    MODE_FAST,
+    MODE_LIVE,
+    MODE_NORMAL,
+    MODE_NORMAL_PLUS,
+    MODE_SLOW,
+)
+from custom_components.pettracer.select import PetTracerModeSelect
+from custom_components.pettracer.utils import build_device_data
+
+
+def _mock_mode_api(client):
+    """Attach a per-collar set_tracking_mode mock to the client."""
+    set_mode = AsyncMock()
+    client.get_device.return_value.set_tracking_mode = set_mode
+    return set_mode
+
+
+def _select(coordinator, device):
+    """Create a select entity attached to a test hass."""
+    select = PetTracerModeSelect(coordinator, device)
+    select.hass = coordinator.hass
+    select.entity_id = f"select.pettracer_{device.id}_tracking_mode"
+    select.async_write_ha_state = MagicMock()
+    return select
+
+
+async def test_select_setup(hass, mock_pettracer_client_init, mock_device):
+    """Test a mode select is created per collar."""
+    from custom_components.pettracer import async_setup_entry
+    from custom_components.pettracer.select import async_setup_entry as select_setup
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    entry._async_set_state(hass, ConfigEntryState.SETUP_IN_PROGRESS, None)
+
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    with patch(
+        "homeassistant.config_entries.ConfigEntries.async_forward_entry_setups"
+    ):
+        await async_setup_entry(hass, entry)
+
+    entities = []
+
+    def mock_add_entities(new_entities, update_before_add=False):
+        entities.extend(new_entities)
+
+    await select_setup(hass, entry, mock_add_entities)
+
+    assert len(entities) == 1
+    select = entities[0]
+    assert isinstance(select, PetTracerModeSelect)
+    assert select.unique_id == "pettracer_12345_mode_select"
+    assert select.options == ["Live", "Fast", "Normal", "Slow"]
+    assert select.current_option == "Fast"
+    assert select.device_info["name"] == "Fluffy"
+
+    await hass.data[DOMAIN][entry.entry_id].async_shutdown()
+
+
+async def test_select_unsettable_mode(hass, mock_device):
+    """Test modes that cannot be selected show no current option."""
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    coordinator.mode_changes.requested_mode.return_value = None
+    mock_device.mode = MODE_NORMAL_PLUS
+
+    select = PetTracerModeSelect(coordinator, mock_device)
+
+    assert select.current_option is None
+
+
+async def test_select_option_is_optimistic_and_confirmed(hass, setup_coordinator, mock_pettracer_client_init, mock_device):
+    """Test a change shows at once and settles when the collar reports it."""
+    coordinator = await setup_coordinator([mock_device])
+    set_mode = _mock_mode_api(mock_pettracer_client_init)
+    select = _select(coordinator, mock_device)
+
+    # The server accepts the change but the collar has not applied it yet
+    mock_device.modeSet = MODE_LIVE
+
+    task = hass.async_create_task(select.async_select_option("Live"))
+    await asyncio.sleep(0)
+    assert select.current_option == "Live"
+    assert select.extra_state_attributes == {"pending": True}
+    set_mode.assert_not_awaited()
+
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await task
+    set_mode.assert_awaited_once_with(MODE_LIVE)
+    await coordinator.async_refresh()
+    assert select.current_option == "Live"
+    assert select.extra_state_attributes == {"pending": True}
+
+    # The collar switched over
+    mock_device.mode = MODE_LIVE
+    await coordinator.async_refresh()
+    assert select.extra_state_attributes == {"pending": False}
+    assert select.current_option == "Live"
+
+    await coordinator.async_shutdown()
+
+
+async def test_select_changes_are_batched(hass, setup_coordinator, mock_pettracer_client_init, mock_device, mock_device_no_position):
+    """Test near-simultaneous changes cost one call per collar and one refresh."""
+    coordinator = await setup_coordinator([mock_device, mock_device_no_position])
+    set_mode = _mock_mode_api(mock_pettracer_client_init)
+    first = _select(coordinator, mock_device)
+    second = _select(coordinator, mock_device_no_position)
+
+    tasks = [
+        hass.async_create_task(first.async_select_option("Normal")),
+        hass.async_create_task(second.async_select_option("Slow")),
+        hass.async_create_task(first.async_select_option("Live")),
+    ]
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    for task in tasks:
+        await task
+
+    assert sorted(call.args for call in set_mode.await_args_list) == [
+        (MODE_SLOW,),
+        (MODE_LIVE,),
+    ]
+    assert [call.args for call in mock_pettracer_client_init.get_device.call_args_list] == [
+        (12345,),
+        (12346,),
+    ]
+    await hass.async_block_till_done()
+    assert mock_pettracer_client_init.get_all_devices.await_count == 2
+
+    await coordinator.async_shutdown()
+
+
+async def test_select_option_failure_reverts(hass, setup_coordinator, mock_pettracer_client_init, mock_device):
+    """Test a rejected change raises and shows the reported mode again."""
+    coordinator = await setup_coordinator([mock_device])
+    set_mode = _mock_mode_api(mock_pettracer_client_init)
+    set_mode.side_effect = PetTracerError("HTTP error while calling setccmode")
+    select = _select(coordinator, mock_device)
+
+    task = hass.async_create_task(select.async_select_option("Slow"))
+    await asyncio.sleep(0)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+
+    with pytest.raises(HomeAssistantError):
+        await task
+    assert select.current_option == "Fast"
+
+    await coordinator.async_shutdown()
+
+
+async def test_mode_change_not_applied_is_dropped(hass, setup_coordinator, mock_pettracer_client_init, mock_device):
+    """Test a change the server no longer lists stops being shown."""
+    coordinator = await setup_coordinator([mock_device])
+    _mock_mode_api(mock_pettracer_client_init)
+    mode_listener = MagicMock()
+    coordinator.async_add_listener(mode_listener, (12345, ("mode",)))
+
+    mock_device.modeSet = MODE_NORMAL
+    batch = coordinator.mode_changes.request(12345, MODE_NORMAL)
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=2))
+    await batch
+    assert coordinator.mode_changes.requested_mode(12345) == MODE_NORMAL
+
+    mock_device.modeSet = MODE_FAST
+    await coordinator.async_refresh()
+
+    assert coordinator.mode_changes.requested_mode(12345) is None
+    # The select is told to drop its optimistic state
+    assert mode_listener.call_count >= 1
+
+    await coordinator.async_shutdown()
@@ -6,15 +6,19 @@ from pytest_homeassistant_custom_component.common import MockConfigEntry
 
 from homeassistant.const import CONF_PASSWORD, CONF_USERNAME, EntityCategory
 from homeassistant.config_entries import ConfigEntryState
+from homeassistant.util.dt import parse_datetime
 from homeassistant.components.sensor import (
     SensorDeviceClass,
     SensorStateClass,
 )
 
 from custom_components.pettracer.const import DOMAIN
+from custom_components.pettracer.utils import build_device_data
 from custom_components.pettracer.sensor import (
     SENSOR_DESCRIPTIONS,
+    PetTracerApiStatusSensor,
     PetTracerSensor,
+    PetTracerStalenessSensor,
 )
 
 
@@ -50,19 +54,51 @@ async def test_sensor_setup(hass, mock_pettracer_client_init, mock_device):
         # Setup sensor platform
         entities = []
 
-        def mock_add_entities(new_entities, update_before_add):
+        def mock_add_entities(new_entities, update_before_add=False):
             entities.extend(new_entities)
 
         await sensor_setup(hass, entry, mock_add_entities)
 
-        # Should create 11 sensors per device (AtHome moved to binary_sensor)
-        assert len(entities) == 11
+        # Should create 15 sensors per device (AtHome moved to binary_sensor)
+        # plus the data staleness diagnostic, and one API status sensor
+        assert len(entities) == 17
+
+        await hass.data[DOMAIN][entry.entry_id].async_shutdown()
+
+
+async def test_api_status_sensor_entity_id(hass, mock_pettracer_client_init, mock_device):
+    """Test the API status sensor is named after the account device."""
+    from homeassistant.helpers import entity_registry as er
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="PetTracer (test@example.com)",
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    entry.add_to_hass(hass)
+    mock_pettracer_client_init.get_all_devices.return_value = [mock_device]
+
+    assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
+
+    assert (
+        er.async_get(hass).async_get_entity_id(
+            "sensor", DOMAIN, "pettracer_test_entry_api_status"
+        )
+        == "sensor.pettracer_test_example_com_api_status"
+    )
+
+    await hass.config_entries.async_unload(entry.entry_id)
 
 
 async def test_battery_sensor(hass, mock_device):
     """Test battery level sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_level")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -84,7 +120,7 @@ async def test_battery_sensor(hass, mock_device):
 async def test_battery_voltage_sensor(hass, mock_device):
     """Test battery voltage sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_voltage")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -101,7 +137,7 @@ async def test_battery_voltage_sensor(hass, mock_device):
 async def test_latitude_sensor(hass, mock_device):
     """Test latitude sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "latitude")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -115,7 +151,7 @@ async def test_latitude_sensor(hass, mock_device):
 async def test_longitude_sensor(hass, mock_device):
     """Test longitude sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "longitude")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -129,7 +165,7 @@ async def test_longitude_sensor(hass, mock_device):
 async def test_gps_accuracy_sensor(hass, mock_device):
     """Test GPS accuracy sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "gps_accuracy")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -148,7 +184,7 @@ async def test_last_contact_sensor(hass, mock_device):
     from datetime import datetime
 
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "last_contact")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -162,7 +198,7 @@ async def test_last_contact_sensor(hass, mock_device):
 async def test_satellites_sensor(hass, mock_device):
     """Test satellites sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "satellites")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -177,7 +213,7 @@ async def test_satellites_sensor(hass, mock_device):
 async def test_signal_strength_sensor(hass, mock_device):
     """Test signal strength sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "signal_strength")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -194,7 +230,7 @@ async def test_signal_strength_sensor(hass, mock_device):
 async def test_position_time_sensor(hass, mock_device):
     """Test position time sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "position_time")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -209,7 +245,7 @@ async def test_position_time_sensor(hass, mock_device):
 async def test_status_sensor(hass, mock_device):
     """Test status sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "status")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -223,7 +259,7 @@ async def test_status_sensor(hass, mock_device):
 async def test_mode_sensor(hass, mock_device):
     """Test mode sensor."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "mode")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -264,7 +300,7 @@ async def test_mode_sensor_all_modes(hass, mock_device):
 
     for mode_value, mode_name in test_cases:
         mock_device.mode = mode_value
-        coordinator.data = {"devices": [mock_device]}
+        coordinator.data = build_device_data([mock_device])
 
         assert sensor.native_value == mode_name
         assert sensor.extra_state_attributes == {"mode_number": mode_value}
@@ -279,18 +315,48 @@ async def test_mode_sensor_unrecognized(hass, mock_device):
 
     # Set an unrecognized mode value
     mock_device.mode = 999
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     assert sensor.native_value == "Unrecognized"
     assert sensor.extra_state_attributes == {"mode_number": 999}
 
 
+async def test_distance_and_speed_sensors(hass, mock_device):
+    """Test distance and speed sensors read the collar's motion."""
+    from dataclasses import replace
+
+    from custom_components.pettracer.models import CollarMotion, CollarSnapshot
+
+    device = replace(
+        CollarSnapshot.from_device(mock_device),
+        motion=CollarMotion(1234.567, 5678.912, 1.4567, 3.2),
+    )
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([device])
+
+    expected = {
+        "distance_today": 1234.6,
+        "distance_week": 5678.9,
+        "speed": 1.46,
+        "max_speed_today": 3.2,
+    }
+    for key, value in expected.items():
+        description = next(d for d in SENSOR_DESCRIPTIONS if d.key == key)
+        sensor = PetTracerSensor(coordinator, device, description)
+        assert sensor.native_value == value
+        assert description.fields == ("motion",)
+
+    description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "distance_today")
+    assert description.device_class == SensorDeviceClass.DISTANCE
+    assert description.state_class == SensorStateClass.TOTAL_INCREASING
+
+
 async def test_sensor_no_position(hass, mock_device_no_position):
     """Test sensors with no position data."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device_no_position])
 
-    for key in ("latitude", "longitude", "gps_accuracy", "satellites", "signal_strength", "position_time"):
+    for key in ("latitude", "longitude", "gps_accuracy", "satellites", "signal_strength", "position_time", "distance_today", "speed"):
         description = next(d for d in SENSOR_DESCRIPTIONS if d.key == key)
         sensor = PetTracerSensor(coordinator, mock_device_no_position, description)
         assert sensor.native_value is None
@@ -299,7 +365,7 @@ async def test_sensor_no_position(hass, mock_device_no_position):
 async def test_sensor_device_info(hass, mock_device):
     """Test sensor device info."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_level")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -315,14 +381,14 @@ async def test_sensor_device_info(hass, mock_device):
 async def test_sensor_device_info_reflects_pet_rename(hass, mock_device):
     """Renaming the pet must update device_info without changing identifiers."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_level")
     sensor = PetTracerSensor(coordinator, mock_device, description)
     assert sensor.device_info["name"] == "Fluffy"
 
     mock_device.details.name = "Buddy"
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     assert sensor.device_info["name"] == "Buddy"
     # Stable identifiers never move, regardless of the pet's current name.
@@ -334,7 +400,7 @@ async def test_sensor_device_info_reflects_pet_rename(hass, mock_device):
 async def test_sensor_coordinator_update(hass, mock_device):
     """Test sensor updates from coordinator."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "latitude")
     sensor = PetTracerSensor(coordinator, mock_device, description)
@@ -344,7 +410,7 @@ async def test_sensor_coordinator_update(hass, mock_device):
 
     # Update device position
     mock_device.lastPos.posLat = 51.5100
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     # Value should update
     assert sensor.native_value == 51.5100
@@ -353,7 +419,7 @@ async def test_sensor_coordinator_update(hass, mock_device):
 async def test_multiple_devices_sensors(hass, mock_device, mock_device_no_position):
     """Test sensors with multiple devices."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device, mock_device_no_position]}
+    coordinator.data = build_device_data([mock_device, mock_device_no_position])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_level")
     sensor1 = PetTracerSensor(coordinator, mock_device, description)
@@ -380,7 +446,7 @@ async def test_sensor_no_details(hass):
     device.sw = None
 
     coordinator = MagicMock()
-    coordinator.data = {"devices": [device]}
+    coordinator.data = build_device_data([device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_level")
     sensor = PetTracerSensor(coordinator, device, description)
@@ -397,7 +463,7 @@ async def test_sensor_no_details(hass):
 async def test_position_time_parse_returns_none(hass, mock_device):
     """Test position time falls back to raw value when parse_datetime returns None."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     mock_device.lastPos.timeMeasure = "not-a-real-datetime"
 
@@ -413,7 +479,7 @@ async def test_position_time_parse_returns_none(hass, mock_device):
 async def test_position_time_parse_exception(hass, mock_device):
     """Test position time falls back to raw value when parse_datetime raises."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     mock_device.lastPos.timeMeasure = "bad-value"
 
@@ -435,7 +501,7 @@ async def test_mode_sensor_none_mode(hass, mock_device):
     sensor = PetTracerSensor(coordinator, mock_device, description)
 
     mock_device.mode = None
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     assert sensor.native_value is None
     assert sensor.extra_state_attributes == {}
@@ -444,39 +510,147 @@ async def test_mode_sensor_none_mode(hass, mock_device):
 async def test_battery_percentage_edge_cases(hass, mock_device):
     """Test battery percentage calculation with edge cases."""
     coordinator = MagicMock()
-    coordinator.data = {"devices": [mock_device]}
+    coordinator.data = build_device_data([mock_device])
 
     description = next(d for d in SENSOR_DESCRIPTIONS if d.key == "battery_level")
     sensor = PetTracerSensor(coordinator, mock_device, description)
 
     # Test minimum voltage (3600mV = 0%)
     mock_device.bat = 3600
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 0
 
     # Test maximum voltage (4200mV = 100%)
     mock_device.bat = 4200
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 100
 
     # Test below minimum (should cap at 0%)
     mock_device.bat = 3500
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 0
 
     # Test above maximum (should cap at 100%)
     mock_device.bat = 4300
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 100
 
     # Test mid-range (3900mV = 50%)
     mock_device.bat = 3900
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 50
 
     # Test 3800mV (should be 33%)
     mock_device.bat = 3800
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 33
 
     # Test 4000mV (should be 66%)
     mock_device.bat = 4000
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 66
 
     # Test 4100mV (should be 83%)
     mock_device.bat = 4100
+    coordinator.data = build_device_data([mock_device])
     assert sensor.native_value == 83
+
+
+async def test_staleness_sensor(hass, mock_device):
+    """Test the data staleness diagnostic sensor."""
+    from custom_components.pettracer import PollScheduler
+
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    coordinator.scheduler = PollScheduler()
+
+    sensor = PetTracerStalenessSensor(coordinator, mock_device)
+
+    assert sensor.unique_id == "pettracer_12345_staleness"
+    assert sensor.name == "Data Staleness"
+    assert sensor.device_class == SensorDeviceClass.DURATION
+    assert sensor.native_unit_of_measurement == "s"
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+    assert sensor.device_info["name"] == "Fluffy"
+    assert sensor.native_value is None
+    assert sensor.extra_state_attributes == {"reporting_period": 60}
+
+    coordinator.scheduler.staleness[12345] = 12.34
+    coordinator.scheduler.mean_staleness[12345] = 20.0
+    assert sensor.native_value == 12.3
+    assert sensor.extra_state_attributes == {
+        "mean_staleness": 20.0,
+        "reporting_period": 60,
+    }
+
+
+async def test_api_status_sensor(hass, mock_device):
+    """Test the circuit breaker diagnostic sensor."""
+    from datetime import UTC, datetime
+
+    from custom_components.pettracer.breaker import CircuitBreaker
+
+    entry = MockConfigEntry(
+        domain=DOMAIN,
+        title="PetTracer (test@example.com)",
+        data={
+            CONF_USERNAME: "test@example.com",
+            CONF_PASSWORD: "test_password",
+        },
+        entry_id="test_entry",
+    )
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    coordinator.breaker = CircuitBreaker(rand=lambda: 0.0)
+    coordinator.last_success_time = None
+
+    sensor = PetTracerApiStatusSensor(coordinator, entry)
+
+    assert sensor.unique_id == "pettracer_test_entry_api_status"
+    assert sensor.device_class == SensorDeviceClass.ENUM
+    assert sensor.entity_category == EntityCategory.DIAGNOSTIC
+    assert sensor.device_info["identifiers"] == {(DOMAIN, "test_entry")}
+    assert sensor.device_info["name"] == "PetTracer (test@example.com)"
+    assert sensor.native_value == "closed"
+    assert sensor.extra_state_attributes["stale"] is False
+
+    now = datetime(2026, 1, 11, 10, 30, tzinfo=UTC)
+    for _ in range(3):
+        coordinator.breaker.record_failure(now)
+    coordinator.data = build_device_data([mock_device], stale=True)
+    coordinator.last_update_success = False
+
+    assert sensor.available is True
+    assert sensor.native_value == "open"
+    assert sensor.extra_state_attributes == {
+        "consecutive_failures": 3,
+        "retry_at": "2026-01-11T10:32:00+00:00",
+        "stale": True,
+        "last_success": None,
+    }
+
+
+async def test_sensor_values_evaluated_once_per_poll(hass, mock_device):
+    """Test a collar's sensor values are computed once and shared per poll."""
+    coordinator = MagicMock()
+    coordinator.data = build_device_data([mock_device])
+    sensors = [
+        PetTracerSensor(coordinator, mock_device, description)
+        for description in SENSOR_DESCRIPTIONS
+    ]
+
+    with patch(
+        "custom_components.pettracer.sensor.parse_datetime",
+        wraps=parse_datetime,
+    ) as mock_parse:
+        for _ in range(3):
+            for sensor in sensors:
+                sensor.native_value
+                sensor.extra_state_attributes
+        assert mock_parse.call_count == 1
+
+        # A new poll brings new values
+        mock_device.bat = 3900
+        coordinator.data = build_device_data([mock_device])
+        assert sensors[0].native_value == 50
+        assert mock_parse.call_count == 2
@@ -0,0 +1,130 @@
+"""Tests for PetTracer Kalman-smoothed positions."""
+
+import math
+import random
+from dataclasses import replace
+from datetime import UTC, datetime, timedelta
+
+from custom_components.pettracer.models import CollarSnapshot
+from custom_components.pettracer.smoothing import (
+    METERS_PER_DEGREE,
+    KalmanTrack,
+    PositionSmoother,
+)
+
+START = datetime(2026, 1, 11, 10, 0, tzinfo=UTC)
+
+
+def _error(lat, lon, true_lat, true_lon):
+    """Return the distance between two nearby points in meters."""
+    return math.hypot(
+        (lat - true_lat) * METERS_PER_DEGREE,
+        (lon - true_lon) * METERS_PER_DEGREE * math.cos(math.radians(true_lat)),
+    )
+
+
+def test_first_fix_starts_track(make_collar):
+    """Test the first fix is the smoothed position."""
+    smoother = PositionSmoother()
+
+    (collar,) = smoother.apply([make_collar(51.5074, START)])
+
+    assert collar.smoothed.posLat == 51.5074
+    assert collar.smoothed.posLong == -0.1278
+    assert collar.smoothed.acc == 10
+
+
+def test_stationary_noise_is_smoothed(make_collar):
+    """Test noisy fixes around a resting pet converge on its position."""
+    rng = random.Random(1)
+    smoother = PositionSmoother()
+    raw_errors = []
+    smoothed_errors = []
+
+    for i in range(60):
+        lat = 51.5074 + rng.gauss(0, 10) / METERS_PER_DEGREE
+        lon = -0.1278 + rng.gauss(0, 10) / METERS_PER_DEGREE / 0.62
+        (collar,) = smoother.apply(
+            [make_collar(lat, START + timedelta(seconds=10 * i), lon=lon)]
+        )
+        if i >= 10:
+            raw_errors.append(_error(lat, lon, 51.5074, -0.1278))
+            smoothed_errors.append(
+                _error(
+                    collar.smoothed.posLat, collar.smoothed.posLong, 51.5074, -0.1278
+                )
+            )
+
+    assert sum(smoothed_errors) < 0.75 * sum(raw_errors)
+
+
+def test_moving_pet_is_followed(make_collar):
+    """Test a pet moving at a steady speed is tracked with its velocity."""
+    smoother = PositionSmoother()
+    step = 1.5 * 20 / METERS_PER_DEGREE  # 1.5 m/s north, a fix every 20 s
+
+    for i in range(30):
+        (collar,) = smoother.apply(
+            [make_collar(51.5074 + i * step, START + timedelta(seconds=20 * i))]
+        )
+
+    track = smoother.tracks[12345]
+    assert math.isclose(track.v_north, 1.5, rel_tol=0.1)
+    assert _error(collar.smoothed.posLat, -0.1278, 51.5074 + 29 * step, -0.1278) < 5
+
+
+def test_same_fix_is_not_applied_twice(make_collar):
+    """Test polling the same fix again leaves the track alone."""
+    smoother = PositionSmoother()
+    smoother.apply([make_collar(51.5074, START)])
+    smoother.apply([make_collar(51.5075, START + timedelta(seconds=60))])
+    track = smoother.tracks[12345]
+    state = (track.north, track.p_pos)
+
+    smoother.apply([make_collar(51.5075, START + timedelta(seconds=60))])
+
+    assert (track.north, track.p_pos) == state
+
+
+def test_long_gap_starts_new_track(make_collar):
+    """Test a fix after a long gap is taken as is."""
+    smoother = PositionSmoother()
+    smoother.apply([make_collar(51.5074, START)])
+
+    (collar,) = smoother.apply(
+        [make_collar(51.6, START + timedelta(hours=2), lon=-0.2)]
+    )
+
+    assert collar.smoothed.posLat == 51.6
+
+
+def test_collars_without_fixes(make_collar, mock_device_no_position):
+    """Test collars without a fix are passed through and removed ones forgotten."""
+    smoother = PositionSmoother()
+    smoother.apply([make_collar(51.5074, START)])
+
+    no_position = CollarSnapshot.from_device(mock_device_no_position)
+    assert smoother.apply([no_position]) == [no_position]
+    assert smoother.tracks == {}
+
+
+def test_fix_times_as_text(make_collar):
+    """Test fix times are also read from the cloud's text format."""
+    smoother = PositionSmoother()
+    smoother.apply([make_collar(51.5074, "2026-01-11T10:00:00.000+0000")])
+
+    smoother.apply([make_collar(51.5075, "2026-01-11T10:01:00.000+0000")])
+
+    assert smoother.tracks[12345].time == START.timestamp() + 60
+
+
+def test_track_keeps_smoothed_position_without_new_fix(make_collar):
+    """Test a collar keeps its smoothed position while its fix is unchanged."""
+    smoother = PositionSmoother()
+    first = make_collar(51.5074, START)
+    smoother.apply([first])
+
+    (collar,) = smoother.apply([replace(first, bat=4000)])
+
+    assert collar.smoothed.posLat == 51.5074
+    assert isinstance(smoother.tracks[12345], KalmanTrack)
@@ -1,6 +1,28 @@
 """Tests for PetTracer utility functions."""
 
-from custom_components.pettracer.utils import battery_mv_to_percentage
+from datetime import UTC, datetime
+from unittest.mock import MagicMock
+
+from aiohttp import ClientResponseError
+from pettracer import Device, PetTracerError
+
+from homeassistant.const import CONF_TOKEN
+
+from custom_components.pettracer.const import CONF_TOKEN_EXPIRES
+
+from custom_components.pettracer.utils import (
+    apply_deadbands,
+    battery_mv_to_percentage,
+    build_device_data,
+    changed_fields,
+    device_fingerprint,
+    device_to_dict,
+    get_device,
+    get_device_record,
+    is_auth_error,
+    stored_token,
+    token_data,
+)
 
 
 def test_battery_mv_to_percentage_full():
@@ -33,3 +55,187 @@ def test_battery_mv_to_percentage_typical():
     assert battery_mv_to_percentage(4100) == 83
     assert battery_mv_to_percentage(3800) == 33
     assert battery_mv_to_percentage(4000) == 66
+
+
+def test_build_device_data_indexes_by_id():
+    """Test the device list is published alongside an id-keyed index."""
+    first = MagicMock(id=1)
+    second = MagicMock(id=2)
+
+    data = build_device_data([first, second])
+
+    assert data["devices"] == [first, second]
+    assert data["devices_by_id"] == {1: first, 2: second}
+
+
+def test_build_device_data_carries_over_unchanged_records():
+    """Test records are kept only for collars that did not change."""
+    first = MagicMock(id=1)
+    second = MagicMock(id=2)
+    previous = build_device_data([first, second])
+    get_device_record(previous, "device_info", first, lambda device: {"id": 1})
+    get_device_record(previous, "device_info", second, lambda device: {"id": 2})
+
+    data = build_device_data([first, second], previous=previous, unchanged={1})
+
+    assert data["device_info"] == {1: {"id": 1}}
+    assert data["device_info"][1] is previous["device_info"][1]
+    assert data["sensor_values"] == {}
+
+
+def test_get_device_record_builds_once():
+    """Test a record is built on first use and then reused."""
+    device = MagicMock(id=1)
+    data = build_device_data([device])
+    build = MagicMock(return_value={"built": True})
+
+    first = get_device_record(data, "tracker_attributes", device, build)
+    second = get_device_record(data, "tracker_attributes", device, build)
+
+    assert first is second
+    build.assert_called_once_with(device)
+
+
+def test_get_device():
+    """Test looking up a device by id."""
+    device = MagicMock(id=12345)
+    data = build_device_data([device])
+
+    assert get_device(data, 12345) is device
+    assert get_device(data, 99999) is None
+
+
+def test_get_device_no_data():
+    """Test lookups before the first refresh has produced any data."""
+    assert get_device(None, 12345) is None
+    assert get_device({}, 12345) is None
+
+
+def test_device_fingerprint(mock_device, mock_device_no_position):
+    """Test the fingerprint captures the fields entities read."""
+    fingerprint = device_fingerprint(mock_device)
+    assert fingerprint["bat"] == 4100
+    assert fingerprint["name"] == "Fluffy"
+    assert fingerprint["posLat"] == 51.5074
+    assert fingerprint["timeMeasure"] == "2026-01-11T10:30:00.000+0000"
+
+    no_position = device_fingerprint(mock_device_no_position)
+    assert no_position["posLat"] is None
+    assert no_position["rssi"] is None
+
+
+def test_apply_deadbands():
+    """Test changes below a field's deadband keep the previous value."""
+    previous = {"bat": 4100, "rssi": -65, "posLat": 51.5}
+
+    current = {"bat": 4090, "rssi": -70, "posLat": 51.6}
+    apply_deadbands(previous, current, {"bat": 20, "rssi": 3})
+    assert current == {"bat": 4100, "rssi": -70, "posLat": 51.6}
+
+    current = {"bat": 4090, "rssi": None, "posLat": 51.5}
+    apply_deadbands(previous, current, {"bat": 0, "rssi": 3})
+    assert current == {"bat": 4090, "rssi": None, "posLat": 51.5}
+
+    current = {"bat": 4090}
+    apply_deadbands(None, current, {"bat": 20})
+    assert current == {"bat": 4090}
+
+
+def test_changed_fields():
+    """Test diffing two fingerprints."""
+    previous = {"bat": 4100, "posLat": 51.5, "home": True}
+
+    assert changed_fields(previous, dict(previous)) == set()
+    assert changed_fields(previous, {**previous, "bat": 4090}) == {"bat"}
+    assert changed_fields(None, previous) == {"bat", "posLat", "home"}
+
+
+def test_device_to_dict_round_trip(mock_device):
+    """Test a serialized device parses back with the client's parser."""
+    mock_device.lastPos.timeMeasure = datetime(2026, 1, 11, 10, 30, 0, 310000, tzinfo=UTC)
+
+    device = Device.from_dict(device_to_dict(mock_device))
+
+    assert device.id == 12345
+    assert device.bat == 4100
+    assert device.home is True
+    assert device.details.name == "Fluffy"
+    # Timestamps without a timezone are stored as UTC
+    assert device.lastContact == datetime(2026, 1, 11, 10, 30, 0, tzinfo=UTC)
+    assert device.lastPos.posLat == 51.5074
+    assert device.lastPos.timeMeasure == mock_device.lastPos.timeMeasure
+
+
+def test_device_to_dict_without_optional_data(mock_device_no_position):
+    """Test devices without a position or timestamps serialize cleanly."""
+    mock_device_no_position.details = None
+    mock_device_no_position.lastContact = None
+
+    data = device_to_dict(mock_device_no_position)
+
+    assert data["lastPos"] is None
+    assert data["details"] is None
+    assert data["lastContact"] is None
+
+
+def test_token_data():
+    """Test the client's token and expiry are captured for storage."""
+    client = MagicMock()
+    client.token = "test-token"
+    client.token_expires = datetime(2026, 2, 1)
+
+    assert token_data(client) == {
+        CONF_TOKEN: "test-token",
+        CONF_TOKEN_EXPIRES: "2026-02-01T00:00:00",
+    }
+
+    client.token_expires = None
+    assert token_data(client)[CONF_TOKEN_EXPIRES] is None
+
+
+def test_stored_token():
+    """Test stored tokens are only reused before they expire."""
+    now = datetime(2026, 1, 11, 10, 30, tzinfo=UTC)
+
+    assert stored_token({}, now) is None
+    assert stored_token({CONF_TOKEN: "abc"}, now) == "abc"
+    assert (
+        stored_token(
+            {CONF_TOKEN: "abc", CONF_TOKEN_EXPIRES: "2026-02-01T00:00:00"}, now
+        )
+        == "abc"
+    )
+    # Expired, or about to expire
+    assert (
+        stored_token(
+            {CONF_TOKEN: "abc", CONF_TOKEN_EXPIRES: "2026-01-11T00:00:00"}, now
+        )
+        is None
+    )
+    assert (
+        stored_token(
+            {CONF_TOKEN: "abc", CONF_TOKEN_EXPIRES: "2026-01-11T11:00:00+00:00"},
+            now,
+        )
+        is None
+    )
+    assert (
+        stored_token({CONF_TOKEN: "abc", CONF_TOKEN_EXPIRES: "not a date"}, now)
+        is None
+    )
+
+
+def test_is_auth_error():
+    """Test rejected tokens are told apart from other API errors."""
+
+    def wrapped(status):
+        cause = ClientResponseError(MagicMock(), (), status=status)
+        try:
+            raise PetTracerError("HTTP error") from cause
+        except PetTracerError as err:
+            return err
+
+    assert is_auth_error(wrapped(401)) is True
+    assert is_auth_error(wrapped(403)) is True
+    assert is_auth_error(wrapped(500)) is False
+    assert is_auth_error(PetTracerError("Invalid JSON response")) is False